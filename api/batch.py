@@ -0,0 +1,271 @@
+"""
+Batch generation of SVG (and PNG) files from one template and a table of rows.
+
+Each row is a set of Quick Edits that is applied to a fresh copy of the template. Rows are
+spread over a pool of worker processes, each of which parses the template once and compiles
+the edited targets into an EditPlan that is reused for every row with the same targets. Each
+row edits a copy-on-write clone of the template that only copies the edited elements.
+
+The rows can be read from a CSV file. Its header names the edited targets as
+"ID|attribute|Type" (Type defaults to Normal), and an optional "name" column gives the name of
+the output files. For example, with assets/Sample/SampleTemplate.svg:
+
+    name,tspan272|{svg}tspan|Element,tspan273|{svg}tspan|Element,desc|fill|Style
+    movie,Movie,6.5,#000000
+
+Usage:
+
+    python -m api.batch assets/Sample/SampleTemplate.svg assets/Sample/batch_rows.csv -o output --png
+"""
+import argparse
+import csv
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from api.module import save_svg_to_file
+from utils.config import INKSCAPE_PATH
+from utils.file_helper import atomic_open
+from utils.image_links import resolve_document_links
+from utils.inkscape_pool import INKSCAPE_POOL
+from utils.instrumentation import init_instrumentation
+from utils.svg_parser import EDIT_APPLIED, EDIT_NOT_FOUND, EDIT_UNCHANGED, serialize_svg
+from utils.template import SVGTemplate
+
+NAME_COLUMN = "name"
+
+# State of a worker process, set up once by _init_worker
+_template = None
+
+
+def parse_target(header):
+    """
+    Parse a CSV header cell of the form "ID|attribute|Type".
+
+    Args:
+        header (str): The header cell.
+
+    Returns:
+        tuple: The ID, attribute name and type name of the target.
+
+    Raises:
+        ValueError: If the header cell does not name a target.
+    """
+    parts = [part.strip() for part in header.split("|")]
+    if len(parts) == 2:
+        parts.append("Normal")
+    if len(parts) != 3 or not parts[0] or not parts[1]:
+        raise ValueError(f"Invalid column '{header}', expected 'ID|attribute|Type'")
+    return tuple(parts)
+
+
+def read_rows(rows_path):
+    """
+    Read the rows of a batch from a CSV file.
+
+    Args:
+        rows_path (str): The path to the CSV file.
+
+    Yields:
+        tuple: The output name of the row (or None) and its list of Quick Edits.
+    """
+    with open(rows_path, "r", encoding="utf-8", newline="") as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return
+
+        name_index = None
+        targets = []
+        for index, cell in enumerate(header):
+            if cell.strip() == NAME_COLUMN:
+                name_index = index
+            else:
+                targets.append((index, parse_target(cell)))
+
+        for row in reader:
+            if not row:
+                continue
+            name = row[name_index] if name_index is not None and name_index < len(row) else None
+            quick_edit_attrs = [
+                {'ID': element_id, 'attribute': attribute_name, 'type': type_name, 'value': row[index]}
+                for index, (element_id, attribute_name, type_name) in targets
+                if index < len(row)
+            ]
+            yield name, quick_edit_attrs
+
+
+def output_name(name, row_number):
+    """
+    Get a file-system safe base name for the output files of a row.
+
+    Args:
+        name (str): The requested name of the row, or None.
+        row_number (int): The position of the row in the batch.
+
+    Returns:
+        str: The base name of the output files.
+    """
+    if name:
+        name = re.sub(r"[^\w.-]+", "_", name).strip("._")
+    return name or f"row{row_number:05d}"
+
+
+def unique_output_names(names):
+    """
+    Make the output names of a batch unique, so that no row overwrites the files of another.
+
+    File names are compared without case, as on Windows and macOS. A name that is already taken
+    gets the row number appended.
+
+    Args:
+        names (list): The base name of the output files of each row, in row order.
+
+    Returns:
+        list: The unique base names, in row order.
+    """
+    taken = {name.casefold() for name in names}
+    seen = set()
+    unique = []
+    for row_number, name in enumerate(names, start=1):
+        if name.casefold() in seen:
+            candidate, count = f"{name}_{row_number}", 1
+            while candidate.casefold() in taken:
+                count += 1
+                candidate = f"{name}_{row_number}_{count}"
+            name = candidate
+            taken.add(name.casefold())
+        seen.add(name.casefold())
+        unique.append(name)
+    return unique
+
+
+def _init_worker(template_path, inkscape_path, output_dir):
+    """
+    Parse the template once for the lifetime of a worker process.
+
+    Args:
+        template_path (str): The path to the template SVG file.
+        inkscape_path (str): The path to the Inkscape executable, or None.
+        output_dir (str): The directory the output files are written to.
+    """
+    global _template
+    _template = SVGTemplate(template_path)
+    if os.path.abspath(output_dir) != os.path.dirname(os.path.abspath(template_path)):
+        # Relative image links would point next to the outputs instead of next to the template
+        resolve_document_links(_template.root, template_path)
+    if inkscape_path:
+        INKSCAPE_PATH.set(inkscape_path)
+    # Every worker process renders one row at a time, so one Inkscape process each is enough
+    INKSCAPE_POOL.set_size(1)
+
+
+def _generate_row(job):
+    """
+    Generate the output files of one row in a worker process.
+
+    Args:
+        job (tuple): The row number, base name, Quick Edits, output directory, PNG flag and render backend.
+
+    Returns:
+        dict: The result of the row.
+    """
+    row_number, name, quick_edit_attrs, output_dir, png, backend = job
+    result = {'row': row_number, 'name': name, 'svg': None, 'png': None, 'error': None}
+
+    try:
+        plan = _template.get_plan([(attr['ID'], attr['attribute'], attr['type']) for attr in quick_edit_attrs])
+        root = _template.clone(plan)
+        report = plan.execute(root, [attr['value'] for attr in quick_edit_attrs])
+        result.update({status: len(report[status]) for status in (EDIT_APPLIED, EDIT_UNCHANGED, EDIT_NOT_FOUND)})
+
+        svg_path = os.path.join(output_dir, name + ".svg")
+        save_svg_to_file(svg_path, root)
+        result['svg'] = svg_path
+
+        if png:
+            from utils.image_helper import render_options, render_png_data
+
+            # Render the edited copy in memory and write the PNG data as rendered
+            png_path = os.path.join(output_dir, name + ".png")
+            png_data = render_png_data(serialize_svg(root).encode("utf-8"), svg_path, render_options(),
+                                       backend=backend)
+            with atomic_open(png_path, "wb") as file:
+                file.write(png_data)
+            result['png'] = png_path
+    except Exception as e:
+        result['error'] = str(e)
+
+    return result
+
+
+def generate_batch(template_path, rows, output_dir, png=False, workers=None, backend="inkscape"):
+    """
+    Generate one SVG (and optionally one PNG) per row from a template.
+
+    Args:
+        template_path (str): The path to the template SVG file.
+        rows (iterable): Pairs of output name (or None) and list of Quick Edits.
+        output_dir (str): The directory to write the output files to.
+        png (bool): Whether to also export a PNG for each row.
+        workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+        backend (str, optional): The render backend of the PNGs ('inkscape', 'cairosvg' or 'auto').
+
+    Returns:
+        list: One result dictionary per row, in row order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    # Only look Inkscape up when PNGs are rendered; the workers are handed the path found here
+    inkscape_path = INKSCAPE_PATH.get() if png else None
+
+    rows = list(rows)
+    names = unique_output_names([output_name(name, row_number)
+                                 for row_number, (name, _) in enumerate(rows, start=1)])
+    jobs = [(row_number, name, quick_edit_attrs, output_dir, png, backend)
+            for row_number, (name, (_, quick_edit_attrs)) in enumerate(zip(names, rows), start=1)]
+    if not jobs:
+        return []
+
+    # Hand out rows in chunks so that the per-task overhead stays small for large batches
+    chunksize = max(1, len(jobs) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(template_path, inkscape_path, output_dir)) as executor:
+        return list(executor.map(_generate_row, jobs, chunksize=chunksize))
+
+
+def main(argv=None):
+    """
+    Command-line entry point of the batch generator.
+
+    Args:
+        argv (list, optional): The command-line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: The exit status, 1 if any row failed.
+    """
+    parser = argparse.ArgumentParser(description="Generate one SVG per row of a CSV file from a template.")
+    parser.add_argument("template", help="The template SVG file.")
+    parser.add_argument("rows", help="The CSV file with one row of values per output.")
+    parser.add_argument("-o", "--output-dir", default="output", help="The directory to write the outputs to.")
+    parser.add_argument("--png", action="store_true", help="Also export a PNG for each row.")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="The number of worker processes.")
+    parser.add_argument("--backend", default="inkscape", choices=("inkscape", "cairosvg", "auto"),
+                        help="The render backend of the PNGs.")
+    args = parser.parse_args(argv)
+    init_instrumentation()
+
+    results = generate_batch(args.template, read_rows(args.rows), args.output_dir, args.png, args.workers,
+                             args.backend)
+
+    failed = [result for result in results if result['error']]
+    for result in failed:
+        print(f"Row {result['row']} ({result['name']}) failed: {result['error']}")
+    print(f"Generated {len(results) - len(failed)} of {len(results)} rows in {args.output_dir}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
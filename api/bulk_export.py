@@ -0,0 +1,286 @@
+"""
+Bulk export of many SVG files to PNG.
+
+Starting Inkscape takes far longer than exporting a typical card, so the files are split into
+shards and each shard is exported by a single `inkscape --shell` process, which receives one
+line of actions per file. The shards are exported in parallel, and the outcome of every file is
+reported separately: a file that Inkscape cannot open or export does not fail its shard.
+
+Each PNG is exported to a hidden staging file next to its final path and moved into place once
+Inkscape has finished, so an existing PNG is only replaced by a complete one. Files that cannot
+be passed to the Inkscape shell, Inkscape versions without shell actions, and the CairoSVG
+backend export one file at a time through the regular render backends instead.
+
+Usage:
+
+    python -m api.bulk_export assets/Sample -o output --width 800
+"""
+import argparse
+import math
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.config import BULK_EXPORT_PROCESSES, BULK_EXPORT_SHARD_SIZE, INKSCAPE_JOB_TIMEOUT, INKSCAPE_PATH
+from utils.file_helper import atomic_open
+from utils.image_helper import render_options, render_png_data
+from utils.inkscape_pool import is_action_argument
+from utils.instrumentation import init_instrumentation
+from utils.render_backends import get_render_backend
+
+
+def collect_svg_files(sources, recursive=False):
+    """
+    Expand a list of SVG files and directories into a list of SVG files.
+
+    Args:
+        sources (list): Paths of SVG files, or of directories whose SVG files are exported.
+        recursive (bool): Whether to include the SVG files of subdirectories.
+
+    Returns:
+        list: The absolute paths of the SVG files, in the order given, each directory sorted by name.
+    """
+    svg_paths = []
+    for source in sources:
+        if not os.path.isdir(source):
+            svg_paths.append(os.path.abspath(source))
+            continue
+        for directory, subdirectories, file_names in os.walk(source):
+            subdirectories.sort()
+            if not recursive:
+                subdirectories.clear()
+            svg_paths.extend(os.path.abspath(os.path.join(directory, file_name)) for file_name in sorted(file_names)
+                             if file_name.lower().endswith(".svg"))
+    return svg_paths
+
+
+def png_output_path(svg_path, output_dir=None):
+    """
+    Get the path of the PNG exported from an SVG file.
+
+    Args:
+        svg_path (str): The path to the SVG file.
+        output_dir (str, optional): The directory of the PNG. Defaults to the directory of the SVG file.
+
+    Returns:
+        str: The path of the PNG file.
+    """
+    directory, file_name = os.path.split(svg_path)
+    return os.path.join(output_dir or directory, os.path.splitext(file_name)[0] + ".png")
+
+
+def staging_path(png_path):
+    """
+    Get the hidden file a PNG is exported to before it is moved into place.
+
+    Args:
+        png_path (str): The final path of the PNG file.
+
+    Returns:
+        str: The path of the staging file, in the same directory as the PNG.
+    """
+    directory, file_name = os.path.split(png_path)
+    return os.path.join(directory, f".{os.path.splitext(file_name)[0]}.partial-{os.getpid()}.png")
+
+
+def make_shards(jobs, shard_size=BULK_EXPORT_SHARD_SIZE, processes=1):
+    """
+    Split jobs into contiguous shards of about equal size.
+
+    There are enough shards to keep every process busy, and no shard is larger than shard_size.
+
+    Args:
+        jobs (list): The jobs to split.
+        shard_size (int): The largest number of jobs in a shard.
+        processes (int): The number of shards that run at once.
+
+    Returns:
+        list: The shards, as lists of jobs in their original order.
+    """
+    if not jobs:
+        return []
+    count = max(min(processes, len(jobs)), math.ceil(len(jobs) / shard_size))
+    return [jobs[index * len(jobs) // count:(index + 1) * len(jobs) // count] for index in range(count)]
+
+
+def export_shard(inkscape_path, jobs, export_options):
+    """
+    Export a shard of SVG files to PNG with a single Inkscape process.
+
+    Args:
+        inkscape_path (str): The path to the Inkscape executable.
+        jobs (list): The path of each SVG file and of its PNG file.
+        export_options (dict): The Inkscape export options, as returned by render_options.
+
+    Returns:
+        list: One result dictionary per job, in job order.
+    """
+    options = [f"{option}:{value}" for option, value in export_options.items()]
+    lines = []
+    for svg_path, png_path in jobs:
+        staged_path = staging_path(png_path)
+        if os.path.exists(staged_path):
+            os.remove(staged_path)
+        actions = [f"file-open:{svg_path}", "export-type:png", f"export-filename:{staged_path}", *options,
+                   "export-do", "file-close"]
+        lines.append("; ".join(actions) + "\n")
+    lines.append("quit\n")
+
+    timeout = INKSCAPE_JOB_TIMEOUT * len(jobs)
+    error_lines = []
+    try:
+        process = subprocess.run([inkscape_path, "--shell"], input="".join(lines).encode("utf-8"),
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout)
+        error_lines = process.stderr.decode("utf-8", "replace").splitlines()
+        shard_error = f"Inkscape exited with status {process.returncode}" if process.returncode else None
+    except subprocess.TimeoutExpired:
+        shard_error = f"Inkscape did not finish the shard within {timeout} seconds"
+    except OSError as e:
+        shard_error = f"Cannot start Inkscape: {e}"
+
+    results = []
+    for svg_path, png_path in jobs:
+        result = {'svg': svg_path, 'png': None, 'error': None}
+        staged_path = staging_path(png_path)
+        if os.path.isfile(staged_path) and os.path.getsize(staged_path) > 0:
+            os.replace(staged_path, png_path)
+            result['png'] = png_path
+        else:
+            # Inkscape names the file in its messages about it
+            file_errors = [line.strip() for line in error_lines if svg_path in line]
+            result['error'] = " ".join(file_errors) or shard_error or "Inkscape did not export the file"
+            if os.path.exists(staged_path):
+                os.remove(staged_path)
+        results.append(result)
+    return results
+
+
+def export_file(svg_path, png_path, export_options, backend):
+    """
+    Export a single SVG file to PNG through the render backends.
+
+    Args:
+        svg_path (str): The path to the SVG file.
+        png_path (str): The path of the PNG file.
+        export_options (dict): The Inkscape export options, as returned by render_options.
+        backend (str): The name of the render backend, or 'auto'.
+
+    Returns:
+        dict: The result of the file.
+    """
+    result = {'svg': svg_path, 'png': None, 'error': None}
+    try:
+        with open(svg_path, "rb") as file:
+            svg_bytes = file.read()
+        png_data = render_png_data(svg_bytes, svg_path, export_options, backend=backend)
+        with atomic_open(png_path, "wb") as file:
+            file.write(png_data)
+        result['png'] = png_path
+    except Exception as e:
+        result['error'] = str(e) or type(e).__name__
+    return result
+
+
+def export_pngs(sources, output_dir=None, dpi=None, width=None, height=None, background=None, backend="inkscape",
+                processes=BULK_EXPORT_PROCESSES, shard_size=BULK_EXPORT_SHARD_SIZE, recursive=False):
+    """
+    Export many SVG files to PNG, starting as few Inkscape processes as possible.
+
+    Args:
+        sources (list): Paths of SVG files, or of directories whose SVG files are exported.
+        output_dir (str, optional): The directory to write the PNGs to. Defaults to the directory of each SVG.
+        dpi (float, optional): The resolution of the PNGs.
+        width (int, optional): The width of the PNGs in pixels.
+        height (int, optional): The height of the PNGs in pixels.
+        background (str, optional): The background color of the PNGs, such as "#ffffff".
+        backend (str, optional): The render backend: 'inkscape', 'cairosvg' or 'auto'.
+        processes (int, optional): The number of shards exported at once. Defaults to the number of CPUs.
+        shard_size (int, optional): The largest number of files exported by one Inkscape process.
+        recursive (bool): Whether to include the SVG files of subdirectories of the sources.
+
+    Returns:
+        list: One result dictionary per SVG file, in the order of the sources, with the paths of
+            the 'svg' and 'png' files and the 'error' of the file (None if it was exported).
+    """
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    processes = processes or os.cpu_count() or 1
+    export_options = render_options(dpi, width, height, background)
+
+    svg_paths = collect_svg_files(sources, recursive)
+    results = [None] * len(svg_paths)
+    jobs = {}  # Index of the SVG file of each job, by (SVG path, PNG path)
+    png_paths = set()
+    for index, svg_path in enumerate(svg_paths):
+        png_path = os.path.abspath(png_output_path(svg_path, output_dir))
+        if png_path in png_paths:
+            results[index] = {'svg': svg_path, 'png': None, 'error': f"{png_path} is exported from another file"}
+            continue
+        png_paths.add(png_path)
+        jobs[(svg_path, png_path)] = index
+
+    # Shards need the Inkscape shell; everything else is exported one file at a time
+    inkscape_path = None
+    if get_render_backend(backend).name == "inkscape":
+        info = INKSCAPE_PATH.get_info()
+        if info is not None and info['features']['shell_actions']:
+            inkscape_path = INKSCAPE_PATH.get()
+    if inkscape_path and not all(is_action_argument(value) for value in export_options.values()):
+        inkscape_path = None
+    sharded = [job for job in jobs if inkscape_path and all(is_action_argument(path) for path in job)]
+    sharded_jobs = set(sharded)
+    single = [job for job in jobs if job not in sharded_jobs]
+
+    with ThreadPoolExecutor(max_workers=processes) as executor:
+        shard_futures = [(shard, executor.submit(export_shard, inkscape_path, shard, export_options))
+                         for shard in make_shards(sharded, shard_size, processes)]
+        file_futures = [(job, executor.submit(export_file, *job, export_options, backend)) for job in single]
+        for shard, future in shard_futures:
+            for job, result in zip(shard, future.result()):
+                results[jobs[job]] = result
+        for job, future in file_futures:
+            results[jobs[job]] = future.result()
+
+    return results
+
+
+def main(argv=None):
+    """
+    Command-line entry point of the bulk export.
+
+    Args:
+        argv (list, optional): The command-line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: The exit status, 1 if any file failed.
+    """
+    parser = argparse.ArgumentParser(description="Export SVG files and directories of SVG files to PNG.")
+    parser.add_argument("sources", nargs="+", help="The SVG files, or directories of SVG files.")
+    parser.add_argument("-o", "--output-dir", help="The directory to write the PNGs to (default: next to each SVG).")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Include the SVG files of subdirectories.")
+    parser.add_argument("--dpi", type=float, help="The resolution of the PNGs.")
+    parser.add_argument("--width", type=int, help="The width of the PNGs in pixels.")
+    parser.add_argument("--height", type=int, help="The height of the PNGs in pixels.")
+    parser.add_argument("--background", help="The background color, e.g. #ffffff.")
+    parser.add_argument("--backend", default="inkscape", choices=("inkscape", "cairosvg", "auto"),
+                        help="The render backend.")
+    parser.add_argument("-j", "--processes", type=int, default=BULK_EXPORT_PROCESSES,
+                        help="The number of Inkscape processes run at once.")
+    parser.add_argument("--shard-size", type=int, default=BULK_EXPORT_SHARD_SIZE,
+                        help="The largest number of files exported by one Inkscape process.")
+    args = parser.parse_args(argv)
+    init_instrumentation()
+
+    results = export_pngs(args.sources, args.output_dir, args.dpi, args.width, args.height, args.background,
+                          args.backend, args.processes, args.shard_size, args.recursive)
+
+    failed = [result for result in results if result['error']]
+    for result in failed:
+        print(f"{result['svg']} failed: {result['error']}")
+    print(f"Exported {len(results) - len(failed)} of {len(results)} files")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,4 +1,11 @@
-from utils.svg_parser import set_attribute_value
+import os
+
+from app_vars import modification_tracker
+from utils.svg_parser import EDIT_APPLIED, EDIT_NOT_FOUND, EDIT_UNCHANGED, edit_attribute_value
+from utils.template import get_template
+from utils.edit_journal import EDIT_JOURNAL
+from utils.file_helper import atomic_open
+from utils.style import flush_styles
 import xml.etree.ElementTree as ET
 
 
@@ -6,43 +13,93 @@ def save_svg_to_file(svg_path, root_element):
     """
     Save the modified SVG data to a file.
 
+    Nothing is written if the file already holds the document and the document has not been
+    modified since.
+
     Args:
         svg_path (str): The path to save the SVG file.
         root_element (Element): The root element of the modified SVG data.
+
+    Returns:
+        bool: True if the file was written, False if it was already up to date.
     """
+    if modification_tracker.is_written(svg_path, root_element):
+        return False
+
+    # Write pending style edits to the style attributes
+    flush_styles()
+
     # Create an ElementTree object with the root element
     tree = ET.ElementTree(root_element)
 
-    # Write the ElementTree to the SVG file
-    tree.write(svg_path)
+    # Write the ElementTree to a temporary file that replaces the SVG file once complete
+    with atomic_open(svg_path, "wb") as file:
+        tree.write(file)
+    modification_tracker.mark_written(svg_path, root_element)
+    return True
+
+
+def apply_quick_edits(root, quick_edit_attrs):
+    """
+    Apply a list of quick edits to a parsed SVG document in memory.
+
+    When the edit journal is enabled, the edits are undone as a single step.
+
+    Args:
+        root (Element): The root element of the SVG document.
+        quick_edit_attrs (list): Dictionaries containing the ID, attribute name, type, and value.
+
+    Returns:
+        dict: A report with the 'applied', 'unchanged' and 'not_found' edits.
+    """
+    report = {EDIT_APPLIED: [], EDIT_UNCHANGED: [], EDIT_NOT_FOUND: []}
+
+    with EDIT_JOURNAL.group():
+        for attr in quick_edit_attrs:
+            type_id = {'Normal': 1, 'Style': 2, 'Element': 3}[attr['type']]
+            status = edit_attribute_value(root, attr['ID'], attr['attribute'], type_id, attr['value'])
+            report[status].append(attr)
+
+    return report
 
 
 def set_element(svg_path, quick_edit_attrs, save_option, save_as_name=None):
     """
-    Modify the specified attribute of an SVG element.
+    Modify the specified attributes of SVG elements and write the result once.
+
+    All edits are applied in memory first. The file is then written a single time. With 'save',
+    the file is only rewritten if at least one edit changed the document; with 'save_as', the
+    new file is always written unless it is the SVG file itself. The parsed file is cached as a template, so that
+    repeated calls on an unchanged file only copy the elements they edit instead of parsing it.
 
     Args:
         svg_path (str): The path to the SVG file.
-        quick_edit_attr (dict): A dictionary containing the ID, attribute name, type, and value.
+        quick_edit_attrs (list): Dictionaries containing the ID, attribute name, type, and value.
         save_option (str): Option for saving: 'save' or 'save_as'.
         save_as_name (str, optional): The name to use when saving as a new file. Required if save_option is 'save_as'.
+
+    Returns:
+        dict: A report with the 'applied', 'unchanged' and 'not_found' edits, and 'saved_to',
+            the path that was written or None if nothing was written.
     """
-    # Parse the SVG file
-    tree = ET.parse(svg_path)
-    root = tree.getroot()
-
-    for attr in quick_edit_attrs:
-        element_id = attr['ID']
-        attribute_name = attr['attribute']
-        type_id = {'Normal': 1, 'Style': 2, 'Element': 3}[attr['type']]
-        new_value = attr['value']
-
-        # Find the element with the specified ID and set its attribute value
-        if set_attribute_value(root, element_id, attribute_name, type_id, new_value):
-            # Save or Save As functionality based on save_option
-            if save_option == 'save':
-                save_svg_to_file(svg_path, root)
-            elif save_option == 'save_as' and save_as_name:
-                save_svg_to_file(save_as_name, root)
-        else:
-            print("Error Changing Value", element_id)
+    # Copy the cached template of the SVG file, sharing the elements that are not edited
+    template = get_template(svg_path)
+    plan = template.get_plan([(attr['ID'], attr['attribute'], attr['type']) for attr in quick_edit_attrs])
+    root = template.clone(plan)
+
+    report = plan.execute(root, [attr['value'] for attr in quick_edit_attrs])
+    report['saved_to'] = None
+
+    # Save or Save As functionality based on save_option
+    if save_option == 'save' and report[EDIT_APPLIED]:
+        report['saved_to'] = svg_path
+    elif save_option == 'save_as' and save_as_name:
+        # An unchanged document still has to exist under its new name
+        same_file = os.path.normcase(os.path.abspath(save_as_name)) == os.path.normcase(os.path.abspath(svg_path))
+        if report[EDIT_APPLIED] or not same_file:
+            report['saved_to'] = save_as_name
+
+    if report['saved_to'] is not None:
+        save_svg_to_file(report['saved_to'], root)
+
+    return report
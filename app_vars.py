@@ -3,8 +3,11 @@ Module-level constants and classes related to XML namespaces and elements.
 
 Namespace mappings are used to shorten the display of XML namespaces in attribute labels.
 The RootElement and SelectedElement classes are singleton classes used to store the root element
-and the currently selected element, respectively.
+and the currently selected element, respectively. The ModificationTracker singleton counts the
+changes made to documents and remembers which files already hold which document state.
 """
+import os
+import weakref
 
 namespace_mappings = {
     "http://www.w3.org/XML/1998/namespace": "xml",
@@ -96,3 +99,89 @@ class SelectedElement:
 
 selected_element = SelectedElement.get_instance()
 
+
+
+class ModificationTracker:
+    """
+    Singleton class tracking the modification generation of the documents and the files written from them.
+
+    Every mutation of a document bumps the generation. When a document is written to (or read
+    from) a file, the file is recorded together with the document and the generation, so that
+    writing the same document again can be skipped while it has not changed since.
+    """
+    def __init__(self):
+        self.generation = 0
+        self.written = {}  # Path -> (weak reference to the root, generation, modification time, size)
+
+    @staticmethod
+    def get_instance():
+        """
+        Get the singleton instance of ModificationTracker.
+
+        Returns:
+            ModificationTracker: The singleton instance of ModificationTracker.
+        """
+        if not hasattr(ModificationTracker, '_instance'):
+            ModificationTracker._instance = ModificationTracker()
+        return ModificationTracker._instance
+
+    def get_generation(self):
+        """
+        Get the current modification generation.
+
+        Returns:
+            int: The number of modifications made so far.
+        """
+        return self.generation
+
+    def mark_modified(self):
+        """
+        Record that a document has been modified.
+        """
+        self.generation += 1
+
+    def mark_written(self, path, root, generation=None):
+        """
+        Record that a file holds a document in its current state.
+
+        Args:
+            path (str): The path of the file.
+            root (Element): The root element of the document.
+            generation (int, optional): The generation the file corresponds to. Defaults to the current one.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        if generation is None:
+            generation = self.generation
+        self.written[os.path.abspath(path)] = (weakref.ref(root), generation, stat.st_mtime_ns, stat.st_size)
+
+    def is_written(self, path, root):
+        """
+        Check if a file already holds a document in its current state.
+
+        The file must have been recorded for the same document at the current generation and
+        must not have been changed on disk since.
+
+        Args:
+            path (str): The path of the file.
+            root (Element): The root element of the document.
+
+        Returns:
+            bool: True if writing the document to the file can be skipped, False otherwise.
+        """
+        record = self.written.get(os.path.abspath(path))
+        if record is None:
+            return False
+        root_ref, generation, mtime, size = record
+        if root_ref() is not root or generation != self.generation:
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return (stat.st_mtime_ns, stat.st_size) == (mtime, size)
+
+
+modification_tracker = ModificationTracker.get_instance()
@@ -0,0 +1,34 @@
+"""
+Benchmark of element lookups by ID.
+
+Compares the full-tree scan that svg_parser used before the ID index with the indexed
+lookup, on synthetic documents of growing size. Run from the repository root:
+
+    python -m benchmarks.bench_id_index
+"""
+import random
+import timeit
+
+from benchmarks.synthetic import build_document, element_ids
+from utils.svg_parser import find_element_by_id
+
+SIZES = (1000, 10000, 50000, 200000)
+LOOKUPS = 40
+
+
+def main():
+    print(f"{'elements':>10} {'scan (ms)':>12} {'index (ms)':>12}   ({LOOKUPS} lookups)")
+    for size in SIZES:
+        root = build_document(size)
+        ids = random.sample(element_ids(root, "rect") + element_ids(root, "tspan"), LOOKUPS)
+
+        scan = min(timeit.repeat(lambda: [root.find(f".//*[@id='{i}']") for i in ids], number=1, repeat=3))
+
+        find_element_by_id(root, ids[0])  # Build the index outside of the timed section
+        index = min(timeit.repeat(lambda: [find_element_by_id(root, i) for i in ids], number=1, repeat=3))
+
+        print(f"{size:>10} {scan * 1000:>12.3f} {index * 1000:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark of the render backends on the sample assets.
+
+Measures the latency of single renders and the throughput of back-to-back renders for every
+available backend, bypassing the render cache. Run from the repository root:
+
+    python -m benchmarks.bench_render_backends [--renders N] [--width PIXELS]
+"""
+import argparse
+import os
+import statistics
+import time
+
+from utils.inkscape_pool import INKSCAPE_POOL
+from utils.render_backends import RENDER_BACKENDS
+
+SAMPLE_ASSETS = ("assets/Sample.svg", "assets/Sample/SampleTemplate.svg", "assets/LogoGatorSVG.svg")
+
+
+def benchmark_backend(backend, svg_path, renders, width):
+    """
+    Time repeated renders of one file with one backend.
+
+    Args:
+        backend (RenderBackend): The backend to benchmark.
+        svg_path (str): The path to the SVG file.
+        renders (int): The number of timed renders.
+        width (int): The width of the renders in pixels.
+
+    Returns:
+        dict: The first-render, median and p90 latencies in milliseconds and the throughput in renders per second.
+    """
+    with open(svg_path, "rb") as file:
+        svg_bytes = file.read()
+    export_options = {"export-width": width}
+
+    # The first render includes any process or library startup
+    start = time.perf_counter()
+    backend.render(svg_bytes, os.path.abspath(svg_path), export_options)
+    first = time.perf_counter() - start
+
+    latencies = []
+    for _ in range(renders):
+        start = time.perf_counter()
+        backend.render(svg_bytes, os.path.abspath(svg_path), export_options)
+        latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    return {
+        'first_ms': first * 1000,
+        'median_ms': statistics.median(latencies) * 1000,
+        'p90_ms': latencies[int(len(latencies) * 0.9) - 1] * 1000 if len(latencies) >= 10 else latencies[-1] * 1000,
+        'renders_per_s': len(latencies) / sum(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the latency and throughput of the render backends.")
+    parser.add_argument("--renders", type=int, default=20, help="The number of timed renders per file.")
+    parser.add_argument("--width", type=int, default=800, help="The width of the renders in pixels.")
+    args = parser.parse_args()
+
+    backends = [backend for backend in RENDER_BACKENDS.values() if backend.is_available()]
+    skipped = [backend.name for backend in RENDER_BACKENDS.values() if backend not in backends]
+    if skipped:
+        print(f"Not installed: {', '.join(skipped)}")
+
+    print(f"{'backend':<10} {'file':<36} {'first ms':>9} {'median ms':>10} {'p90 ms':>8} {'renders/s':>10}")
+    for backend in backends:
+        for svg_path in SAMPLE_ASSETS:
+            result = benchmark_backend(backend, svg_path, args.renders, args.width)
+            print(f"{backend.name:<10} {svg_path:<36} {result['first_ms']:>9.1f} {result['median_ms']:>10.1f} "
+                  f"{result['p90_ms']:>8.1f} {result['renders_per_s']:>10.1f}")
+
+    INKSCAPE_POOL.close()
+
+
+if __name__ == "__main__":
+    main()
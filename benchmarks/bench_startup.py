@@ -0,0 +1,82 @@
+"""
+Benchmark of the startup time of the headless command-line interface.
+
+Runs each command in a fresh interpreter, as a shell loop would, and compares it with the bare
+interpreter startup. Also lists the heavy modules each command imports. Run from the
+repository root:
+
+    python -m benchmarks.bench_startup [--runs N]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+TEMPLATE = "test/test_svg_file.svg"
+HEAVY_MODULES = ("tkinter", "PIL", "gui")
+
+
+def time_command(arguments, runs):
+    """
+    Time a command run in fresh interpreters.
+
+    Args:
+        arguments (list): The arguments of the Python interpreter.
+        runs (int): The number of timed runs.
+
+    Returns:
+        float: The median wall time in milliseconds.
+    """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + arguments, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def imported_heavy_modules(arguments):
+    """
+    Get the heavy modules a command imports.
+
+    Args:
+        arguments (list): The arguments of the Python interpreter.
+
+    Returns:
+        list: The top-level names of the heavy modules that were imported.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime"] + arguments, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True)
+    imported = {line.rsplit("|", 1)[-1].strip().split(".")[0] for line in result.stderr.splitlines()}
+    return [module for module in HEAVY_MODULES if module in imported]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the startup time of python -m gatorsvg.")
+    parser.add_argument("--runs", type=int, default=20, help="The number of runs per command.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        svg_path = os.path.join(directory, "template.svg")
+        shutil.copy(TEMPLATE, svg_path)
+
+        commands = [
+            ("python -c pass", ["-c", "pass"]),
+            ("gatorsvg -h", ["-m", "gatorsvg", "-h"]),
+            ("gatorsvg get", ["-m", "gatorsvg", "get", svg_path, "desc", "fill", "-t", "Style"]),
+            ("gatorsvg set", ["-m", "gatorsvg", "set", svg_path, "desc", "fill", "#123456", "-t", "Style",
+                              "-o", os.path.join(directory, "out.svg")]),
+        ]
+
+        print(f"{'command':<16} {'median (ms)':>12}   heavy imports")
+        for name, arguments in commands:
+            heavy = imported_heavy_modules(arguments)
+            print(f"{name:<16} {time_command(arguments, args.runs):>12.1f}   {', '.join(heavy) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark of producing edited variants of a template.
+
+Compares re-parsing the template for every variant with deep-copying a parsed template and with
+the copy-on-write clone of an EditPlan, on the sample template and on a large synthetic
+template. Run from the repository root:
+
+    python -m benchmarks.bench_template_clone [--variants N] [--elements N]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from api.batch import read_rows
+from api.module import apply_quick_edits
+from benchmarks.synthetic import element_ids, write_document
+from utils.svg_parser import load_svg
+from utils.template import SVGTemplate
+
+SAMPLE_TEMPLATE = "assets/Sample/SampleTemplate.svg"
+SAMPLE_ROWS = "assets/Sample/batch_rows.csv"
+
+
+def time_variants(make_variant, rows, variants):
+    """
+    Time the generation of a number of variants.
+
+    Args:
+        make_variant: Called with the Quick Edits of a row to produce one edited variant.
+        rows (list): The Quick Edits of the rows, used in turn.
+        variants (int): The number of variants to produce.
+
+    Returns:
+        float: The mean time per variant in milliseconds.
+    """
+    # One untimed variant, so that one-time work such as compiling a plan is not counted
+    make_variant(rows[0])
+
+    start = time.perf_counter()
+    for i in range(variants):
+        make_variant(rows[i % len(rows)])
+    return (time.perf_counter() - start) * 1000 / variants
+
+
+def benchmark_template(svg_path, rows, variants):
+    """
+    Compare the ways of producing variants of one template.
+
+    Args:
+        svg_path (str): The path to the template.
+        rows (list): The Quick Edits of the rows.
+        variants (int): The number of variants per method.
+
+    Returns:
+        dict: The mean time per variant in milliseconds of each method.
+    """
+    template = SVGTemplate(svg_path)
+
+    def parse(quick_edit_attrs):
+        apply_quick_edits(load_svg(svg_path).getroot(), quick_edit_attrs)
+
+    def deep_copy(quick_edit_attrs):
+        apply_quick_edits(template.clone(), quick_edit_attrs)
+
+    def plan_clone(quick_edit_attrs):
+        plan = template.get_plan([(attr['ID'], attr['attribute'], attr['type']) for attr in quick_edit_attrs])
+        plan.execute(template.clone(plan), [attr['value'] for attr in quick_edit_attrs])
+
+    return {
+        'parse': time_variants(parse, rows, variants),
+        'deepcopy': time_variants(deep_copy, rows, variants),
+        'plan clone': time_variants(plan_clone, rows, variants),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare parse-per-variant with clone-per-variant.")
+    parser.add_argument("--variants", type=int, default=200, help="The number of variants per method.")
+    parser.add_argument("--elements", type=int, default=50000, help="The size of the synthetic template.")
+    args = parser.parse_args()
+
+    sample_rows = [quick_edit_attrs for _, quick_edit_attrs in read_rows(SAMPLE_ROWS)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        synthetic_path = os.path.join(directory, "synthetic.svg")
+        rect_ids = element_ids(write_document(synthetic_path, args.elements), "rect")
+        # Like a batch, every row edits the same targets with different values
+        synthetic_rows = [[
+            {'ID': rect_ids[(j * 7919) % len(rect_ids)], 'attribute': 'fill', 'type': 'Style',
+             'value': f"#{(i * 31 + j) % 0xffffff:06x}"}
+            for j in range(5)
+        ] for i in range(50)]
+
+        # Parsing the large template is slow, so it gets fewer variants
+        cases = [
+            ("sample", SAMPLE_TEMPLATE, sample_rows, args.variants),
+            (f"synthetic ({args.elements})", synthetic_path, synthetic_rows, max(1, args.variants // 20)),
+        ]
+
+        print(f"{'template':<22} {'variants':>9} {'parse (ms)':>12} {'deepcopy (ms)':>14} {'plan clone (ms)':>16}")
+        for name, svg_path, rows, variants in cases:
+            result = benchmark_template(svg_path, rows, variants)
+            print(f"{name:<22} {variants:>9} {result['parse']:>12.3f} {result['deepcopy']:>14.3f} "
+                  f"{result['plan clone']:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
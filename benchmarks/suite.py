@@ -0,0 +1,323 @@
+"""
+Benchmark suite of parsing, lookups, edits, saving and rendering on synthetic documents.
+
+Every operation is timed on synthetic documents of growing size (see benchmarks.synthetic).
+Its peak Python memory is then measured with tracemalloc in a separate, untimed run, so that
+tracing does not distort the timings. The results are printed as a table and can be written as
+JSON. A second run can be compared against a stored baseline to find regressions between
+commits.
+
+Saving writes and fsyncs files, so those operations vary much more than the CPU-bound ones.
+The files are written to tmpfs (/dev/shm) when it exists, the I/O-bound operations are run
+more often, and they are reported and compared separately, with their own threshold. Run from
+the repository root:
+
+    python -m benchmarks.suite -o results.json
+    python -m benchmarks.suite --sizes 1000 10000 100000 1000000 --render-max 0
+    python -m benchmarks.suite -o new.json --compare results.json
+
+The exit status is 1 if --compare finds an operation slower than --threshold times the baseline,
+or an I/O-bound operation slower than --io-threshold times the baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+
+from app_vars import modification_tracker
+from api.module import save_svg_to_file, set_element
+from benchmarks.synthetic import element_ids, write_document
+from utils.render_backends import get_render_backend
+from utils.svg_parser import find_attribute_value, load_svg, parse_style, set_attribute_value
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+LOOKUPS = 100           # Attribute lookups and edits per measurement
+RENDER_MAX = 10000      # Largest document that is rendered by default
+IO_REPEAT = 15          # Default timed runs of the operations that write files
+IO_BENCHMARKS = ('save_svg_to_file', 'set_element_cold', 'set_element')
+TMPFS_DIR = "/dev/shm"  # Directory for the benchmark files, if it exists
+
+
+def measure(function, repeat, setup=None):
+    """
+    Time a function and measure its peak memory.
+
+    Args:
+        function: The operation to measure, called without arguments.
+        repeat (int): The number of timed runs.
+        setup (optional): Called before every run, outside of the measurement.
+
+    Returns:
+        dict: The minimum and median time in seconds, the peak memory allocated by the
+            operation in bytes, and the number of runs.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'min_s': min(times), 'median_s': statistics.median(times), 'peak_bytes': peak, 'repeat': repeat}
+
+
+def benchmark_size(directory, element_count, repeat, io_repeat, render_backend):
+    """
+    Run every benchmark on a synthetic document of one size.
+
+    Args:
+        directory (str): A directory for the generated and saved files.
+        element_count (int): The number of elements of the document.
+        repeat (int): The number of timed runs of each CPU-bound operation.
+        io_repeat (int): The number of timed runs of each operation that writes files.
+        render_backend (RenderBackend): The backend to render with, or None to skip rendering.
+
+    Returns:
+        dict: The measurement of each operation, by name. Skipped operations have a 'skipped' reason.
+    """
+    svg_path = os.path.join(directory, f"synthetic-{element_count}.svg")
+    output_path = os.path.join(directory, f"synthetic-{element_count}-saved.svg")
+    write_document(svg_path, element_count)
+
+    root = load_svg(svg_path).getroot()
+    shape_ids = element_ids(root, "rect") + element_ids(root, "ellipse") + element_ids(root, "path")
+    tspan_ids = element_ids(root, "tspan")
+    step = max(1, len(shape_ids) // LOOKUPS)
+    shapes = shape_ids[::step][:LOOKUPS]
+    tspans = tspan_ids[::max(1, len(tspan_ids) // LOOKUPS)][:LOOKUPS]
+    styles = [element.get("style") for element in root.iter() if element.get("style")]
+
+    edits = {'count': 0}
+
+    def find():
+        for element_id in shapes:
+            find_attribute_value(root, element_id, "fill", 2)
+            find_attribute_value(root, element_id, "style", 1)
+        for element_id in tspans:
+            find_attribute_value(root, element_id, "{svg}tspan", 3)
+
+    def set_values():
+        # A new value on every run, so that every edit is applied
+        edits['count'] += 1
+        for element_id in shapes:
+            set_attribute_value(root, element_id, "fill", 2, f"#{edits['count'] % 0x1000000:06x}")
+
+    def parse_styles():
+        for style in styles:
+            parse_style(style)
+
+    quick_edit_attrs = [{'ID': element_id, 'attribute': 'fill', 'type': 'Style', 'value': "#462254"}
+                        for element_id in shapes[:10]]
+
+    def touch_template():
+        # A new modification time makes the next set_element parse the template again
+        stat = os.stat(svg_path)
+        os.utime(svg_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+    results = {
+        'parse': measure(lambda: ET.parse(svg_path), repeat),
+        'find_attribute_value': measure(find, repeat),
+        'set_attribute_value': measure(set_values, repeat),
+        'parse_style': measure(parse_styles, repeat),
+        'save_svg_to_file': measure(lambda: save_svg_to_file(output_path, root), io_repeat,
+                                    setup=modification_tracker.mark_modified),
+        'set_element_cold': measure(lambda: set_element(svg_path, quick_edit_attrs, 'save_as', output_path),
+                                    io_repeat, setup=touch_template),
+    }
+    set_element(svg_path, quick_edit_attrs, 'save_as', output_path)
+    results['set_element'] = measure(lambda: set_element(svg_path, quick_edit_attrs, 'save_as', output_path),
+                                     io_repeat)
+    for name in IO_BENCHMARKS:
+        results[name]['io'] = True
+
+    if render_backend is None:
+        results['render'] = {'skipped': "not requested for this size"}
+    elif not render_backend.is_available():
+        results['render'] = {'skipped': f"the {render_backend.name} backend is not available"}
+    else:
+        with open(svg_path, "rb") as file:
+            svg_bytes = file.read()
+        # The backend is called directly, so that the render cache is bypassed
+        try:
+            results['render'] = measure(lambda: render_backend.render(svg_bytes, svg_path, {'export-width': 800}),
+                                        repeat)
+            results['render']['backend'] = render_backend.name
+        except Exception as e:
+            results['render'] = {'skipped': f"render failed: {e}"}
+
+    return results
+
+
+def git_commit():
+    """
+    Get the commit the benchmarks run on.
+
+    Returns:
+        str: The commit hash, or None if it cannot be determined.
+    """
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.decode().strip() or None
+
+
+def run_suite(sizes, repeat, backend, render_max, io_repeat=IO_REPEAT):
+    """
+    Run the benchmarks on every size.
+
+    Args:
+        sizes (list): The numbers of elements of the synthetic documents.
+        repeat (int): The number of timed runs of each CPU-bound operation.
+        backend (str): The render backend: 'inkscape', 'cairosvg' or 'auto'.
+        render_max (int): The largest document that is rendered.
+        io_repeat (int): The number of timed runs of each operation that writes files.
+
+    Returns:
+        dict: The environment of the run and one result per operation and size.
+    """
+    directory = TMPFS_DIR if os.path.isdir(TMPFS_DIR) and os.access(TMPFS_DIR, os.W_OK) else None
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'tmpfs': directory is not None,
+        'results': [],
+    }
+    render_backend = get_render_backend(backend)
+
+    with tempfile.TemporaryDirectory(dir=directory) as directory:
+        for size in sizes:
+            measurements = benchmark_size(directory, size, repeat, io_repeat,
+                                          render_backend if size <= render_max else None)
+            for name, measurement in measurements.items():
+                report['results'].append({'benchmark': name, 'elements': size, **measurement})
+    return report
+
+
+def print_report(report):
+    """
+    Print the results of a run as a table, with the I/O-bound operations after the CPU-bound ones.
+
+    Args:
+        report (dict): The report returned by run_suite.
+    """
+    for io in (False, True):
+        if io:
+            print(f"\nI/O-bound ({'tmpfs' if report.get('tmpfs') else 'disk'}):")
+        print(f"{'benchmark':<22} {'elements':>9} {'min (ms)':>11} {'median (ms)':>12} {'peak (KiB)':>11}")
+        for result in report['results']:
+            if result.get('io', False) != io:
+                continue
+            if 'skipped' in result:
+                print(f"{result['benchmark']:<22} {result['elements']:>9}   skipped: {result['skipped']}")
+                continue
+            print(f"{result['benchmark']:<22} {result['elements']:>9} {result['min_s'] * 1000:>11.3f} "
+                  f"{result['median_s'] * 1000:>12.3f} {result['peak_bytes'] / 1024:>11.1f}")
+
+
+def compare_reports(baseline, report, threshold, io_threshold=None):
+    """
+    Compare the minimum times of a run with a baseline run, which vary less than the medians.
+
+    The I/O-bound operations are compared separately, with their own threshold.
+
+    Args:
+        baseline (dict): The report of the baseline run.
+        report (dict): The report of the new run.
+        threshold (float): The ratio of new to baseline time above which an operation has regressed.
+        io_threshold (float, optional): The same ratio for the I/O-bound operations. Defaults to threshold.
+
+    Returns:
+        list: The regressed operations, as (benchmark, elements, ratio) tuples.
+    """
+    baseline_times = {(result['benchmark'], result['elements']): result['min_s']
+                      for result in baseline['results'] if 'min_s' in result}
+    regressions = []
+    for io in (False, True):
+        limit = io_threshold if io and io_threshold is not None else threshold
+        kind = "I/O-bound" if io else "CPU-bound"
+        print(f"\n{kind} compared with {baseline.get('commit') or 'baseline'} (threshold {limit:.2f}x):")
+        for result in report['results']:
+            key = (result['benchmark'], result['elements'])
+            if result.get('io', False) != io or 'min_s' not in result or not baseline_times.get(key):
+                continue
+            ratio = result['min_s'] / baseline_times[key]
+            flag = "  REGRESSION" if ratio > limit else ""
+            print(f"{key[0]:<22} {key[1]:>9} {ratio:>8.2f}x{flag}")
+            if ratio > limit:
+                regressions.append((key[0], key[1], ratio))
+    return regressions
+
+
+def main(argv=None):
+    """
+    Command-line entry point of the benchmark suite.
+
+    Args:
+        argv (list, optional): The command-line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: The exit status, 1 if a regression was found.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark GatorSVG on synthetic documents.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="The numbers of elements of the synthetic documents (up to 1000000).")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="The number of timed runs of each CPU-bound operation.")
+    parser.add_argument("--io-repeat", type=int, default=IO_REPEAT,
+                        help="The number of timed runs of each operation that writes files.")
+    parser.add_argument("--backend", default="auto", choices=("inkscape", "cairosvg", "auto"),
+                        help="The render backend.")
+    parser.add_argument("--render-max", type=int, default=RENDER_MAX,
+                        help="The largest document that is rendered; 0 skips rendering.")
+    parser.add_argument("-o", "--output", help="Write the results as JSON to this file, or - for standard output.")
+    parser.add_argument("--compare", help="A JSON file of an earlier run to compare the results with.")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="The slowdown ratio reported as a regression by --compare.")
+    parser.add_argument("--io-threshold", type=float, default=1.5,
+                        help="The slowdown ratio of an I/O-bound operation reported as a regression by --compare.")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.repeat, args.backend, args.render_max, args.io_repeat)
+
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        if compare_reports(baseline, report, args.threshold, args.io_threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
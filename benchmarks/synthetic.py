@@ -0,0 +1,244 @@
+"""
+Synthetic SVG documents for the benchmarks.
+
+The documents are shaped like the templates GatorSVG edits: an Inkscape layer of nested,
+transformed groups holding rectangles, ellipses and paths with long Inkscape style
+attributes, some of them filled with gradients from the defs, and text elements with one or
+more tspan lines. The mix is generated from a seeded random number generator, so a given size
+and seed always produce the same document.
+
+    python -m benchmarks.synthetic 100000 synthetic.svg
+"""
+import random
+import sys
+import xml.etree.ElementTree as ET
+
+SVG = "{http://www.w3.org/2000/svg}"
+INKSCAPE = "{http://www.inkscape.org/namespaces/inkscape}"
+SODIPODI = "{http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd}"
+XLINK = "{http://www.w3.org/1999/xlink}"
+
+# Share of the generated elements taken by each kind of content, the rest are shapes
+GRADIENT_SHARE = 0.05
+TEXT_SHARE = 0.15
+GROUP_SIZE = 25
+
+FONTS = ("'Bauhaus 93'", "sans-serif", "'DejaVu Serif'", "Arial")
+WORDS = ("movie", "series", "rating", "the", "best", "watch", "season", "episode", "popcorn", "night")
+
+
+def random_color(rng):
+    """
+    Pick a random color.
+
+    Args:
+        rng (Random): The random number generator.
+
+    Returns:
+        str: The color, such as "#ffb380".
+    """
+    return f"#{rng.randrange(0x1000000):06x}"
+
+
+def shape_style(rng, gradient_ids):
+    """
+    Build the style attribute of a shape, as Inkscape writes it.
+
+    Args:
+        rng (Random): The random number generator.
+        gradient_ids (list): The IDs of the gradients defined so far.
+
+    Returns:
+        str: The style attribute.
+    """
+    fill = f"url(#{rng.choice(gradient_ids)})" if gradient_ids and rng.random() < 0.2 else random_color(rng)
+    return (f"fill:{fill};fill-opacity:1;stroke:{random_color(rng)};stroke-width:{rng.uniform(0.1, 2):.6f};"
+            f"stroke-linecap:round;stroke-linejoin:round;stroke-dasharray:none;stroke-opacity:1")
+
+
+def text_style(rng, font_size):
+    """
+    Build the style attribute of a text or tspan element, as Inkscape writes it.
+
+    Args:
+        rng (Random): The random number generator.
+        font_size (float): The font size in pixels.
+
+    Returns:
+        str: The style attribute.
+    """
+    font = rng.choice(FONTS)
+    return (f"font-style:normal;font-variant:normal;font-weight:normal;font-stretch:normal;"
+            f"font-size:{font_size:.4f}px;line-height:1.25;font-family:{font};"
+            f"-inkscape-font-specification:{font};fill:{random_color(rng)};stroke:none")
+
+
+class DocumentBuilder:
+    """
+    Builds a synthetic document element by element.
+    """
+    def __init__(self, seed):
+        """
+        Initialize the DocumentBuilder with an empty document.
+
+        Args:
+            seed (int): The seed of the random number generator.
+        """
+        self.rng = random.Random(seed)
+        self.count = 0
+        self.gradient_ids = []
+        self.root = ET.Element(f"{SVG}svg", {
+            'width': "210mm", 'height': "297mm", 'viewBox': "0 0 210 297", 'version': "1.1", 'id': "svg1",
+        })
+        self.defs = self.add(self.root, "defs")
+        self.layer = self.add(self.root, "g", {f"{INKSCAPE}label": "Layer 1", f"{INKSCAPE}groupmode": "layer"},
+                              element_id="layer1")
+        self.group = self.layer
+
+    def add(self, parent, tag, attributes=None, element_id=None):
+        """
+        Add an element with an Inkscape-style ID, such as "rect12".
+
+        Args:
+            parent (Element): The parent element.
+            tag (str): The local name of the SVG element.
+            attributes (dict, optional): The attributes of the element.
+            element_id (str, optional): The ID, instead of the generated one.
+
+        Returns:
+            Element: The new element.
+        """
+        self.count += 1
+        element = ET.SubElement(parent, f"{SVG}{tag}", attributes or {})
+        element.set("id", element_id or f"{tag}{self.count}")
+        return element
+
+    def add_gradient(self):
+        """
+        Add a linear gradient with two stops, and a gradient linking to it, to the defs.
+        """
+        rng = self.rng
+        gradient = self.add(self.defs, "linearGradient", {f"{INKSCAPE}collect": "always"})
+        for offset in ("0", "1"):
+            self.add(gradient, "stop", {'style': f"stop-color:{random_color(rng)};stop-opacity:1",
+                                        'offset': offset})
+        linked = self.add(self.defs, "linearGradient", {
+            f"{INKSCAPE}collect": "always", f"{XLINK}href": f"#{gradient.get('id')}",
+            'x1': f"{rng.uniform(0, 100):.6f}", 'y1': "0", 'x2': f"{rng.uniform(100, 210):.6f}", 'y2': "0",
+            'gradientUnits': "userSpaceOnUse",
+        })
+        self.gradient_ids.append(linked.get("id"))
+
+    def add_group(self):
+        """
+        Start a new transformed group, nested in the current one or in the layer.
+        """
+        rng = self.rng
+        parent = self.group if rng.random() < 0.3 and self.group is not self.layer else self.layer
+        self.group = self.add(parent, "g", {
+            'transform': f"matrix(0.998,0,0,1,{rng.uniform(-50, 50):.6f},{rng.uniform(-50, 50):.6f})",
+            f"{INKSCAPE}label": f"g{self.count + 1}",
+        })
+
+    def add_shape(self):
+        """
+        Add a rectangle, an ellipse or a path to the current group.
+        """
+        rng = self.rng
+        style = shape_style(rng, self.gradient_ids)
+        kind = rng.random()
+        if kind < 0.4:
+            self.add(self.group, "rect", {
+                'style': style, 'width': f"{rng.uniform(1, 200):.6f}", 'height': f"{rng.uniform(1, 200):.6f}",
+                'x': f"{rng.uniform(0, 210):.6f}", 'y': f"{rng.uniform(0, 297):.6f}",
+            })
+        elif kind < 0.7:
+            self.add(self.group, "ellipse", {
+                'style': style, 'cx': f"{rng.uniform(0, 210):.6f}", 'cy': f"{rng.uniform(0, 297):.6f}",
+                'rx': f"{rng.uniform(1, 50):.6f}", 'ry': f"{rng.uniform(1, 50):.6f}",
+            })
+        else:
+            points = " ".join(f"{rng.uniform(0, 210):.3f},{rng.uniform(0, 297):.3f}" for _ in range(rng.randint(3, 8)))
+            self.add(self.group, "path", {'style': style, 'd': f"M {points} Z"})
+
+    def add_text(self):
+        """
+        Add a text element with one to three tspan lines to the current group.
+        """
+        rng = self.rng
+        font_size = rng.uniform(4, 24)
+        x, y = rng.uniform(0, 210), rng.uniform(0, 297)
+        text = self.add(self.group, "text", {
+            '{http://www.w3.org/XML/1998/namespace}space': "preserve", 'style': text_style(rng, font_size),
+            'x': f"{x:.6f}", 'y': f"{y:.6f}",
+        })
+        for line in range(rng.randint(1, 3)):
+            tspan = self.add(text, "tspan", {
+                f"{SODIPODI}role": "line", 'style': text_style(rng, font_size),
+                'x': f"{x:.6f}", 'y': f"{y + line * font_size * 1.25:.6f}",
+            })
+            tspan.text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 8)))
+
+
+def build_document(element_count, seed=0):
+    """
+    Build a synthetic document.
+
+    Args:
+        element_count (int): The approximate number of elements of the document.
+        seed (int): The seed of the random number generator.
+
+    Returns:
+        Element: The root element of the document.
+    """
+    builder = DocumentBuilder(seed)
+    rng = builder.rng
+    while builder.count < element_count:
+        if builder.count % GROUP_SIZE == 0:
+            builder.add_group()
+        kind = rng.random()
+        if kind < GRADIENT_SHARE or not builder.gradient_ids:
+            builder.add_gradient()
+        elif kind < GRADIENT_SHARE + TEXT_SHARE:
+            builder.add_text()
+        else:
+            builder.add_shape()
+    return builder.root
+
+
+def write_document(svg_path, element_count, seed=0):
+    """
+    Build a synthetic document and write it to a file.
+
+    Args:
+        svg_path (str): The path of the SVG file to write.
+        element_count (int): The approximate number of elements of the document.
+        seed (int): The seed of the random number generator.
+
+    Returns:
+        Element: The root element of the document.
+    """
+    root = build_document(element_count, seed)
+    ET.ElementTree(root).write(svg_path, encoding="utf-8", xml_declaration=True)
+    return root
+
+
+def element_ids(root, tag):
+    """
+    Get the IDs of the elements with a given local name, in document order.
+
+    Args:
+        root (Element): The root element of the document.
+        tag (str): The local name, such as "rect" or "tspan".
+
+    Returns:
+        list: The IDs of the elements.
+    """
+    return [element.get("id") for element in root.iter(f"{SVG}{tag}") if element.get("id")]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python -m benchmarks.synthetic ELEMENTS OUTPUT")
+        raise SystemExit(2)
+    write_document(sys.argv[2], int(sys.argv[1]))
@@ -0,0 +1,6 @@
+"""
+Headless command-line interface of GatorSVG.
+
+Run from the repository root with ``python -m gatorsvg``. The commands never import tkinter or
+the GUI package, and only load the rendering modules when a PNG is requested.
+"""
@@ -0,0 +1,325 @@
+"""
+Command-line commands for editing and exporting SVG files without the GUI.
+
+Usage:
+
+    python -m gatorsvg get FILE ID ATTRIBUTE [-t TYPE]
+    python -m gatorsvg set FILE ID ATTRIBUTE VALUE [-t TYPE] [-o OUTPUT]
+    python -m gatorsvg apply-quick-edits FILE QUICK_EDIT_FILE [-o OUTPUT]
+    python -m gatorsvg export FILE OUTPUT [--dpi DPI] [--width W] [--height H] [--background COLOR] [--backend NAME]
+    python -m gatorsvg export-targets FILE TARGET [TARGET ...] [--background COLOR] [--backend NAME]
+    python -m gatorsvg check-links FILE
+    python -m gatorsvg export-bulk SOURCE [SOURCE ...] [export-bulk options]
+    python -m gatorsvg batch TEMPLATE ROWS [batch options]
+
+These commands run in tight shell loops, so modules are imported by the command that needs
+them rather than at the top of this module.
+"""
+import argparse
+import sys
+
+from utils.quick_edits import QUICK_EDIT_TYPES
+
+
+def print_error(message):
+    """
+    Print an error message to standard error.
+
+    Args:
+        message (str): The message.
+    """
+    print(f"gatorsvg: {message}", file=sys.stderr)
+
+
+def run_get(args):
+    """
+    Print the value of an attribute.
+
+    Args:
+        args (Namespace): The parsed arguments.
+
+    Returns:
+        int: The exit status, 1 if the element or attribute does not exist.
+    """
+    from utils.quick_edits import type_name_to_id
+    from utils.svg_parser import get_attribute_value, load_svg
+
+    root = load_svg(args.file).getroot()
+    value = get_attribute_value(root, args.id, args.attribute, type_name_to_id(args.type))
+    if value is None:
+        print_error(f"{args.type} attribute '{args.attribute}' of '{args.id}' not found")
+        return 1
+    print(value)
+    return 0
+
+
+def apply_edits(svg_path, quick_edit_attrs, output):
+    """
+    Apply Quick Edits to a file and report the outcome.
+
+    Args:
+        svg_path (str): The path to the SVG file.
+        quick_edit_attrs (list): Dictionaries containing the ID, attribute name, type, and value.
+        output (str): The path to write the result to, or None to overwrite the file.
+
+    Returns:
+        int: The exit status, 1 if any edit did not find its element or attribute.
+    """
+    from api.module import set_element
+    from utils.svg_parser import EDIT_APPLIED, EDIT_NOT_FOUND, EDIT_UNCHANGED
+
+    if output is None:
+        report = set_element(svg_path, quick_edit_attrs, 'save')
+    else:
+        report = set_element(svg_path, quick_edit_attrs, 'save_as', output)
+
+    for attr in report[EDIT_NOT_FOUND]:
+        print_error(f"{attr['type']} attribute '{attr['attribute']}' of '{attr['ID']}' not found")
+    print(f"{len(report[EDIT_APPLIED])} applied, {len(report[EDIT_UNCHANGED])} unchanged, "
+          f"{len(report[EDIT_NOT_FOUND])} not found")
+    return 1 if report[EDIT_NOT_FOUND] else 0
+
+
+def run_set(args):
+    """
+    Set the value of an attribute.
+
+    Args:
+        args (Namespace): The parsed arguments.
+
+    Returns:
+        int: The exit status, 1 if the element or attribute does not exist.
+    """
+    quick_edit = {'ID': args.id, 'attribute': args.attribute, 'type': args.type, 'value': args.value}
+    return apply_edits(args.file, [quick_edit], args.output)
+
+
+def run_apply_quick_edits(args):
+    """
+    Apply the edits of a Quick Edit file.
+
+    Args:
+        args (Namespace): The parsed arguments.
+
+    Returns:
+        int: The exit status, 1 if any edit did not find its element or attribute.
+    """
+    from utils.quick_edits import read_quick_edit_file
+
+    quick_edit_attrs = list(read_quick_edit_file(args.quick_edit_file))
+    invalid = [attr for attr in quick_edit_attrs if attr['type'] not in QUICK_EDIT_TYPES]
+    for attr in invalid:
+        print_error(f"Invalid type '{attr['type']}' for '{attr['ID']}'")
+    if invalid:
+        return 2
+    return apply_edits(args.file, quick_edit_attrs, args.output)
+
+
+def run_export(args):
+    """
+    Render a file to PNG.
+
+    The PNG data is written as rendered, so Pillow is not needed.
+
+    Args:
+        args (Namespace): The parsed arguments.
+
+    Returns:
+        int: The exit status, 1 if the render failed.
+    """
+    import os
+
+    from utils.file_helper import atomic_open
+    from utils.image_helper import render_options, render_png_data
+
+    svg_path = os.path.abspath(args.file)
+    with open(svg_path, "rb") as file:
+        svg_bytes = file.read()
+
+    try:
+        png_data = render_png_data(svg_bytes, svg_path, render_options(args.dpi, args.width, args.height,
+                                                                        args.background), backend=args.backend)
+    except Exception as e:
+        print_error(f"Rendering {args.file} failed: {e}")
+        return 1
+
+    with atomic_open(args.output, "wb") as file:
+        file.write(png_data)
+    return 0
+
+
+def run_export_targets(args):
+    """
+    Render a file once and write it at several sizes and in several formats.
+
+    Args:
+        args (Namespace): The parsed arguments.
+
+    Returns:
+        int: The exit status, 1 if the render or any target failed.
+    """
+    from utils.export_targets import export_targets, parse_target
+
+    try:
+        targets = [parse_target(spec) for spec in args.targets]
+        results = export_targets(args.file, targets, args.background, args.backend)
+    except Exception as e:
+        print_error(f"Exporting {args.file} failed: {e}")
+        return 1
+
+    for result in results:
+        if result['error']:
+            print_error(f"Writing {result['path']} failed: {result['error']}")
+    return 1 if any(result['error'] for result in results) else 0
+
+
+def run_check_links(args):
+    """
+    Print the image links of a file whose linked file does not exist.
+
+    Args:
+        args (Namespace): The parsed arguments.
+
+    Returns:
+        int: The exit status, 1 if a linked image is missing.
+    """
+    from utils.image_links import ImageLinkResolver
+    from utils.svg_parser import load_svg
+
+    resolver = ImageLinkResolver(args.file)
+    resolver.resolve_all(load_svg(args.file).getroot())
+    missing = resolver.missing_links()
+    resolver.close()
+    for link in missing:
+        print(f"{link['id']}\t{link['path']}")
+    return 1 if missing else 0
+
+
+def run_export_bulk(export_args):
+    """
+    Run the bulk export.
+
+    Args:
+        export_args (list): The arguments of the bulk export, including its options.
+
+    Returns:
+        int: The exit status of the bulk export.
+    """
+    from api.bulk_export import main as bulk_export_main
+
+    return bulk_export_main(export_args)
+
+
+def run_batch(batch_args):
+    """
+    Run the batch generator.
+
+    Args:
+        batch_args (list): The arguments of the batch generator, including its options.
+
+    Returns:
+        int: The exit status of the batch.
+    """
+    from api.batch import main as batch_main
+
+    return batch_main(batch_args)
+
+
+def build_parser():
+    """
+    Build the argument parser of the command-line interface.
+
+    Returns:
+        ArgumentParser: The parser, with one subcommand per command.
+    """
+    parser = argparse.ArgumentParser(prog="gatorsvg", description="Edit and export SVG files without the GUI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    get_parser = commands.add_parser("get", help="Print the value of an attribute.")
+    get_parser.add_argument("file", help="The SVG file.")
+    get_parser.add_argument("id", help="The ID of the element.")
+    get_parser.add_argument("attribute", help="The attribute name, e.g. fill or {xlink}href.")
+    get_parser.add_argument("-t", "--type", default="Normal", choices=QUICK_EDIT_TYPES, help="The attribute type.")
+    get_parser.set_defaults(run=run_get)
+
+    set_parser = commands.add_parser("set", help="Set the value of an attribute.")
+    set_parser.add_argument("file", help="The SVG file.")
+    set_parser.add_argument("id", help="The ID of the element.")
+    set_parser.add_argument("attribute", help="The attribute name, e.g. fill or {xlink}href.")
+    set_parser.add_argument("value", help="The new value.")
+    set_parser.add_argument("-t", "--type", default="Normal", choices=QUICK_EDIT_TYPES, help="The attribute type.")
+    set_parser.add_argument("-o", "--output", help="Write the result to this file instead of overwriting FILE.")
+    set_parser.set_defaults(run=run_set)
+
+    apply_parser = commands.add_parser("apply-quick-edits", help="Apply the edits of a Quick Edit file.")
+    apply_parser.add_argument("file", help="The SVG file.")
+    apply_parser.add_argument("quick_edit_file", help="The Quick Edit file.")
+    apply_parser.add_argument("-o", "--output", help="Write the result to this file instead of overwriting FILE.")
+    apply_parser.set_defaults(run=run_apply_quick_edits)
+
+    export_parser = commands.add_parser("export", help="Render an SVG file to PNG.")
+    export_parser.add_argument("file", help="The SVG file.")
+    export_parser.add_argument("output", help="The PNG file to write.")
+    export_parser.add_argument("--dpi", type=float, help="The resolution of the PNG.")
+    export_parser.add_argument("--width", type=int, help="The width of the PNG in pixels.")
+    export_parser.add_argument("--height", type=int, help="The height of the PNG in pixels.")
+    export_parser.add_argument("--background", help="The background color, e.g. #ffffff.")
+    export_parser.add_argument("--backend", default="auto", choices=("inkscape", "cairosvg", "auto"),
+                               help="The render backend.")
+    export_parser.set_defaults(run=run_export)
+
+    targets_parser = commands.add_parser("export-targets",
+                                         help="Render an SVG file once and write it at several sizes and formats.")
+    targets_parser.add_argument("file", help="The SVG file.")
+    targets_parser.add_argument("targets", nargs="+", metavar="target",
+                                help="An image to write, as PATH or PATH=SIZE with SIZE e.g. 2x, 256w, 256h "
+                                     "or 800x600. The format follows the extension (.png, .webp, .jpg).")
+    targets_parser.add_argument("--background", help="The background color, e.g. #ffffff.")
+    targets_parser.add_argument("--backend", default="auto", choices=("inkscape", "cairosvg", "auto"),
+                                help="The render backend.")
+    targets_parser.set_defaults(run=run_export_targets)
+
+    links_parser = commands.add_parser("check-links", help="List the linked images of an SVG file that are missing.")
+    links_parser.add_argument("file", help="The SVG file.")
+    links_parser.set_defaults(run=run_check_links)
+
+    # Listed for the help only: main() hands the arguments of these commands to their own parsers
+    commands.add_parser("export-bulk", help="Export many SVG files to PNG with few Inkscape processes "
+                                            "(see python -m gatorsvg export-bulk -h).")
+    commands.add_parser("batch", help="Generate one SVG per row of a CSV file (see python -m gatorsvg batch -h).")
+
+    return parser
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Args:
+        argv (list, optional): The command-line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: The exit status.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    from utils.instrumentation import init_instrumentation
+
+    init_instrumentation()
+    if argv[:1] == ["batch"]:
+        return run_batch(argv[1:])
+    if argv[:1] == ["export-bulk"]:
+        return run_export_bulk(argv[1:])
+
+    args = build_parser().parse_args(argv)
+    try:
+        return args.run(args)
+    except (OSError, SyntaxError) as e:
+        # ET.ParseError is a SyntaxError
+        print_error(str(e))
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,16 +1,22 @@
+import time
 import tkinter as tk
-from tkinter import filedialog, messagebox
-import webbrowser
 import xml.etree.ElementTree as ET
+from tkinter import filedialog, messagebox, ttk
+import webbrowser
 
 from .image_preview_window import ImagePreviewWindow
 from .listbox import ListBox
 from .property_panel import PropertyPanel
 from .quick_edits_window import QuickEditWindow
-from app_vars import root_element, selected_element
-from utils.config import OPEN_SVG_FILE_PATH, SVG_OUTPUT_PATH
-from utils.image_helper import convert_svg_to_png, save_png_to_file
-from utils.svg_parser import parse_element, save_svg_to_file
+from app_vars import modification_tracker, root_element, selected_element
+from utils.config import LOAD_SLICE_MS, OPEN_SVG_FILE_PATH, PREVIEW_POLL_MS
+from utils.edit_journal import EDIT_JOURNAL
+from utils.element_index import drop_element_index
+from utils.image_helper import convert_svg_data_to_png, save_png_to_file
+from utils.image_links import ImageLinkResolver
+from utils.instrumentation import LOGGER
+from utils.svg_loader import SVGLoader
+from utils.svg_parser import parse_element, save_svg_to_file, serialize_svg
 
 
 class AppWindow(tk.Frame):
@@ -30,7 +36,20 @@ class AppWindow(tk.Frame):
         self.root.columnconfigure(1, weight=20)
         self.root.columnconfigure(2, weight=25)
 
+        self.loader = None  # SVGLoader of the file being opened
+        self.load_id = None
+        self.load_generation = None  # Modification generation when the loading started
+        self.link_resolver = None  # ImageLinkResolver of the open file, until its missing links are reported
+        self.link_check_id = None
+
         self.create_widgets()
+        self.root.bind("<Escape>", lambda event: self.cancel_loading())
+
+        # Record the edits made in the app so that they can be undone
+        EDIT_JOURNAL.enable()
+        self.root.bind_all("<Control-z>", lambda event: self.undo())
+        self.root.bind_all("<Control-y>", lambda event: self.redo())
+        self.root.bind_all("<Control-Shift-Z>", lambda event: self.redo())
 
     def create_widgets(self):
         """
@@ -38,6 +57,7 @@ class AppWindow(tk.Frame):
          """
         self.create_top_taskbar()
         self.create_panels()
+        self.create_load_status()
 
     def create_top_taskbar(self):
         """
@@ -60,6 +80,12 @@ class AppWindow(tk.Frame):
         file_menu.add_separator()
         file_menu.add_command(label="Export PNG", command=self.export_png)
 
+        # Edit Menu
+        edit_menu = tk.Menu(menu_bar, tearoff=0)
+        menu_bar.add_cascade(label="Edit", menu=edit_menu)
+        edit_menu.add_command(label="Undo", accelerator="Ctrl+Z", command=self.undo)
+        edit_menu.add_command(label="Redo", accelerator="Ctrl+Y", command=self.redo)
+
         # Window Menu
         window_menu = tk.Menu(menu_bar, tearoff=0)
         menu_bar.add_cascade(label="Window", menu=window_menu)
@@ -81,6 +107,22 @@ class AppWindow(tk.Frame):
         self.property_panel = PropertyPanel(self, self.image_preview_window)
         self.quick_edit_window = QuickEditWindow(self)
 
+    def create_load_status(self):
+        """
+        Create the status bar shown while a file is loading.
+        """
+        self.load_status_frame = tk.Frame(self)
+        self.load_status_frame.grid(row=2, column=0, columnspan=2, padx=10, pady=(0, 10), sticky="ew")
+
+        self.load_progress = ttk.Progressbar(self.load_status_frame, maximum=1.0, length=300)
+        self.load_progress.pack(side=tk.LEFT, padx=5)
+        self.load_label = tk.Label(self.load_status_frame)
+        self.load_label.pack(side=tk.LEFT, padx=5)
+        cancel_button = tk.Button(self.load_status_frame, text="Cancel", command=self.cancel_loading)
+        cancel_button.pack(side=tk.LEFT, padx=5)
+
+        self.load_status_frame.grid_remove()
+
     def open_file(self):
         """
         Opens a file dialog and loads the selected SVG file into the app.
@@ -91,37 +133,174 @@ class AppWindow(tk.Frame):
             # Check if the file is an SVG file
             if not file_path.endswith(".svg"):
                 # Display an error message
-                tk.messagebox.showerror("Error", "Please select an SVG file.")
+                messagebox.showerror("Error", "Please select an SVG file.")
+                return
+
+            self.cancel_loading()
+            try:
+                loader = SVGLoader(file_path)
+            except OSError as e:
+                messagebox.showerror("Error", f"Could not open {file_path}: {e}")
                 return
 
             OPEN_SVG_FILE_PATH.set(file_path)
+            self.clear_document()
+
+            # Load the SVG file in chunks so that the app stays responsive
+            self.loader = loader
+            self.link_resolver = ImageLinkResolver(file_path)
+            self.load_generation = modification_tracker.get_generation()
+            self.load_progress["value"] = 0
+            self.load_label.config(text="Loading...")
+            self.load_status_frame.grid()
+            self.load_id = self.after_idle(self.load_next_chunk)
+
+            # Bring the focus back to the main window
+            self.root.focus_force()
+
+    def load_next_chunk(self):
+        """
+        Load the open file for one time slice and list the elements read so far.
+
+        The elements are listed as soon as their start tag is read, so they can be selected
+        while the rest of the file is still loading. The preview is rendered once the whole
+        file has been read.
+        """
+        self.load_id = None
+        loader = self.loader
+        deadline = time.perf_counter() + LOAD_SLICE_MS / 1000
+        items = []
+
+        try:
+            while not loader.done and time.perf_counter() < deadline:
+                items.extend(loader.read_chunk())
+        except ET.ParseError as e:
+            self.loader = None
+            self.load_status_frame.grid_remove()
+            self.clear_document()
+            messagebox.showerror("Error", f"Could not open {loader.svg_path}: {e}")
+            return
+
+        if root_element.get_element() is None:
+            root_element.set_element(loader.root)
 
-            # Load the SVG file
-            tree = ET.parse(OPEN_SVG_FILE_PATH.get())
-            root_element.set_element(tree.getroot())
-            parsed_tree = root_element.get_element()
+        # Resolve linked image paths, then list the new elements
+        for element, _ in items:
+            self.link_resolver.resolve(element)
+        self.svg_listbox.insert_elements(items)
 
-            # Display the attributes of the SVG element
-            self.svg_listbox.clear_svg_listbox()
-            self.display_attributes(parsed_tree)
-            save_svg_to_file(SVG_OUTPUT_PATH)
+        if loader.done:
+            self.loader = None
+            self.load_status_frame.grid_remove()
+            # The file holds the document as loaded, before any edit made while loading
+            modification_tracker.mark_written(loader.svg_path, loader.root, self.load_generation)
             self.image_preview_window.load_image()
+            self.check_image_links()
+            LOGGER.info("File successfully Opened %s", loader.svg_path)
+        else:
+            self.load_progress["value"] = loader.progress
+            self.load_label.config(text=f"Loading... {loader.element_count} elements")
+            self.load_id = self.after(1, self.load_next_chunk)
+
+    def check_image_links(self):
+        """
+        Report the linked images that do not exist, once every linked file has been checked.
+        """
+        self.link_check_id = None
+        resolver = self.link_resolver
+        if resolver is None:
+            return
+        if not resolver.done():
+            self.link_check_id = self.after(PREVIEW_POLL_MS, self.check_image_links)
+            return
 
-            print(f"File successfully Opened {file_path}")
+        self.link_resolver = None
+        missing = resolver.missing_links()
+        resolver.close()
+        for link in missing:
+            LOGGER.warning("Linked image of '%s' not found: %s", link['id'], link['path'])
+        if missing:
+            paths = "\n".join(sorted({link['path'] for link in missing}))
+            messagebox.showwarning("Missing Images", f"These linked images were not found:\n{paths}")
 
-            # Bring the focus back to the main window
-            self.root.focus_force()
+    def stop_image_link_check(self):
+        """
+        Stop checking the linked images of the open file.
+        """
+        if self.link_check_id is not None:
+            self.after_cancel(self.link_check_id)
+            self.link_check_id = None
+        if self.link_resolver is not None:
+            self.link_resolver.close()
+            self.link_resolver = None
+
+    def is_loading(self):
+        """
+        Check if a file is still being loaded.
+
+        Returns:
+            bool: True while a file is loading, False otherwise.
+        """
+        return self.loader is not None
+
+    def cancel_loading(self):
+        """
+        Cancel the loading of the file being opened and discard the part that was loaded.
+        """
+        if self.loader is None:
+            return
+
+        if self.load_id is not None:
+            self.after_cancel(self.load_id)
+            self.load_id = None
+        self.loader.close()
+        self.loader = None
+
+        self.load_status_frame.grid_remove()
+        self.clear_document()
+        OPEN_SVG_FILE_PATH.set(None)
+        LOGGER.info("Opening the file was cancelled")
+
+    def clear_document(self):
+        """
+        Clear the open document, its element list and its properties.
+        """
+        self.stop_image_link_check()
+        if root_element.get_element() is not None:
+            # Elements may outlive the document in widgets or callbacks; its index does not have to
+            drop_element_index(root_element.get_element())
+        root_element.set_element(None)
+        selected_element.set_element(None)
+        EDIT_JOURNAL.clear()
+        self.property_panel.clear_displayed_attributes()
+        self.svg_listbox.clear_svg_listbox()
+
+    def check_loaded(self):
+        """
+        Check that no file is loading, showing an error message if one is.
+
+        Returns:
+            bool: True if the document is fully loaded, False otherwise.
+        """
+        if self.is_loading():
+            messagebox.showerror("Error", "Please wait until the file has finished loading.")
+            return False
+        return True
 
     def save_changes(self):
         """
         Saves the SVG file to the currently opened file path.
         """
+        if not self.check_loaded():
+            return
         save_svg_to_file(OPEN_SVG_FILE_PATH.get())
 
     def save_as(self):
         """
         Opens a file dialog and saves the SVG file to the selected file path.
         """
+        if not self.check_loaded():
+            return
         # Ask the user where they want to save the file
         file_path = filedialog.asksaveasfilename(defaultextension=".svg", initialdir="assets")
         if file_path:
@@ -132,14 +311,38 @@ class AppWindow(tk.Frame):
         """
         Exports the SVG file to a PNG image at the selected file path.
         """
+        if not self.check_loaded():
+            return
         # Ask the user where they want to save the PNG file
         file_path = filedialog.asksaveasfilename(defaultextension=".png", initialdir="assets")
         if file_path:
-            # Convert the SVG file to a PNG image
-            image = convert_svg_to_png(SVG_OUTPUT_PATH)
+            # Convert the current state of the SVG file to a PNG image
+            image = convert_svg_data_to_png(serialize_svg(root_element.get_element()).encode("utf-8"),
+                                            backend="inkscape")
             if image is not None:
                 save_png_to_file(image, file_path)
 
+    def undo(self):
+        """
+        Undoes the last edit, or the last group of Quick Edits.
+        """
+        if EDIT_JOURNAL.undo() is not None:
+            self.refresh_after_edit()
+
+    def redo(self):
+        """
+        Redoes the last undone edit, or the last undone group of Quick Edits.
+        """
+        if EDIT_JOURNAL.redo() is not None:
+            self.refresh_after_edit()
+
+    def refresh_after_edit(self):
+        """
+        Updates the property panel and the preview after the document was changed.
+        """
+        self.change_selection()
+        self.image_preview_window.load_image()
+
     def toggle_image_preview(self):
         """
         Toggles the visibility of the image preview window.
@@ -165,23 +368,6 @@ class AppWindow(tk.Frame):
         """
         webbrowser.open_new("paypal.me/indiemount")
 
-    def display_attributes(self, element, level=0):
-        """
-        Recursively displays attributes of an SVG element.
-
-        Args:
-            element: The SVG element to display attributes for.
-            level: The depth level of the element in the hierarchy.
-        """
-        self.svg_listbox.insert_listbox(element, level)
-
-        parse_element(element, self.property_panel)
-
-        for child in element:
-            self.display_attributes(child, level + 1)
-
-        self.property_panel.clear_displayed_attributes()
-
     def change_selection(self):
         """
         Updates the property panel to display the attributes of the selected element.
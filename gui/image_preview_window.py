@@ -1,8 +1,12 @@
 import tkinter as tk
+import weakref
 
-from PIL import ImageTk
-from utils.config import SVG_OUTPUT_PATH
-from utils.image_helper import convert_svg_to_png
+from PIL import Image, ImageTk
+from .preview_renderer import PreviewRenderer
+from app_vars import modification_tracker, root_element
+from utils.config import PREVIEW_DEBOUNCE_MS, PREVIEW_MAX_SIZE, PREVIEW_SETTLE_MS, PREVIEW_WINDOW_GEOMETRY
+from utils.instrumentation import INSTRUMENTATION
+from utils.svg_parser import serialize_svg
 
 
 class ImagePreviewWindow:
@@ -25,15 +29,30 @@ class ImagePreviewWindow:
         self.image_preview_window = tk.Toplevel(parent)
         self.image_preview_window.title("Image Preview")
 
+        self.image_preview_window.geometry(PREVIEW_WINDOW_GEOMETRY)
+
         # Create an empty ImageTk.PhotoImage
         self.photo = None
 
+        # Multi-resolution pyramid of the last render, largest first
+        self.pyramid = None
+        self.rendered_width = None
+        self.pending_render = None
+        self.window_size = None
+        # Document, modification generation and width of the last submitted and displayed renders
+        self.submitted_state = None
+        self.rendered_state = None
+        self.renderer = PreviewRenderer(self.image_preview_window, self.on_rendered)
+
         # Create a Label widget to display the image
         self.image_label = tk.Label(self.image_preview_window)
-        self.image_label.pack()
+        self.image_label.pack(fill=tk.BOTH, expand=True)
 
         # Bind mouse scroll events to the zoom function
         self.image_preview_window.bind("<MouseWheel>", self.zoom)
+        self.image_preview_window.bind("<Button-4>", self.zoom)
+        self.image_preview_window.bind("<Button-5>", self.zoom)
+        self.image_preview_window.bind("<Configure>", self.on_resize)
         self.image_preview_window.protocol("WM_DELETE_WINDOW", self.toggle_image_preview)
 
     def toggle_image_preview(self):
@@ -53,41 +72,147 @@ class ImagePreviewWindow:
 
         self.image_preview_window.lift()
 
+    def target_width(self):
+        """
+        Get the width the preview should be rendered at for the current window size and zoom level.
+
+        Returns:
+            int: The width in pixels, or None if the window or document size is not known yet.
+        """
+        window_width = self.image_preview_window.winfo_width()
+        window_height = self.image_preview_window.winfo_height()
+        if self.pyramid is None or window_width <= 1 or window_height <= 1:
+            return None
+
+        # Fit the document into the window, keeping its aspect ratio, then apply the zoom level
+        width, height = self.pyramid[0].size
+        fit_width = min(window_width, window_height * width / height)
+        return max(1, min(int(fit_width * self.zoom_level), PREVIEW_MAX_SIZE))
+
     def load_image(self):
         """
-        Load and display the image in the preview window.
+        Request a render of the current document for the preview window.
+
+        The render happens in the background after PREVIEW_DEBOUNCE_MS, so that a burst of
+        edits only renders the final state.
+        """
+        self.request_render(PREVIEW_DEBOUNCE_MS)
+
+    def request_render(self, delay):
+        """
+        Render a snapshot of the document once no new request has arrived for a while.
+
+        Args:
+            delay: The number of milliseconds to wait before taking the snapshot.
+        """
+        self.cancel_pending_render()
+
+        # Any render in progress is already stale
+        self.renderer.cancel()
+        self.pending_render = self.image_preview_window.after(delay, self.start_render)
+
+    def start_render(self):
+        """
+        Take a snapshot of the document on the Tk thread and hand it to the background renderer.
         """
-        # Convert SVG to PNG
-        image = convert_svg_to_png(SVG_OUTPUT_PATH)
+        self.pending_render = None
+        root = root_element.get_element()
+        if root is None:
+            return
 
-        # Resize based on the zoom level
-        width, height = image.size
-        new_width = int(width * self.zoom_level)
-        new_height = int(height * self.zoom_level)
-        image = image.resize((new_width, new_height))
+        # Render at the size it will be displayed at, unless that is already displayed
+        target_width = self.target_width()
+        state = (weakref.ref(root), modification_tracker.get_generation(), target_width)
+        if state == self.rendered_state:
+            return
 
-        # Convert the resized image to PhotoImage
-        self.photo = ImageTk.PhotoImage(image=image)
+        self.submitted_state = state
+        self.renderer.submit(serialize_svg(root), target_width)
 
-        # Update the image in the Label widget
-        self.image_label.config(image=self.photo)
-        self.image_label.update_idletasks()  # Update the display
+    def on_rendered(self, pyramid):
+        """
+        Display a finished render.
+
+        Args:
+            pyramid (list): The render followed by its halved copies, largest first.
+        """
+        self.pyramid = pyramid
+        self.rendered_width = pyramid[0].width
+        self.rendered_state = self.submitted_state
+        self.display_from_pyramid()
+
+        # The first render tells the document's aspect ratio, so re-render once at the real size
+        target_width = self.target_width()
+        if target_width is not None and self.rendered_width != target_width:
+            self.request_render(0)
+
+    def display_from_pyramid(self):
+        """
+        Display the last render at the current zoom level, scaled from the closest pyramid level.
+        """
+        if self.pyramid is None:
+            return
+
+        target_width = self.target_width() or self.pyramid[0].width
+        target_height = max(1, round(target_width * self.pyramid[0].height / self.pyramid[0].width))
+
+        # Use the smallest level that is still at least as large as the target
+        level = self.pyramid[0]
+        for candidate in self.pyramid:
+            if candidate.width < target_width:
+                break
+            level = candidate
+
+        with INSTRUMENTATION.span("tk_redraw"):
+            image = level
+            if level.size != (target_width, target_height):
+                image = level.resize((target_width, target_height), Image.BILINEAR)
+
+            # Convert the resized image to PhotoImage
+            self.photo = ImageTk.PhotoImage(image=image)
+
+            # Update the image in the Label widget
+            self.image_label.config(image=self.photo)
+
+    def cancel_pending_render(self):
+        """
+        Cancel a render that has been requested but whose snapshot has not been taken yet.
+        """
+        if self.pending_render is not None:
+            self.image_preview_window.after_cancel(self.pending_render)
+            self.pending_render = None
+
+    def on_resize(self, event):
+        """
+        Rescale the preview when the window is resized.
+
+        Args:
+            event: The configure event.
+        """
+        if event.widget is not self.image_preview_window or (event.width, event.height) == self.window_size:
+            return
+        self.window_size = (event.width, event.height)
+        self.display_from_pyramid()
+        self.request_render(PREVIEW_SETTLE_MS)
 
     def zoom(self, event):
         """
         Handle zooming in and out using mouse scroll.
 
+        The zoomed image is served from the pyramid of the last render right away, and a sharper
+        render at the new scale is requested once scrolling has settled.
+
         Args:
             event: The mouse scroll event.
         """
         # Adjust the zoom level based on the mouse scroll direction
-        if event.delta > 0:  # Scroll up (zoom in)
+        if event.delta > 0 or event.num == 4:  # Scroll up (zoom in)
             self.zoom_level *= 1.2
         else:  # Scroll down (zoom out)
             self.zoom_level /= 1.2
 
-        # Reload and display the image with the updated zoom level
-        self.load_image()
+        self.display_from_pyramid()
+        self.request_render(PREVIEW_SETTLE_MS)
 
 
 if __name__ == "__main__":
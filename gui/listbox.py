@@ -23,17 +23,21 @@ class ListBox(tk.Listbox):
 
         self.parent = master
         self.previously_selected_item_index = 0
-        self.elements = {}
+        self.elements = []  # Elements in the order of the Listbox items
 
         self.bind("<Double-Button-1>", self.on_listbox_select)
 
-    def insert_listbox(self, element, level=0):
+    @staticmethod
+    def item_label(element, level=0):
         """
-        Insert an item into the Listbox.
+        Get the text of the Listbox item of an element.
 
         Args:
-            element (ElementTree.Element): The XML element to insert.
+            element (ElementTree.Element): The XML element.
             level (int): The nesting level of the element in the XML hierarchy.
+
+        Returns:
+            str: The indented tag name, ID and level of the element.
         """
         indent = "  " * level
         ele_id = element.get("id")
@@ -42,14 +46,27 @@ class ListBox(tk.Listbox):
             tag = element.tag.split("}")[-1] + "(" + ele_id + ")" + str(level)
         else:
             tag = element.tag.split("}")[-1] + "(" + ")" + str(level)
-        self.elements[tag] = element
-        self.insert(tk.END, f"{indent}{tag}")
+        return f"{indent}{tag}"
+
+    def insert_elements(self, elements):
+        """
+        Insert several items into the Listbox with a single Tk call.
+
+        Args:
+            elements (list): Pairs of XML element and nesting level.
+        """
+        if not elements:
+            return
+        self.elements.extend(element for element, _ in elements)
+        self.insert(tk.END, *(self.item_label(element, level) for element, level in elements))
 
     def clear_svg_listbox(self):
         """
         Clear all items from the Listbox.
         """
         self.delete(0, tk.END)
+        self.elements.clear()
+        self.previously_selected_item_index = 0
 
     def on_listbox_select(self, event):
         """
@@ -60,14 +77,15 @@ class ListBox(tk.Listbox):
         """
         selected_item_index = self.curselection()
         self.selection_clear(0, tk.END)
+        if not selected_item_index:
+            return
 
         # Update the appearance of the selected item
         self.itemconfig(self.previously_selected_item_index, {'bg': 'white', 'fg': 'black'})
         self.previously_selected_item_index = selected_item_index
         self.itemconfig(selected_item_index, {'bg': 'blue', 'fg': 'white'})
 
-        selected_item = self.get(selected_item_index).strip()
-        selected_element.set_element(self.elements.get(selected_item))
+        selected_element.set_element(self.elements[selected_item_index[0]])
 
         self.parent.change_selection()
 
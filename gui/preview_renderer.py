@@ -0,0 +1,144 @@
+import queue
+import threading
+
+from utils.config import PREVIEW_POLL_MS, PREVIEW_PYRAMID_MIN_SIZE
+from utils.image_helper import convert_svg_data_to_png
+from utils.instrumentation import LOGGER
+
+
+def build_pyramid(image):
+    """
+    Build a multi-resolution pyramid of an image by halving it repeatedly.
+
+    Args:
+        image (Image): The full-size image.
+
+    Returns:
+        list: The image followed by its halved copies, largest first.
+    """
+    pyramid = [image]
+    while min(pyramid[-1].size) > PREVIEW_PYRAMID_MIN_SIZE:
+        pyramid.append(pyramid[-1].reduce(2))
+    return pyramid
+
+
+class RenderJob:
+    """
+    A snapshot of the document waiting to be rendered.
+    """
+    def __init__(self, svg_text, width):
+        """
+        Initialize the RenderJob.
+
+        Args:
+            svg_text (str): The serialized document, taken on the Tk thread.
+            width (int): The width to render at, or None for the document's native size.
+        """
+        self.svg_text = svg_text
+        self.width = width
+        self.cancel_event = threading.Event()
+
+
+class PreviewRenderer:
+    """
+    Renders preview snapshots on a background thread and hands the results back to Tk.
+
+    Only the latest job matters: submitting a job cancels the one waiting to start and the one
+    being rendered. Finished renders are picked up on the Tk thread through after() polling.
+    """
+    def __init__(self, widget, on_rendered):
+        """
+        Initialize the PreviewRenderer and start its worker thread.
+
+        Args:
+            widget: The Tk widget used to schedule after() callbacks.
+            on_rendered: Called on the Tk thread with the pyramid of each render that was not cancelled.
+        """
+        self.widget = widget
+        self.on_rendered = on_rendered
+        self.condition = threading.Condition()
+        self.pending_job = None
+        self.running_job = None
+        self.results = queue.Queue()
+        self.outstanding = 0
+        self.poll_id = None
+
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def submit(self, svg_text, width):
+        """
+        Render a snapshot, cancelling every render that is now stale.
+
+        Args:
+            svg_text (str): The serialized document.
+            width (int): The width to render at, or None for the document's native size.
+        """
+        job = RenderJob(svg_text, width)
+        with self.condition:
+            self.cancel_locked()
+            replaced = self.pending_job is not None
+            self.pending_job = job
+            self.condition.notify()
+
+        # A replaced job never reaches the worker, so it is not waited for
+        if not replaced:
+            self.outstanding += 1
+        if self.poll_id is None:
+            self.poll_id = self.widget.after(PREVIEW_POLL_MS, self.poll)
+
+    def cancel(self):
+        """
+        Cancel the render waiting to start and the render in progress.
+        """
+        with self.condition:
+            self.cancel_locked()
+
+    def cancel_locked(self):
+        """
+        Cancel the pending and running jobs. The condition must be held.
+        """
+        for job in (self.pending_job, self.running_job):
+            if job is not None:
+                job.cancel_event.set()
+
+    def run(self):
+        """
+        Worker thread loop rendering the latest job.
+        """
+        while True:
+            with self.condition:
+                while self.pending_job is None:
+                    self.condition.wait()
+                job = self.running_job = self.pending_job
+                self.pending_job = None
+
+            pyramid = None
+            try:
+                if not job.cancel_event.is_set():
+                    image = convert_svg_data_to_png(job.svg_text.encode("utf-8"), width=job.width,
+                                                    cancel_event=job.cancel_event)
+                    if image is not None and not job.cancel_event.is_set():
+                        pyramid = build_pyramid(image.convert("RGBA"))
+            except Exception as e:
+                LOGGER.error("Error rendering preview: %s", e)
+
+            with self.condition:
+                self.running_job = None
+            self.results.put((job, pyramid))
+
+    def poll(self):
+        """
+        Hand finished renders to the Tk thread while jobs are outstanding.
+        """
+        self.poll_id = None
+        while True:
+            try:
+                job, pyramid = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.outstanding -= 1
+            if pyramid is not None and not job.cancel_event.is_set():
+                self.on_rendered(pyramid)
+
+        if self.outstanding > 0 and self.poll_id is None:
+            self.poll_id = self.widget.after(PREVIEW_POLL_MS, self.poll)
@@ -1,8 +1,8 @@
 import tkinter as tk
 
 from app_vars import namespace_mappings, root_element, selected_element
-from utils.config import SVG_OUTPUT_PATH
-from utils.svg_parser import find_attribute_value, save_svg_to_file, update_svg_attribute
+from utils.instrumentation import LOGGER
+from utils.svg_parser import find_attribute_value, update_svg_attribute
 
 
 class PropertyPanel(tk.Frame):
@@ -138,7 +138,7 @@ class PropertyPanel(tk.Frame):
             entry.delete(0, tk.END)
             entry.insert(0, value)
         else:
-            print(f"Value for {element_id}.{attribute_name}: Not Found!")
+            LOGGER.info("Value for %s.%s: Not Found!", element_id, attribute_name)
 
     def set_value(self, new_value, attr, type_id):
         """
@@ -153,7 +153,6 @@ class PropertyPanel(tk.Frame):
         is_value_changed = update_svg_attribute(select, attr, type_id, new_value)
 
         if is_value_changed == 1:
-            save_svg_to_file(SVG_OUTPUT_PATH)
             self.image_preview_panel.load_image()
 
 
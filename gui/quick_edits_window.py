@@ -2,13 +2,23 @@ import tkinter as tk
 
 from tkinter import filedialog, ttk
 from app_vars import root_element
-from utils.config import SVG_OUTPUT_PATH
-from utils.svg_parser import find_attribute_value, save_svg_to_file, set_attribute_value
+from utils.config import QUICK_EDIT_VISIBLE_ROWS
+from utils.edit_journal import EDIT_JOURNAL
+from utils.instrumentation import LOGGER
+from utils.quick_edits import QUICK_EDIT_TYPES, read_quick_edit_file, type_name_to_id, write_quick_edit_file
+from utils.svg_parser import find_attribute_value, set_attribute_value
+
+# Keys of a Quick Edit row, in the order of the row's input fields
+ROW_KEYS = ('ID', 'attribute', 'type', 'value')
 
 
 class QuickEditWindow:
     """
     Represents the Quick Edit window for modifying SVG attributes.
+
+    The rows are kept in a plain list of Quick Edit dictionaries. Only a fixed number of row
+    widgets is created; scrolling shows other rows in the same widgets, so the window stays
+    fast with thousands of rows.
     """
     def __init__(self, root):
         """
@@ -18,12 +28,12 @@ class QuickEditWindow:
             root: The root Tkinter window.
         """
 
-        self.input_frame = None
-        self.load_button = None
-        self.save_button = None
-        self.add_button = None
         self.root = root
-        self.rows = []  # List to store the rows of inputs
+        self.rows = []  # Quick Edit dictionaries, in display order
+        self.first_row = 0  # Index of the row shown in the first slot
+        self.slots = []  # Widgets of the visible rows: (row frame, number label, variables per key)
+        self.refreshing = False
+        self.scrollbar = None
 
         self.quick_edit_window = None
         self.create_window()
@@ -39,190 +49,287 @@ class QuickEditWindow:
         taskbar = tk.Menu(self.quick_edit_window)
         self.quick_edit_window.config(menu=taskbar)
         taskbar.add_command(label="Add", command=self.add_row)
+        taskbar.add_command(label="Set All", command=self.set_all_values)
         taskbar.add_command(label="Save", command=self.save_data)
         taskbar.add_command(label="Load", command=self.load_data)
         taskbar.config(borderwidth=1, relief="solid")
 
+        table_frame = ttk.Frame(self.quick_edit_window)
+        table_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+        self.scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, rowspan=QUICK_EDIT_VISIBLE_ROWS, sticky="ns")
+
+        for slot in range(QUICK_EDIT_VISIBLE_ROWS):
+            self.slots.append(self.create_slot(table_frame, slot))
+
+        # Scroll the rows with the mouse wheel
+        self.quick_edit_window.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.quick_edit_window.bind("<Button-4>", self.on_mouse_wheel)
+        self.quick_edit_window.bind("<Button-5>", self.on_mouse_wheel)
+
         self.quick_edit_window.protocol("WM_DELETE_WINDOW", self.toggle_window)
+        self.refresh_rows()
 
-    def add_row(self):
+    def create_slot(self, table_frame, slot):
         """
-        Add a new row of input fields to the Quick Edit window.
+        Create the widgets of one visible row.
+
+        Args:
+            table_frame: The frame holding the visible rows.
+            slot (int): The position of the row among the visible rows.
+
+        Returns:
+            tuple: The row frame, the row number label and the variables of the input fields.
         """
-        # Create a new row with inputs for element_id, attribute_name, type, and value
-        row_frame = ttk.Frame(self.quick_edit_window)
-        row_frame.pack(side=tk.TOP, padx=5, pady=5)
+        row_frame = ttk.Frame(table_frame)
+        row_frame.grid(row=slot, column=0, padx=5, pady=5, sticky="w")
+
+        number_label = ttk.Label(row_frame, width=6, anchor="e")
+        number_label.pack(side=tk.LEFT, padx=5, pady=5)
+
+        variables = {key: tk.StringVar(row_frame) for key in ROW_KEYS}
+        for key, variable in variables.items():
+            variable.trace_add("write", lambda *args, slot=slot, key=key: self.on_field_changed(slot, key))
 
         element_id_label = ttk.Label(row_frame, text="ID:")
         element_id_label.pack(side=tk.LEFT, padx=5, pady=5)
 
-        element_id_entry = ttk.Entry(row_frame)
+        element_id_entry = ttk.Entry(row_frame, textvariable=variables['ID'])
         element_id_entry.pack(side=tk.LEFT, padx=5, pady=5)
 
         attribute_name_label = ttk.Label(row_frame, text="Attribute:")
         attribute_name_label.pack(side=tk.LEFT, padx=5, pady=5)
 
-        attribute_name_entry = ttk.Entry(row_frame)
+        attribute_name_entry = ttk.Entry(row_frame, textvariable=variables['attribute'])
         attribute_name_entry.pack(side=tk.LEFT, padx=5, pady=5)
 
         type_label = ttk.Label(row_frame, text="Type:")
         type_label.pack(side=tk.LEFT, padx=5, pady=5)
 
-        type_dropdown = ttk.Combobox(row_frame, values=("Normal", "Style", "Element"))
+        type_dropdown = ttk.Combobox(row_frame, values=QUICK_EDIT_TYPES, textvariable=variables['type'])
         type_dropdown.pack(side=tk.LEFT, padx=5, pady=5)
 
         value_label = ttk.Label(row_frame, text="Value:")
         value_label.pack(side=tk.LEFT, padx=5, pady=5)
 
-        value_entry = ttk.Entry(row_frame)
+        value_entry = ttk.Entry(row_frame, textvariable=variables['value'])
         value_entry.pack(side=tk.LEFT, padx=5, pady=5)
 
-        get_button = ttk.Button(row_frame, text="Get", command=lambda: self.get_value(row_frame))
-        set_button = ttk.Button(row_frame, text="Set", command=lambda: self.set_value(row_frame))
+        get_button = ttk.Button(row_frame, text="Get", command=lambda: self.get_value(slot))
+        set_button = ttk.Button(row_frame, text="Set", command=lambda: self.set_value(slot))
 
         get_button.pack(side=tk.LEFT, padx=5, pady=5)
         set_button.pack(side=tk.LEFT, padx=5, pady=5)
 
-        delete_button = ttk.Button(row_frame, text="Delete", command=lambda: self.delete_row(row_frame))
+        delete_button = ttk.Button(row_frame, text="Delete", command=lambda: self.delete_row(slot))
         delete_button.pack(side=tk.LEFT, padx=5, pady=5)
 
-        # Append the new row to the rows list
-        self.rows.append((element_id_entry, attribute_name_entry, type_dropdown, value_entry, row_frame))
+        return row_frame, number_label, variables
 
-    def get_value(self, row_frame):
+    def refresh_rows(self):
         """
-        Get the attribute value for a selected element and display it in the corresponding input field.
+        Show the rows starting at first_row in the visible row widgets and update the scrollbar.
+        """
+        self.refreshing = True
+        try:
+            for slot, (row_frame, number_label, variables) in enumerate(self.slots):
+                index = self.first_row + slot
+                if index >= len(self.rows):
+                    row_frame.grid_remove()
+                    continue
+
+                row = self.rows[index]
+                number_label.config(text=f"{index + 1}")
+                for key, variable in variables.items():
+                    variable.set(row[key])
+                row_frame.grid()
+        finally:
+            self.refreshing = False
+
+        if self.rows:
+            self.scrollbar.set(self.first_row / len(self.rows),
+                               min(1.0, (self.first_row + len(self.slots)) / len(self.rows)))
+        else:
+            self.scrollbar.set(0.0, 1.0)
 
-        Args:
-            row_frame: The frame containing the input fields.
+    def scroll_to(self, first_row):
         """
+        Scroll the rows so that a given row is shown in the first slot, as far as possible.
 
-        # Find the index of the row_frame in the rows list
-        index = None
-        for i, row in enumerate(self.rows):
-            if row_frame == row[0].master:
-                index = i
-                break
+        Args:
+            first_row (int): The index of the row to show first.
+        """
+        self.first_row = max(0, min(first_row, len(self.rows) - len(self.slots)))
+        self.refresh_rows()
 
-        if index is not None:
-            element_id = self.rows[index][0].get()
-            attribute_name = self.rows[index][1].get()
-            type_id = ["Normal", "Style", "Element"].index(self.rows[index][2].get()) + 1
-            value = find_attribute_value(root_element.get_element(), element_id, attribute_name, type_id)
+    def on_scrollbar(self, action, amount, unit=None):
+        """
+        Handle a scrollbar command.
 
-            if value is not None:
-                self.rows[index][3].delete(0, tk.END)
-                self.rows[index][3].insert(0, value)
-            else:
-                print(f"Value for {element_id}.{attribute_name}: Not Found!")
+        Args:
+            action (str): "moveto" or "scroll".
+            amount (str): The fraction to move to, or the number of units or pages to scroll by.
+            unit (str, optional): "units" or "pages" when scrolling.
+        """
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.rows)))
+        elif action == "scroll":
+            step = len(self.slots) if unit == "pages" else 1
+            self.scroll_to(self.first_row + int(amount) * step)
 
-    def set_value(self, row_frame):
+    def on_mouse_wheel(self, event):
         """
-        Set the attribute value for a selected element based on the input field values.
+        Scroll the rows with the mouse wheel.
 
         Args:
-            row_frame: The frame containing the input fields.
+            event: The mouse wheel event.
         """
+        if event.delta > 0 or event.num == 4:
+            self.scroll_to(self.first_row - 1)
+        else:
+            self.scroll_to(self.first_row + 1)
 
-        # Find the index of the row_frame in the rows list
-        index = None
-        for i, row in enumerate(self.rows):
-            if row_frame == row[0].master:
-                index = i
-                break
-
-        if index is not None:
-            element_id = self.rows[index][0].get()
-            attribute_name = self.rows[index][1].get()
-            type_id = ["Normal", "Style", "Element"].index(self.rows[index][2].get()) + 1
-            value = self.rows[index][3].get()
+    def on_field_changed(self, slot, key):
+        """
+        Copy an edited input field of a visible row into the row model.
 
-            if set_attribute_value(root_element.get_element(), element_id, attribute_name, type_id, value) == 1:
-                self.root.change_selection()
-                save_svg_to_file(SVG_OUTPUT_PATH)
-                self.root.image_preview_window.load_image()
+        Args:
+            slot (int): The position of the row among the visible rows.
+            key (str): The key of the edited field.
+        """
+        if self.refreshing:
+            return
+        index = self.first_row + slot
+        if index < len(self.rows):
+            self.rows[index][key] = self.slots[slot][2][key].get()
 
-    def delete_row(self, row_frame):
+    def row_at(self, slot):
         """
-        Delete a row of input fields from the Quick Edit window.
+        Get the row shown in a slot.
 
         Args:
-            row_frame: The frame containing the input fields to be deleted.
+            slot (int): The position of the row among the visible rows.
+
+        Returns:
+            dict: The Quick Edit of the row, or None if the slot is empty.
         """
+        index = self.first_row + slot
+        return self.rows[index] if index < len(self.rows) else None
 
-        # Find the index of the row_frame in the rows list
-        index_to_delete = None
-        for i, row in enumerate(self.rows):
-            if row_frame == row[-1]:  # Check if the last element of the tuple is the row_frame
-                index_to_delete = i
-                break
+    def add_row(self):
+        """
+        Add a new empty row and scroll to it.
+        """
+        self.rows.append({'ID': '', 'attribute': '', 'type': '', 'value': ''})
+        self.scroll_to(len(self.rows))
 
-        if index_to_delete is not None:
-            # Remove the last row from the rows list
-            deleted_row = self.rows.pop(index_to_delete)
+    def get_value(self, slot):
+        """
+        Get the attribute value for a selected element and display it in the corresponding input field.
 
-            # Destroy widgets in the deleted row (excluding the row_frame)
-            for widget in deleted_row[:-1]:
-                widget.destroy()
+        Args:
+            slot (int): The position of the row among the visible rows.
+        """
+        row = self.row_at(slot)
+        if row is None:
+            return
+        if row['type'] not in QUICK_EDIT_TYPES:
+            LOGGER.warning("Invalid type '%s' for %s.%s", row['type'], row['ID'], row['attribute'])
+            return
+
+        value = find_attribute_value(root_element.get_element(), row['ID'], row['attribute'],
+                                     type_name_to_id(row['type']))
+
+        if value is not None:
+            row['value'] = value
+            self.refresh_rows()
+        else:
+            LOGGER.info("Value for %s.%s: Not Found!", row['ID'], row['attribute'])
 
-            # Remove the row_frame from the packing
-            row_frame.pack_forget()
+    def set_value(self, slot):
+        """
+        Set the attribute value for a selected element based on the input field values.
+
+        Args:
+            slot (int): The position of the row among the visible rows.
+        """
+        row = self.row_at(slot)
+        if row is None:
+            return
+        if row['type'] not in QUICK_EDIT_TYPES:
+            LOGGER.warning("Invalid type '%s' for %s.%s", row['type'], row['ID'], row['attribute'])
+            return
+
+        if set_attribute_value(root_element.get_element(), row['ID'], row['attribute'],
+                               type_name_to_id(row['type']), row['value']) == 1:
+            self.root.change_selection()
+            self.root.image_preview_window.load_image()
+
+    def set_all_values(self):
+        """
+        Set the attribute values of every row as a single edit that is undone in one step.
 
-            # Destroy the row_frame
-            row_frame.destroy()
+        The preview is rendered once, after all rows have been applied.
+        """
+        root = root_element.get_element()
+        if root is None:
+            return
+
+        changed = 0
+        with EDIT_JOURNAL.group():
+            for row in self.rows:
+                if row['type'] not in QUICK_EDIT_TYPES:
+                    continue
+                changed += set_attribute_value(root, row['ID'], row['attribute'], type_name_to_id(row['type']),
+                                               row['value'])
+
+        if changed:
+            self.root.change_selection()
+            self.root.image_preview_window.load_image()
+
+    def delete_row(self, slot):
+        """
+        Delete a row.
 
+        Args:
+            slot (int): The position of the row among the visible rows.
+        """
+        index = self.first_row + slot
+        if index < len(self.rows):
+            del self.rows[index]
+            self.scroll_to(self.first_row)
         else:
-            print("Row not found in self.rows")
+            LOGGER.warning("Row not found in self.rows")
 
     def save_data(self):
         """
-        Save the data from the input fields to a text file using a file dialog.
+        Save the rows to a Quick Edit file using a file dialog.
         """
 
         # Open a file dialog for saving the data
         file_path = filedialog.asksaveasfilename(defaultextension=".txt", initialdir="assets",
                                                  initialfile="quick_edits.txt")
         if file_path:
-            with open(file_path, "w") as file:
-                for row in self.rows:
-                    element_id = row[0].get()
-                    attribute_name = row[1].get()
-
-                    # Check if there is a value in the type_dropdown
-                    type_value = row[2].get()
-                    type_id = type_value if type_value in ["Normal", "Style", "Element"] else ''
-
-                    value = row[3].get()
-                    file.write(f"{element_id},{attribute_name},{type_id},{value}\n")
+            try:
+                write_quick_edit_file(file_path, self.rows)
+            except OSError as e:
+                LOGGER.error("Error saving data: %s", e)
 
     def load_data(self):
         """
-        Load data from a text file and populate the input fields using a file dialog.
+        Load the rows from a Quick Edit file using a file dialog.
         """
 
         # Open a file dialog for loading data
         file_path = filedialog.askopenfilename(defaultextension=".txt", initialdir="assets")
         if file_path:
             try:
-                # Clear all existing rows
-                for row in self.rows:
-                    for widget in row:
-                        widget.destroy()
-                self.rows.clear()
-
-                with open(file_path, "r") as file:
-                    lines = file.readlines()
-                    for line in lines:
-                        values = line.strip().split(",")
-                        if len(values) == 4:
-                            element_id_value, attribute_name_value, type_value, value = values
-                            self.add_row()
-                            self.rows[-1][0].insert(0, element_id_value)
-                            self.rows[-1][1].insert(0, attribute_name_value)
-                            self.rows[-1][2].set(type_value)
-                            self.rows[-1][3].insert(0, value)
-            except Exception as e:
-                print(f"Error loading data: {e}")
+                self.rows = list(read_quick_edit_file(file_path))
+            except (OSError, UnicodeDecodeError) as e:
+                LOGGER.error("Error loading data: %s", e)
+                return
+            self.scroll_to(0)
 
     def toggle_window(self):
         """
@@ -1,55 +1,11 @@
-import platform
-import subprocess
 import tkinter as tk
 
 from PIL import Image, ImageTk
 from gui.app_window import AppWindow
-from utils.config import INKSCAPE_PATH
+from utils.instrumentation import StallMonitor, init_instrumentation
 from utils.svg_parser import resource_path
 
 
-def is_inkscape_installed():
-    """
-    Check if Inkscape is installed on the system.
-
-    Returns:
-        bool: True if Inkscape is installed, False otherwise.
-    """
-    try:
-        subprocess.run(["inkscape", "--version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        return True
-    except FileNotFoundError:
-        return False
-
-
-def get_inkscape_path():
-    """
-    Get the path to the Inkscape executable based on the operating system.
-
-    This function sets the INKSCAPE_PATH variable to the path of the Inkscape executable.
-
-    Note: Some features of the program may not work if Inkscape is not installed.
-
-    Raises:
-        subprocess.CalledProcessError: If the subprocess to find Inkscape fails.
-    """
-    operating_system = platform.system()
-
-    try:
-        if is_inkscape_installed():
-            if operating_system == "Windows":
-                INKSCAPE_PATH.set(resource_path(subprocess.check_output(["where", "inkscape.exe"]).decode("utf-8").strip()))
-                print(f"Inkscape is installed at {INKSCAPE_PATH.get()}")
-            elif operating_system == "Darwin" or operating_system == "Linux":
-                INKSCAPE_PATH.set(resource_path(subprocess.check_output(["which", "inkscape.exe"]).decode("utf-8").strip()))
-                print(f"Inkscape is installed at {INKSCAPE_PATH.get()}")
-        else:
-            print("Some Features of the Program will not work. Please install Inkscape to make it work.")
-    except Exception as e:
-        print(e)
-        exit(1)
-
-
 def initialize_app():
     """
     Initialize the PropertyPanel.
@@ -73,6 +29,9 @@ def initialize_app():
 
     app_window.pack(fill=tk.BOTH, expand=True)
 
+    # Measure how long the event loop is blocked when the session is profiled
+    StallMonitor(root)
+
     # Open the file when the application starts
     app_window.open_file()
 
@@ -84,10 +43,11 @@ def main():
     """
     Entry point for the application.
 
-    This function initializes the Inkscape path and sets up the application.
+    This function sets up the application. Inkscape is looked up on the first render rather
+    than here, so that the window appears without waiting for it.
     """
-    get_inkscape_path()  # Ensures the correct Inkscape path is obtained.
-    initialize_app()     # Initializes the application.
+    init_instrumentation()  # Sets up logging and, if requested, the session profile.
+    initialize_app()  # Initializes the application.
 
 
 if __name__ == "__main__":
@@ -1,26 +1,34 @@
+import os
+import tempfile
 import unittest
 import xml.etree.ElementTree as ET
 
 from utils.svg_parser import find_attribute_value
 from api import module
 
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(os.path.dirname(TEST_DIR), "assets")
+
 
 class TestFind(unittest.TestCase):
-    def test_parse(self):
-        tree = ET.parse("test_svg_file.svg")
+    def parse(self):
+        tree = ET.parse(os.path.join(TEST_DIR, "test_svg_file.svg"))
         return tree.getroot()
 
+    def test_parse(self):
+        self.assertTrue(self.parse().tag.endswith("svg"))
+
     def test_find_attribute(self):
-        parsed_tree_mock = self.test_parse()
+        parsed_tree_mock = self.parse()
 
         # 1 - Normal, 2 - Style, 3 - Element
-        find_attribute_value(parsed_tree_mock, "poster", "{http://www.w3.org/1999/xlink}href", 1)
-        find_attribute_value(parsed_tree_mock, "poster", "{xlink}href", 1)
-        find_attribute_value(parsed_tree_mock, "desc", "fill", 2)
+        self.assertIsNotNone(find_attribute_value(parsed_tree_mock, "poster", "{http://www.w3.org/1999/xlink}href", 1))
+        self.assertIsNotNone(find_attribute_value(parsed_tree_mock, "poster", "{xlink}href", 1))
+        self.assertIsNotNone(find_attribute_value(parsed_tree_mock, "desc", "fill", 2))
         find_attribute_value(parsed_tree_mock, "tspan273", "element", 3)
 
     def test_quick_edits(self):
-        svg_path = r"Z:\GatorSVG\assets\Sample.svg"
+        svg_path = os.path.join(ASSETS_DIR, "Sample.svg")
         quick_edit_attrs = [
             {
                 'ID': 'desc',
@@ -42,10 +50,16 @@ class TestFind(unittest.TestCase):
             },
         ]
         save_option = "save_as"
-        save_as_name = r"Z:\GatorSVG\test\test_svg_file.svg"
 
-        # Call the set_element function
-        module.set_element(svg_path, quick_edit_attrs, save_option, save_as_name)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            save_as_name = os.path.join(temp_dir, "test_svg_file.svg")
+
+            # Call the set_element function
+            module.set_element(svg_path, quick_edit_attrs, save_option, save_as_name)
+
+            root = ET.parse(save_as_name).getroot()
+            self.assertEqual(find_attribute_value(root, "desc", "fill", 2), "#462254")
+            self.assertEqual(find_attribute_value(root, "path271", "rx", 1), "15")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,59 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from api import module
+from utils.svg_parser import find_attribute_value, load_svg
+
+TEST_SVG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_svg_file.svg")
+
+
+class TestSetElement(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.temp_dir.name, "output.svg")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_report_and_single_write(self):
+        quick_edit_attrs = [
+            {'ID': 'desc', 'attribute': 'fill', 'type': 'Style', 'value': '#123456'},
+            {'ID': 'path271', 'attribute': 'rx', 'type': 'Normal', 'value': '15'},
+            {'ID': 'missing', 'attribute': 'rx', 'type': 'Normal', 'value': '1'},
+            {'ID': 'tspan273', 'attribute': '{svg}tspan', 'type': 'Element', 'value': '9.9'},
+        ]
+
+        report = module.set_element(TEST_SVG, quick_edit_attrs, "save_as", self.output)
+
+        self.assertEqual([edit['ID'] for edit in report['applied']], ['desc', 'tspan273'])
+        self.assertEqual([edit['ID'] for edit in report['unchanged']], ['path271'])
+        self.assertEqual([edit['ID'] for edit in report['not_found']], ['missing'])
+        self.assertEqual(report['saved_to'], self.output)
+
+        root = load_svg(self.output).getroot()
+        self.assertEqual(find_attribute_value(root, "desc", "fill", 2), "#123456")
+        self.assertEqual(find_attribute_value(root, "tspan273", "{svg}tspan", 3), "9.9")
+
+    def test_no_write_without_changes(self):
+        quick_edit_attrs = [{'ID': 'path271', 'attribute': 'rx', 'type': 'Normal', 'value': '15'}]
+        shutil.copy(TEST_SVG, self.output)
+        mtime = os.stat(self.output).st_mtime_ns
+
+        report = module.set_element(self.output, quick_edit_attrs, "save")
+
+        self.assertIsNone(report['saved_to'])
+        self.assertEqual(os.stat(self.output).st_mtime_ns, mtime)
+
+    def test_save_as_writes_without_changes(self):
+        quick_edit_attrs = [{'ID': 'path271', 'attribute': 'rx', 'type': 'Normal', 'value': '15'}]
+
+        report = module.set_element(TEST_SVG, quick_edit_attrs, "save_as", self.output)
+
+        self.assertEqual(report['saved_to'], self.output)
+        self.assertEqual(find_attribute_value(load_svg(self.output).getroot(), "path271", "rx", 1), "15")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+from api.batch import generate_batch, output_name, parse_target, read_rows, unique_output_names
+from utils.svg_parser import find_attribute_value, load_svg
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_SVG = os.path.join(TEST_DIR, "test_svg_file.svg")
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_read_rows(self):
+        rows_path = os.path.join(self.temp_dir.name, "rows.csv")
+        with open(rows_path, "w", encoding="utf-8") as file:
+            file.write("name,tspan273|{svg}tspan|Element,path271|rx\n")
+            file.write("first,1.0,20\n")
+
+        rows = list(read_rows(rows_path))
+
+        self.assertEqual(rows, [("first", [
+            {'ID': 'tspan273', 'attribute': '{svg}tspan', 'type': 'Element', 'value': '1.0'},
+            {'ID': 'path271', 'attribute': 'rx', 'type': 'Normal', 'value': '20'},
+        ])])
+        self.assertRaises(ValueError, parse_target, "no-attribute")
+
+    def test_generate_batch(self):
+        rows = [
+            ("first", [{'ID': 'tspan273', 'attribute': '{svg}tspan', 'type': 'Element', 'value': '1.0'}]),
+            (None, [{'ID': 'tspan273', 'attribute': '{svg}tspan', 'type': 'Element', 'value': '2.0'},
+                    {'ID': 'missing', 'attribute': 'rx', 'type': 'Normal', 'value': '1'}]),
+        ]
+
+        results = generate_batch(TEST_SVG, rows, self.temp_dir.name, workers=2)
+
+        self.assertEqual([result['error'] for result in results], [None, None])
+        self.assertEqual(results[1]['not_found'], 1)
+        for result, value in zip(results, ("1.0", "2.0")):
+            root = load_svg(result['svg']).getroot()
+            self.assertEqual(find_attribute_value(root, "tspan273", "{svg}tspan", 3), value)
+        self.assertEqual(os.path.basename(results[1]['svg']), output_name(None, 2) + ".svg")
+
+    def test_unique_output_names(self):
+        names = [output_name(name, row_number) for row_number, name in enumerate(["a b", "a_b", "A_B", "a_b_2"], 1)]
+
+        self.assertEqual(unique_output_names(names), ["a_b", "a_b_2_2", "A_B_3", "a_b_2"])
+
+    def test_relative_image_links_follow_the_template(self):
+        template_path = os.path.join(self.temp_dir.name, "card.svg")
+        with open(template_path, "w", encoding="utf-8") as file:
+            file.write('<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">'
+                       '<image id="poster" xlink:href="images/poster.png"/></svg>')
+        output_dir = os.path.join(self.temp_dir.name, "output")
+
+        results = generate_batch(template_path, [("card", [])], output_dir, workers=1)
+
+        root = load_svg(results[0]['svg']).getroot()
+        self.assertEqual(find_attribute_value(root, "poster", "{xlink}href", 1),
+                         "file:///" + os.path.join(self.temp_dir.name, "images", "poster.png"))
+
+
+if __name__ == "__main__":
+    unittest.main()
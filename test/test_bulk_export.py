@@ -0,0 +1,125 @@
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from api.bulk_export import collect_svg_files, export_pngs, make_shards
+from utils import inkscape_discovery
+from utils.config import INKSCAPE_PATH
+
+# A stand-in for `inkscape --shell` that exports each opened file and counts how often it is started
+FAKE_INKSCAPE = '''#!{python}
+import os, sys
+if sys.argv[1:] == ["--version"]:
+    sys.stdout.write("Inkscape 1.3.2 (091e20e, 2023-11-25)\\n")
+    sys.exit(0)
+with open({counter!r}, "a") as counter:
+    counter.write("x")
+for line in sys.stdin:
+    state = {{}}
+    for action in filter(None, (part.strip() for part in line.split(";"))):
+        name, _, argument = action.partition(":")
+        if name == "quit":
+            sys.exit(0)
+        if name == "file-open":
+            if not os.path.exists(argument):
+                sys.stderr.write("Can't open file: " + argument + " (doesn't exist)\\n")
+                break
+            state["file"] = argument
+        elif name == "export-filename":
+            state["output"] = argument
+        elif name == "export-do":
+            with open(state["output"], "wb") as output:
+                output.write(b"PNG:" + os.path.basename(state["file"]).encode())
+'''
+
+
+class TestSharding(unittest.TestCase):
+    def test_make_shards(self):
+        jobs = list(range(10))
+
+        self.assertEqual(make_shards(jobs, shard_size=4, processes=1), [[0, 1, 2], [3, 4, 5], [6, 7, 8, 9]])
+        self.assertEqual(len(make_shards(jobs, shard_size=100, processes=4)), 4)
+        self.assertEqual(make_shards([], shard_size=4, processes=2), [])
+
+    def test_collect_svg_files(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for name in ("b.svg", "a.svg", "notes.txt", os.path.join("sub", "c.svg")):
+                os.makedirs(os.path.dirname(os.path.join(temp_dir, name)), exist_ok=True)
+                open(os.path.join(temp_dir, name), "w").close()
+
+            names = [os.path.relpath(path, temp_dir) for path in collect_svg_files([temp_dir])]
+            self.assertEqual(names, ["a.svg", "b.svg"])
+            self.assertEqual(len(collect_svg_files([temp_dir], recursive=True)), 3)
+
+
+@unittest.skipIf(os.name == "nt", "The fake Inkscape shell is a POSIX script")
+class TestBulkExport(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.counter_path = os.path.join(self.temp_dir.name, "starts")
+        inkscape_path = os.path.join(self.temp_dir.name, "inkscape")
+        with open(inkscape_path, "w") as file:
+            file.write(FAKE_INKSCAPE.format(python=sys.executable, counter=self.counter_path))
+        os.chmod(inkscape_path, os.stat(inkscape_path).st_mode | stat.S_IEXEC)
+
+        self.patchers = [
+            mock.patch.object(inkscape_discovery, "INKSCAPE_DISCOVERY_FILE",
+                              os.path.join(self.temp_dir.name, "inkscape.json")),
+            mock.patch.multiple(INKSCAPE_PATH, path=inkscape_path, info=None, discovered=True),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+        self.source_dir = os.path.join(self.temp_dir.name, "cards")
+        os.makedirs(self.source_dir)
+        for index in range(5):
+            with open(os.path.join(self.source_dir, f"card{index}.svg"), "w") as file:
+                file.write("<svg xmlns='http://www.w3.org/2000/svg'/>")
+
+    def tearDown(self):
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.temp_dir.cleanup()
+
+    def start_count(self):
+        with open(self.counter_path) as counter:
+            return len(counter.read())
+
+    def test_shards_share_processes(self):
+        output_dir = os.path.join(self.temp_dir.name, "png")
+
+        results = export_pngs([self.source_dir], output_dir, width=100, processes=2, shard_size=3)
+
+        self.assertEqual([result['error'] for result in results], [None] * 5)
+        self.assertEqual(self.start_count(), 2)
+        with open(os.path.join(output_dir, "card3.png"), "rb") as file:
+            self.assertEqual(file.read(), b"PNG:card3.svg")
+        self.assertEqual(sorted(os.listdir(output_dir)), [f"card{index}.png" for index in range(5)])
+
+    def test_failures_are_reported_per_file(self):
+        missing_path = os.path.join(self.source_dir, "missing.svg")
+        sources = [os.path.join(self.source_dir, "card0.svg"), missing_path,
+                   os.path.join(self.source_dir, "card1.svg")]
+
+        results = export_pngs(sources, processes=1)
+
+        self.assertIsNone(results[0]['error'])
+        self.assertIn("Can't open file", results[1]['error'])
+        self.assertIsNone(results[1]['png'])
+        self.assertIsNone(results[2]['error'])
+        self.assertEqual(self.start_count(), 1)
+
+    def test_duplicate_outputs(self):
+        card_path = os.path.join(self.source_dir, "card0.svg")
+
+        results = export_pngs([card_path, card_path], processes=1)
+
+        self.assertIsNone(results[0]['error'])
+        self.assertIsNotNone(results[1]['error'])
+
+
+if __name__ == "__main__":
+    unittest.main()
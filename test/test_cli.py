@@ -0,0 +1,56 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from gatorsvg.cli import main
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_SVG = os.path.join(TEST_DIR, "test_svg_file.svg")
+
+
+class TestCLI(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.svg_path = os.path.join(self.directory.name, "template.svg")
+        shutil.copy(TEST_SVG, self.svg_path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_set_and_get(self):
+        output = os.path.join(self.directory.name, "out.svg")
+        self.assertEqual(main(["set", self.svg_path, "desc", "fill", "#123456", "-t", "Style", "-o", output]), 0)
+        self.assertEqual(main(["get", output, "missing", "fill"]), 1)
+
+        quick_edit_file = os.path.join(self.directory.name, "edits.txt")
+        with open(quick_edit_file, "w", encoding="utf-8") as file:
+            file.write("path271,rx,Normal,42\nmissing,fill,Style,#000000\n")
+        self.assertEqual(main(["apply-quick-edits", output, quick_edit_file]), 1)
+
+        result = subprocess.run([sys.executable, "-m", "gatorsvg", "get", output, "path271", "rx"],
+                                cwd=os.path.dirname(TEST_DIR), capture_output=True, text=True)
+        self.assertEqual(result.stdout.strip(), "42")
+
+    def test_set_unchanged_value_writes_output(self):
+        output = os.path.join(self.directory.name, "unchanged.svg")
+        self.assertEqual(main(["set", self.svg_path, "desc", "fill", "#462254", "-t", "Style", "-o", output]), 0)
+        self.assertTrue(os.path.isfile(output))
+        self.assertEqual(main(["get", output, "desc", "fill", "-t", "Style"]), 0)
+
+    def test_does_not_import_gui(self):
+        code = ("import sys\n"
+                "from gatorsvg.cli import main\n"
+                f"main(['get', {self.svg_path!r}, 'desc', 'fill', '-t', 'Style'])\n"
+                f"main(['set', {self.svg_path!r}, 'desc', 'fill', '#654321', '-t', 'Style'])\n"
+                "print(sorted(m for m in sys.modules if m.split('.')[0] in ('tkinter', 'PIL', 'gui')))\n")
+        result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(TEST_DIR),
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import unittest
+
+from api.module import apply_quick_edits
+from utils.edit_journal import EditJournal
+from utils.svg_parser import find_attribute_value, find_element_by_id, load_svg, set_attribute_value
+
+TEST_SVG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_svg_file.svg")
+
+
+class TestEditJournal(unittest.TestCase):
+    def setUp(self):
+        self.root = load_svg(TEST_SVG).getroot()
+        self.journal = EditJournal.get_instance()
+        self.journal.clear()
+        self.journal.enable()
+
+    def tearDown(self):
+        self.journal.clear()
+        self.journal.enabled = False
+
+    def test_undo_redo_each_kind(self):
+        old_fill = find_attribute_value(self.root, "desc", "fill", 2)
+        old_text = find_element_by_id(self.root, "tspan273").text
+        set_attribute_value(self.root, "desc", "fill", 2, "#123456")
+        set_attribute_value(self.root, "tspan273", "{svg}tspan", 3, "changed")
+        set_attribute_value(self.root, "desc", "id", 1, "renamed")
+
+        self.journal.undo()
+        self.assertIs(find_element_by_id(self.root, "desc"), self.root.find(".//*[@id='desc']"))
+        self.journal.undo()
+        self.assertEqual(find_element_by_id(self.root, "tspan273").text, old_text)
+        self.journal.undo()
+        self.assertEqual(find_attribute_value(self.root, "desc", "fill", 2), old_fill)
+        self.assertIsNone(self.journal.undo())
+
+        self.journal.redo()
+        self.assertEqual(find_attribute_value(self.root, "desc", "fill", 2), "#123456")
+        set_attribute_value(self.root, "desc", "fill", 2, "#654321")
+        self.assertFalse(self.journal.can_redo())
+
+    def test_grouped_edits_undo_as_one_step(self):
+        old_fill = find_attribute_value(self.root, "desc", "fill", 2)
+        apply_quick_edits(self.root, [
+            {'ID': 'desc', 'attribute': 'fill', 'type': 'Style', 'value': '#123456'},
+            {'ID': 'tspan273', 'attribute': '{svg}tspan', 'type': 'Element', 'value': '9.9'},
+        ])
+        self.assertEqual(len(self.journal.undo_steps), 1)
+
+        self.journal.undo()
+        self.assertEqual(find_attribute_value(self.root, "desc", "fill", 2), old_fill)
+        self.assertFalse(self.journal.can_undo())
+
+    def test_bounded(self):
+        journal = EditJournal(max_steps=3)
+        journal.enable()
+        for value in range(10):
+            journal.record(self.root, "attribute", "width", str(value), str(value + 1))
+        self.assertEqual(len(journal.undo_steps), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
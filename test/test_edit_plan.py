@@ -0,0 +1,52 @@
+import copy
+import os
+import unittest
+
+from api.module import apply_quick_edits
+from utils.edit_plan import EditPlan
+from utils.svg_parser import EDIT_APPLIED, EDIT_NOT_FOUND, EDIT_UNCHANGED, load_svg, serialize_svg
+
+TEST_SVG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_svg_file.svg")
+
+TARGETS = [
+    ("desc", "fill", "Style"),
+    ("tspan273", "{svg}tspan", "Element"),
+    ("path271", "rx", "Normal"),
+    ("missing", "fill", "Style"),
+]
+
+
+class TestEditPlan(unittest.TestCase):
+    def setUp(self):
+        self.template = load_svg(TEST_SVG).getroot()
+        self.plan = EditPlan(self.template, TARGETS)
+
+    def test_matches_apply_quick_edits(self):
+        for values in (["#123456", "9.9", "42", "#000000"], ["#654321", "1.5", "7", "#ffffff"]):
+            planned = copy.deepcopy(self.template)
+            report = self.plan.execute(planned, values)
+
+            expected = copy.deepcopy(self.template)
+            expected_report = apply_quick_edits(expected, [
+                {'ID': element_id, 'attribute': attribute_name, 'type': type_name, 'value': value}
+                for (element_id, attribute_name, type_name), value in zip(TARGETS, values)
+            ])
+
+            self.assertEqual(report, expected_report)
+            self.assertEqual(len(report[EDIT_APPLIED]), 3)
+            self.assertEqual([attr['ID'] for attr in report[EDIT_NOT_FOUND]], ["missing"])
+            self.assertEqual(serialize_svg(planned), serialize_svg(expected))
+
+    def test_execute_on_template(self):
+        report = self.plan.execute(self.template, ["#123456", "9.9", "42", ""])
+        self.assertEqual(len(report[EDIT_APPLIED]), 3)
+        report = self.plan.execute(self.template, ["#123456", "9.9", "42", ""])
+        self.assertEqual(len(report[EDIT_UNCHANGED]), 3)
+
+    def test_value_count(self):
+        with self.assertRaises(ValueError):
+            self.plan.execute(self.template, ["#123456"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import os
+import unittest
+import xml.etree.ElementTree as ET
+
+from utils.svg_parser import (add_element, find_attribute_value, find_element_by_id, load_svg, remove_element,
+                              set_attribute_value)
+
+TEST_SVG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_svg_file.svg")
+
+
+class TestElementIndex(unittest.TestCase):
+    def setUp(self):
+        self.root = load_svg(TEST_SVG).getroot()
+
+    def test_lookup_matches_find(self):
+        for element_id in ("poster", "desc", "tspan273", "stop270"):
+            self.assertIs(find_element_by_id(self.root, element_id), self.root.find(f".//*[@id='{element_id}']"))
+        self.assertIsNone(find_element_by_id(self.root, "does-not-exist"))
+
+    def test_find_and_set_use_index(self):
+        self.assertEqual(set_attribute_value(self.root, "path271", "rx", 1, "42"), 1)
+        self.assertEqual(find_attribute_value(self.root, "path271", "rx", 1), "42")
+
+    def test_add_and_remove(self):
+        layer = find_element_by_id(self.root, "layer1")
+        rect = ET.Element("{http://www.w3.org/2000/svg}rect", {"id": "added"})
+        add_element(self.root, layer, rect)
+        self.assertIs(find_element_by_id(self.root, "added"), rect)
+
+        remove_element(self.root, layer, rect)
+        self.assertIsNone(find_element_by_id(self.root, "added"))
+
+    def test_rename(self):
+        element = find_element_by_id(self.root, "path271")
+        self.assertEqual(set_attribute_value(self.root, "path271", "id", 1, "renamed"), 1)
+        self.assertIsNone(find_element_by_id(self.root, "path271"))
+        self.assertIs(find_element_by_id(self.root, "renamed"), element)
+
+
+if __name__ == "__main__":
+    unittest.main()
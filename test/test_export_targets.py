@@ -0,0 +1,113 @@
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from PIL import Image
+
+from utils import inkscape_discovery
+from utils.config import INKSCAPE_PATH
+from utils.export_targets import document_size, export_targets, parse_target, target_size
+from utils.inkscape_pool import INKSCAPE_POOL
+
+# A stand-in for `inkscape --shell` that exports blank images of the requested size and counts the exports
+FAKE_INKSCAPE = '''#!{python}
+import sys
+from PIL import Image
+if sys.argv[1:] == ["--version"]:
+    sys.stdout.write("Inkscape 1.3.2 (091e20e, 2023-11-25)\\n")
+    sys.exit(0)
+sys.stdout.write("> ")
+sys.stdout.flush()
+for line in sys.stdin:
+    state = {{}}
+    for action in filter(None, (part.strip() for part in line.split(";"))):
+        name, _, argument = action.partition(":")
+        if name == "quit":
+            sys.exit(0)
+        state[name] = argument
+        if name == "export-do":
+            size = (int(state["export-width"]), int(state["export-height"]))
+            Image.new("RGBA", size, (255, 0, 0, 128)).save(state["export-filename"], "PNG")
+            with open({counter!r}, "a") as counter:
+                counter.write("x")
+    sys.stdout.write("> ")
+    sys.stdout.flush()
+'''
+
+SVG = b"<svg xmlns='http://www.w3.org/2000/svg' width='100mm' viewBox='0 0 200 100'/>"
+
+
+class TestTargetSizes(unittest.TestCase):
+    def test_document_size(self):
+        width, height = document_size(SVG)
+        self.assertAlmostEqual(width, 96 * 100 / 25.4)
+        self.assertAlmostEqual(height, width / 2)
+        self.assertEqual(document_size(b"<svg width='300' height='150'/>"), (300, 150))
+        self.assertIsNone(document_size(b"<svg width='100%'/>"))
+
+    def test_target_size(self):
+        self.assertEqual(target_size({'path': "a.png", 'scale': 2}, (100, 50)), (200, 100))
+        self.assertEqual(target_size({'path': "a.png", 'width': 40}, (100, 50)), (40, 20))
+        self.assertEqual(target_size({'path': "a.png", 'width': 40, 'height': 40}, None), (40, 40))
+        self.assertRaises(ValueError, target_size, {'path': "a.png"}, None)
+
+    def test_parse_target(self):
+        self.assertEqual(parse_target("card.png"), {'path': "card.png"})
+        self.assertEqual(parse_target("card@2x.png=2x"), {'path': "card@2x.png", 'scale': 2.0})
+        self.assertEqual(parse_target("thumb.webp=256w"), {'path': "thumb.webp", 'width': 256})
+        self.assertEqual(parse_target("a=b.png=800x600"), {'path': "a=b.png", 'width': 800, 'height': 600})
+        self.assertRaises(ValueError, parse_target, "card.png=big")
+
+
+@unittest.skipIf(os.name == "nt", "The fake Inkscape shell is a POSIX script")
+class TestExportTargets(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.counter_path = os.path.join(self.temp_dir.name, "exports")
+        inkscape_path = os.path.join(self.temp_dir.name, "inkscape")
+        with open(inkscape_path, "w") as file:
+            file.write(FAKE_INKSCAPE.format(python=sys.executable, counter=self.counter_path))
+        os.chmod(inkscape_path, os.stat(inkscape_path).st_mode | stat.S_IEXEC)
+
+        self.patchers = [
+            mock.patch.object(inkscape_discovery, "INKSCAPE_DISCOVERY_FILE",
+                              os.path.join(self.temp_dir.name, "inkscape.json")),
+            mock.patch.multiple(INKSCAPE_PATH, path=inkscape_path, info=None, discovered=True),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+        self.svg_path = os.path.join(self.temp_dir.name, "card.svg")
+        with open(self.svg_path, "wb") as file:
+            file.write(SVG)
+
+    def tearDown(self):
+        INKSCAPE_POOL.close()
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.temp_dir.cleanup()
+
+    def test_single_render(self):
+        targets = [
+            {'path': os.path.join(self.temp_dir.name, "card.png")},
+            {'path': os.path.join(self.temp_dir.name, "card@3x.png"), 'scale': 3},
+            {'path': os.path.join(self.temp_dir.name, "thumb.webp"), 'width': 64, 'quality': 80},
+            {'path': os.path.join(self.temp_dir.name, "thumb.jpg"), 'height': 16},
+        ]
+
+        results = export_targets(self.svg_path, targets, backend="inkscape")
+
+        self.assertEqual([result['error'] for result in results], [None] * 4)
+        with open(self.counter_path) as counter:
+            self.assertEqual(counter.read(), "x")
+        expected = [("PNG", (378, 189)), ("PNG", (1134, 567)), ("WEBP", (64, 32)), ("JPEG", (32, 16))]
+        for target, (image_format, size) in zip(targets, expected):
+            with Image.open(target['path']) as image:
+                self.assertEqual((image.format, image.size), (image_format, size))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+from utils.image_links import ImageLinkResolver, link_file_path, resolve_image_link
+
+XLINK_HREF = "{http://www.w3.org/1999/xlink}href"
+
+
+class TestImageLinks(unittest.TestCase):
+    def test_resolve_image_link(self):
+        svg_dir = os.path.abspath("assets")
+        self.assertEqual(resolve_image_link("Sample/tv.jpg", svg_dir),
+                         "file:///" + os.path.join(svg_dir, "Sample", "tv.jpg"))
+        self.assertEqual(resolve_image_link("file:///Z:/tv.jpg", svg_dir), "file:///Z:/tv.jpg")
+        self.assertEqual(resolve_image_link("https://example.com/tv.jpg", svg_dir), "https://example.com/tv.jpg")
+
+    def test_link_file_path(self):
+        self.assertEqual(link_file_path("file:///Z:/Sample/tv%20show.jpg"), "Z:/Sample/tv show.jpg")
+        self.assertEqual(link_file_path("file:////home/tv.jpg"), "/home/tv.jpg")
+        self.assertIsNone(link_file_path("https://example.com/tv.jpg"))
+
+    def test_resolver_reports_missing_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "found.png"), "wb") as file:
+                file.write(b"png")
+            root = ET.fromstring(
+                '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">'
+                '<image id="found" xlink:href="found.png"/>'
+                '<image id="missing" xlink:href="missing.png"/>'
+                '<image id="again" xlink:href="missing.png"/>'
+                '<image id="embedded" xlink:href="data:image/png;base64,AAAA"/>'
+                '<use id="clone" xlink:href="#found"/>'
+                '</svg>')
+
+            resolver = ImageLinkResolver(os.path.join(directory, "card.svg"))
+            resolver.resolve_all(root)
+            missing = resolver.missing_links()
+            resolver.close()
+
+        self.assertEqual([link['id'] for link in missing], ["missing", "again"])
+        self.assertEqual(len(resolver.checks), 2)
+        self.assertEqual(root.find(".//*[@id='found']").get(XLINK_HREF),
+                         "file:///" + os.path.join(os.path.abspath(directory), "found.png"))
+        self.assertEqual(root.find(".//*[@id='embedded']").get(XLINK_HREF), "data:image/png;base64,AAAA")
+        self.assertEqual(root.find(".//*[@id='clone']").get(XLINK_HREF), "#found")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from utils import inkscape_discovery
+from utils.inkscape_discovery import discover_inkscape, parse_version, version_features
+
+# A stand-in for `inkscape --version` that counts how often it is started
+FAKE_INKSCAPE = '''#!{python}
+import sys
+with open({counter!r}, "a") as counter:
+    counter.write("x")
+sys.stdout.write("Inkscape 1.3.2 (091e20e, 2023-11-25)\\n")
+'''
+
+
+class TestVersionParsing(unittest.TestCase):
+    def test_parse_version(self):
+        self.assertEqual(parse_version("Inkscape 1.3.2 (091e20e, 2023-11-25)\n"), "1.3.2")
+        self.assertEqual(parse_version("Inkscape 0.92.4 (5da689c313, 2019-01-14)"), "0.92.4")
+        self.assertIsNone(parse_version("command not found"))
+
+    def test_version_features(self):
+        self.assertTrue(version_features("1.0")['shell_actions'])
+        self.assertFalse(version_features("0.92.4")['shell_actions'])
+        self.assertFalse(version_features(None)['shell_actions'])
+
+
+@unittest.skipIf(os.name == "nt", "The fake Inkscape is a POSIX script")
+class TestInkscapeDiscovery(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.counter_path = os.path.join(self.temp_dir.name, "probes")
+        self.inkscape_path = os.path.join(self.temp_dir.name, "inkscape")
+        with open(self.inkscape_path, "w") as file:
+            file.write(FAKE_INKSCAPE.format(python=sys.executable, counter=self.counter_path))
+        os.chmod(self.inkscape_path, os.stat(self.inkscape_path).st_mode | stat.S_IEXEC)
+
+        discovery_path = os.path.join(self.temp_dir.name, "config", "inkscape.json")
+        self.patcher = mock.patch.object(inkscape_discovery, "INKSCAPE_DISCOVERY_FILE", discovery_path)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.temp_dir.cleanup()
+
+    def probe_count(self):
+        if not os.path.exists(self.counter_path):
+            return 0
+        with open(self.counter_path) as counter:
+            return len(counter.read())
+
+    def test_result_is_reused(self):
+        info = discover_inkscape(self.inkscape_path)
+        self.assertEqual(info['version'], "1.3.2")
+        self.assertTrue(info['features']['shell_actions'])
+        self.assertTrue(os.path.exists(inkscape_discovery.discovery_file()))
+
+        self.assertEqual(discover_inkscape(self.inkscape_path), info)
+        self.assertEqual(self.probe_count(), 1)
+
+    def test_changed_executable_is_probed_again(self):
+        discover_inkscape(self.inkscape_path)
+        stat_result = os.stat(self.inkscape_path)
+        os.utime(self.inkscape_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10 ** 9))
+
+        discover_inkscape(self.inkscape_path)
+        self.assertEqual(self.probe_count(), 2)
+
+    def test_failed_probe_is_not_stored(self):
+        with open(self.inkscape_path, "w") as file:
+            file.write(f"#!{sys.executable}\nimport sys\nsys.exit(1)\n")
+
+        info = discover_inkscape(self.inkscape_path)
+        self.assertIsNone(info['version'])
+        self.assertFalse(os.path.exists(inkscape_discovery.discovery_file()))
+
+    def test_missing_executable(self):
+        with mock.patch.object(inkscape_discovery, "find_inkscape_executable", return_value=None):
+            self.assertIsNone(discover_inkscape())
+
+
+if __name__ == "__main__":
+    unittest.main()
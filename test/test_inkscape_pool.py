@@ -0,0 +1,105 @@
+import os
+import stat
+import sys
+import tempfile
+import threading
+import unittest
+
+from utils.inkscape_pool import (InkscapeJobCancelled, InkscapePool, InkscapeShellError, InkscapeShellUnavailable,
+                                 ends_with_prompt)
+
+# A stand-in for `inkscape --shell` that understands the few actions used by the pool
+FAKE_INKSCAPE = '''#!{python}
+import sys, time
+sys.stdout.write("Inkscape interactive shell mode.\\n> ")
+sys.stdout.flush()
+state = {{}}
+for line in sys.stdin:
+    for action in filter(None, (part.strip() for part in line.split(";"))):
+        name, _, argument = action.partition(":")
+        if name == "quit":
+            sys.exit(0)
+        if name == "file-open":
+            state["file"] = argument
+            if "crash" in argument:
+                sys.exit(1)
+            if "hang" in argument:
+                time.sleep(60)
+            if "slow" in argument:
+                time.sleep(0.5)
+            if "echo" in argument:
+                sys.stdout.write("<svg></svg>\\n")
+                sys.stdout.flush()
+                time.sleep(0.3)
+        elif name == "export-filename":
+            state["output"] = argument
+        elif name == "export-do":
+            with open(state["output"], "wb") as output:
+                output.write(b"PNG:" + state["file"].encode())
+        elif name == "system-data-directory":
+            sys.stdout.write("/usr/share/inkscape\\n")
+    sys.stdout.write("> ")
+    sys.stdout.flush()
+'''
+
+
+@unittest.skipIf(os.name == "nt", "The fake Inkscape shell is a POSIX script")
+class TestInkscapePool(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.inkscape_path = os.path.join(self.temp_dir.name, "inkscape")
+        with open(self.inkscape_path, "w") as file:
+            file.write(FAKE_INKSCAPE.format(python=sys.executable))
+        os.chmod(self.inkscape_path, os.stat(self.inkscape_path).st_mode | stat.S_IEXEC)
+        self.pool = InkscapePool(self.inkscape_path, size=2, job_timeout=2)
+
+    def tearDown(self):
+        self.pool.close()
+        self.temp_dir.cleanup()
+
+    def test_workers_are_reused(self):
+        self.assertEqual(self.pool.render("a.svg"), b"PNG:a.svg")
+        self.assertEqual(self.pool.render("b.svg"), b"PNG:b.svg")
+        self.assertEqual(len(self.pool.workers), 1)
+
+    def test_output_ending_with_tag_is_not_a_prompt(self):
+        self.assertFalse(ends_with_prompt(b"<svg></svg>"))
+        self.assertTrue(ends_with_prompt(b"> "))
+        self.assertTrue(ends_with_prompt(b"<svg></svg>\n> "))
+        self.assertEqual(self.pool.render("echo.svg"), b"PNG:echo.svg")
+
+    def test_render_data(self):
+        data = self.pool.render_data(b"<svg/>")
+        self.assertTrue(data.startswith(b"PNG:"))
+        self.assertTrue(data.endswith(b"input.svg"))
+
+    def test_hung_worker_is_replaced(self):
+        self.assertRaises(InkscapeShellError, self.pool.render, "hang.svg")
+        self.assertEqual(len(self.pool.workers), 0)
+        self.assertEqual(self.pool.render("a.svg"), b"PNG:a.svg")
+
+    def test_crashed_worker_is_replaced(self):
+        self.assertRaises(InkscapeShellError, self.pool.render, "crash.svg")
+        self.assertEqual(self.pool.render("a.svg"), b"PNG:a.svg")
+
+    def test_cancelled_worker_is_kept(self):
+        pool = InkscapePool(self.inkscape_path, size=1, job_timeout=2)
+        try:
+            cancel_event = threading.Event()
+            threading.Timer(0.1, cancel_event.set).start()
+            self.assertRaises(InkscapeJobCancelled, pool.render, "slow.svg", cancel_event=cancel_event)
+
+            worker = next(iter(pool.workers))
+            self.assertEqual(pool.render("a.svg"), b"PNG:a.svg")
+            self.assertEqual(pool.workers, {worker})
+        finally:
+            pool.close()
+
+    def test_unavailable_shell(self):
+        pool = InkscapePool(os.path.join(self.temp_dir.name, "missing"))
+        self.assertRaises(InkscapeShellUnavailable, pool.render, "a.svg")
+        self.assertRaises(InkscapeShellUnavailable, pool.render, "a;b.svg")
+
+
+if __name__ == "__main__":
+    unittest.main()
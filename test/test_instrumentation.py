@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import unittest
+
+from utils.instrumentation import INSTRUMENTATION
+from utils.svg_parser import find_attribute_value, load_svg
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        INSTRUMENTATION.reset()
+
+    def tearDown(self):
+        INSTRUMENTATION.disable()
+        INSTRUMENTATION.reset()
+
+    def test_disabled_records_nothing(self):
+        with INSTRUMENTATION.span("parse"):
+            pass
+        INSTRUMENTATION.count("render_cache.hit")
+
+        report = INSTRUMENTATION.report()
+        self.assertEqual(report['spans'], {})
+        self.assertEqual(report['counters'], {})
+
+    def test_spans_and_counters(self):
+        INSTRUMENTATION.enable()
+        svg_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_svg_file.svg")
+        root = load_svg(svg_path).getroot()
+        find_attribute_value(root, "desc", "fill", 2)
+        find_attribute_value(root, "desc", "stroke", 2)
+        INSTRUMENTATION.count("render_cache.hit", 3)
+
+        report = INSTRUMENTATION.report()
+        self.assertEqual(report['spans']['parse']['count'], 1)
+        self.assertEqual(report['spans']['lookup']['count'], 2)
+        self.assertGreaterEqual(report['spans']['lookup']['max_ms'], report['spans']['lookup']['mean_ms'])
+        self.assertEqual(report['counters'], {'render_cache.hit': 3})
+
+    def test_dump(self):
+        INSTRUMENTATION.enable()
+        INSTRUMENTATION.record("render", 0.25)
+
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, "profile.json")
+            text_path = os.path.join(directory, "profile.txt")
+            INSTRUMENTATION.dump(json_path)
+            INSTRUMENTATION.dump(text_path)
+
+            with open(json_path, encoding="utf-8") as file:
+                self.assertEqual(json.load(file)['spans']['render']['total_ms'], 250)
+            with open(text_path, encoding="utf-8") as file:
+                self.assertIn("render", file.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
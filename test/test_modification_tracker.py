@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+from api.module import save_svg_to_file, set_element
+from utils.svg_parser import load_svg, set_attribute_value, write_svg_file
+
+TEST_SVG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_svg_file.svg")
+
+
+class TestModificationTracker(unittest.TestCase):
+    def setUp(self):
+        self.root = load_svg(TEST_SVG).getroot()
+        self.directory = tempfile.TemporaryDirectory()
+        self.save_path = os.path.join(self.directory.name, "saved.svg")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_unchanged_document_is_not_rewritten(self):
+        self.assertTrue(write_svg_file(self.root, self.save_path))
+        self.assertFalse(write_svg_file(self.root, self.save_path))
+
+        # A no-op edit does not make the document dirty
+        set_attribute_value(self.root, "desc", "fill", 2, "#123456")
+        self.assertTrue(write_svg_file(self.root, self.save_path))
+        set_attribute_value(self.root, "desc", "fill", 2, "#123456")
+        self.assertFalse(write_svg_file(self.root, self.save_path))
+
+    def test_other_document_or_changed_file_is_written(self):
+        self.assertTrue(write_svg_file(self.root, self.save_path))
+        self.assertTrue(write_svg_file(load_svg(TEST_SVG).getroot(), self.save_path))
+
+        with open(self.save_path, "a", encoding="utf-8") as file:
+            file.write("\n")
+        self.assertTrue(write_svg_file(self.root, self.save_path))
+        self.assertFalse(write_svg_file(self.root, self.save_path))
+
+    def test_api_writers(self):
+        self.assertTrue(save_svg_to_file(self.save_path, self.root))
+        self.assertFalse(save_svg_to_file(self.save_path, self.root))
+
+        mtime = os.stat(self.save_path).st_mtime_ns
+        report = set_element(self.save_path, [{'ID': 'desc', 'attribute': 'id', 'type': 'Normal', 'value': 'desc'}],
+                             'save')
+        self.assertIsNone(report['saved_to'])
+        self.assertEqual(os.stat(self.save_path).st_mtime_ns, mtime)
+
+
+if __name__ == "__main__":
+    unittest.main()
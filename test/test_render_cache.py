@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from utils.image_links import linked_file_signatures
+from utils.render_cache import RenderCache, render_cache_key
+
+
+class TestRenderCache(unittest.TestCase):
+    def test_key_depends_on_content_and_parameters(self):
+        key = render_cache_key(b"<svg/>", dpi=96, width=None)
+        self.assertEqual(key, render_cache_key(b"<svg/>", width=None, dpi=96))
+        self.assertNotEqual(key, render_cache_key(b"<svg/>", dpi=192, width=None))
+        self.assertNotEqual(key, render_cache_key(b"<svg></svg>", dpi=96, width=None))
+
+    def test_memory_lru(self):
+        cache = RenderCache(max_entries=2, max_bytes=1024)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        cache.get("a")
+        cache.put("c", b"3")
+
+        self.assertEqual(cache.get("a"), b"1")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()['hits'], 2)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_disk_tier(self):
+        with tempfile.TemporaryDirectory() as disk_dir:
+            RenderCache(disk_dir=disk_dir).put("a", b"x" * 10)
+
+            cache = RenderCache(disk_dir=disk_dir, max_disk_bytes=15)
+            self.assertEqual(cache.get("a"), b"x" * 10)
+            self.assertEqual(cache.stats()['disk_hits'], 1)
+
+            cache.put("b", b"y" * 10)
+            self.assertEqual(sorted(os.listdir(disk_dir)), ["b.png"])
+
+    def test_stale_temp_files_are_removed(self):
+        with tempfile.TemporaryDirectory() as disk_dir:
+            stale_path = os.path.join(disk_dir, "stale.tmp")
+            recent_path = os.path.join(disk_dir, "recent.tmp")
+            for path in (stale_path, recent_path):
+                with open(path, "wb") as file:
+                    file.write(b"partial")
+            os.utime(stale_path, (0, 0))
+
+            RenderCache(disk_dir=disk_dir)
+            self.assertEqual(sorted(os.listdir(disk_dir)), ["recent.tmp"])
+
+    def test_failed_write_removes_temp_file(self):
+        with tempfile.TemporaryDirectory() as disk_dir:
+            cache = RenderCache(disk_dir=disk_dir)
+            with mock.patch("utils.render_cache.os.replace", side_effect=OSError("disk full")):
+                cache.put("a", b"x" * 10)
+
+            self.assertEqual(os.listdir(disk_dir), [])
+            self.assertEqual(cache.get("a"), b"x" * 10)
+
+    def test_key_depends_on_linked_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            image_path = os.path.join(directory, "poster.png")
+            svg_bytes = b'<svg xmlns:xlink="http://www.w3.org/1999/xlink"><image xlink:href="poster.png"/></svg>'
+            with open(image_path, "wb") as file:
+                file.write(b"1")
+            key = render_cache_key(svg_bytes, linked_files=linked_file_signatures(svg_bytes, directory))
+
+            with open(image_path, "wb") as file:
+                file.write(b"22")
+            self.assertNotEqual(key, render_cache_key(svg_bytes,
+                                                      linked_files=linked_file_signatures(svg_bytes, directory)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import io
+import os
+import stat
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+from utils.file_helper import atomic_open
+from utils.svg_parser import LineBreakWriter, load_svg, write_svg_file
+
+TEST_SVG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_svg_file.svg")
+
+
+class TestSave(unittest.TestCase):
+    def test_line_breaks_across_writes(self):
+        buffer = io.StringIO()
+        writer = LineBreakWriter(buffer)
+        for piece in ("<a>", "<b></b", "><c/>", "", "<d>x</d>"):
+            writer.write(piece)
+        self.assertEqual(buffer.getvalue(), "<a>\n<b>\n</b>\n<c/>\n<d>x</d>")
+
+    def test_write_matches_tostring(self):
+        root = load_svg(TEST_SVG).getroot()
+        expected = ET.tostring(root, encoding="unicode", short_empty_elements=False).replace("><", ">\n<")
+        with tempfile.TemporaryDirectory() as directory:
+            save_path = os.path.join(directory, "saved.svg")
+            write_svg_file(root, save_path)
+            with open(save_path, encoding="utf-8") as file:
+                self.assertEqual(file.read(), expected)
+            self.assertEqual(os.listdir(directory), ["saved.svg"])
+
+    def test_failed_write_keeps_original(self):
+        with tempfile.TemporaryDirectory() as directory:
+            save_path = os.path.join(directory, "saved.svg")
+            with open(save_path, "w", encoding="utf-8") as file:
+                file.write("original")
+            os.chmod(save_path, 0o640)
+
+            with self.assertRaises(RuntimeError):
+                with atomic_open(save_path, "w", encoding="utf-8") as file:
+                    file.write("partial")
+                    raise RuntimeError("interrupted")
+            with open(save_path, encoding="utf-8") as file:
+                self.assertEqual(file.read(), "original")
+            self.assertEqual(os.listdir(directory), ["saved.svg"])
+
+            with atomic_open(save_path, "w", encoding="utf-8") as file:
+                file.write("replaced")
+            with open(save_path, encoding="utf-8") as file:
+                self.assertEqual(file.read(), "replaced")
+            self.assertEqual(stat.S_IMODE(os.stat(save_path).st_mode), 0o640)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import unittest
+import xml.etree.ElementTree as ET
+
+from utils.style import Style, flush_styles, get_style
+from utils.svg_parser import find_attribute_value, load_svg, parse_style, serialize_svg, set_attribute_value
+
+TEST_SVG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_svg_file.svg")
+
+
+class TestStyle(unittest.TestCase):
+    def test_parse(self):
+        style = Style("fill: red ;stroke:url(data:image/png;base64,AA==); font-family:'a:b;c' !important;;bad")
+        self.assertEqual(dict(style.items()), {
+            "fill": "red",
+            "stroke": "url(data:image/png;base64,AA==)",
+            "font-family": "'a:b;c'",
+        })
+        self.assertEqual(style.important, {"font-family"})
+        self.assertEqual(Style(style.to_string()).to_string(), style.to_string())
+        self.assertEqual(parse_style("a:b:c"), {"a": "b:c"})
+
+    def test_parse_ignores_comments(self):
+        self.assertEqual(dict(Style("/* c */fill:red").items()), {"fill": "red"})
+        self.assertEqual(dict(Style("fill:red /* c */;stroke:blue").items()), {"fill": "red", "stroke": "blue"})
+        style = Style("fill:red /* c */ !important;font-family:'/* a */'")
+        self.assertEqual(dict(style.items()), {"fill": "red", "font-family": "'/* a */'"})
+        self.assertEqual(style.important, {"fill"})
+
+    def test_cached_until_attribute_changes(self):
+        element = ET.Element("rect", {"style": "fill:red"})
+        style = get_style(element)
+        self.assertIs(get_style(element), style)
+        element.set("style", "fill:blue")
+        self.assertEqual(get_style(element).get("fill"), "blue")
+
+    def test_edits_written_on_serialize(self):
+        root = load_svg(TEST_SVG).getroot()
+        self.assertEqual(set_attribute_value(root, "desc", "fill", 2, "#123456"), 1)
+        self.assertEqual(find_attribute_value(root, "desc", "fill", 2), "#123456")
+
+        svg_string = serialize_svg(root)
+        self.assertIn("fill:#123456", svg_string)
+        self.assertIn("fill:#123456", root.find(".//*[@id='desc']").get("style"))
+
+    def test_raw_style_read_sees_edits(self):
+        root = load_svg(TEST_SVG).getroot()
+        set_attribute_value(root, "desc", "fill", 2, "#654321")
+        self.assertIn("fill:#654321", find_attribute_value(root, "desc", "style", 1))
+        flush_styles()
+
+
+if __name__ == "__main__":
+    unittest.main()
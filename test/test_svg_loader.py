@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+from utils.svg_loader import SVGLoader
+from utils.svg_parser import find_element_by_id
+
+TEST_SVG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_svg_file.svg")
+
+
+class TestSVGLoader(unittest.TestCase):
+    def test_matches_parse(self):
+        loader = SVGLoader(TEST_SVG, chunk_size=64)
+        items = []
+        while not loader.done:
+            items.extend(loader.read_chunk())
+            self.assertLessEqual(loader.progress, 1.0)
+
+        expected = ET.parse(TEST_SVG).getroot()
+        self.assertEqual(ET.tostring(loader.root), ET.tostring(expected))
+        self.assertEqual([element for element, _ in items], list(loader.root.iter()))
+        self.assertEqual(items[0], (loader.root, 0))
+        self.assertEqual(loader.element_count, len(items))
+        self.assertIs(find_element_by_id(loader.root, "tspan273"), loader.root.find(".//*[@id='tspan273']"))
+
+    def test_elements_available_before_done(self):
+        loader = SVGLoader(TEST_SVG, chunk_size=1024)
+        items = loader.read_chunk()
+        self.assertFalse(loader.done)
+        self.assertIs(items[0][0], loader.root)
+        loader.close()
+
+    def test_deep_document(self):
+        depth = 5000
+        with tempfile.TemporaryDirectory() as directory:
+            svg_path = os.path.join(directory, "deep.svg")
+            with open(svg_path, "w", encoding="utf-8") as file:
+                groups = "".join(f'<g id="g{level}">' for level in range(depth))
+                file.write('<svg xmlns="http://www.w3.org/2000/svg">' + groups + "</g>" * depth + "</svg>")
+            loader = SVGLoader(svg_path)
+            loader.load_all()
+        self.assertEqual(loader.element_count, depth + 1)
+        self.assertEqual(find_element_by_id(loader.root, f"g{depth - 1}").get("id"), f"g{depth - 1}")
+
+    def test_malformed_document(self):
+        with tempfile.TemporaryDirectory() as directory:
+            svg_path = os.path.join(directory, "broken.svg")
+            with open(svg_path, "w", encoding="utf-8") as file:
+                file.write('<svg xmlns="http://www.w3.org/2000/svg"><g>')
+            loader = SVGLoader(svg_path)
+            with self.assertRaises(ET.ParseError):
+                loader.load_all()
+            self.assertTrue(loader.done)
+
+
+if __name__ == "__main__":
+    unittest.main()
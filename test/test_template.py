@@ -0,0 +1,52 @@
+import copy
+import os
+import shutil
+import tempfile
+import unittest
+
+from api.module import apply_quick_edits, set_element
+from utils.svg_parser import serialize_svg
+from utils.template import SVGTemplate, get_template
+
+TEST_SVG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_svg_file.svg")
+
+QUICK_EDITS = [
+    {'ID': 'desc', 'attribute': 'fill', 'type': 'Style', 'value': '#123456'},
+    {'ID': 'tspan273', 'attribute': '{svg}tspan', 'type': 'Element', 'value': '9.9'},
+    {'ID': 'path271', 'attribute': 'rx', 'type': 'Normal', 'value': '42'},
+]
+
+
+class TestTemplate(unittest.TestCase):
+    def test_plan_clone_leaves_template_untouched(self):
+        template = SVGTemplate(TEST_SVG)
+        original = serialize_svg(template.root)
+
+        plan = template.get_plan([(attr['ID'], attr['attribute'], attr['type']) for attr in QUICK_EDITS])
+        clone = template.clone(plan)
+        plan.execute(clone, [attr['value'] for attr in QUICK_EDITS])
+
+        expected = copy.deepcopy(template.root)
+        apply_quick_edits(expected, QUICK_EDITS)
+        self.assertEqual(serialize_svg(clone), serialize_svg(expected))
+        self.assertEqual(serialize_svg(template.root), original)
+        self.assertIs(template.get_plan([(attr['ID'], attr['attribute'], attr['type']) for attr in QUICK_EDITS]), plan)
+
+    def test_template_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            svg_path = os.path.join(directory, "template.svg")
+            shutil.copy(TEST_SVG, svg_path)
+            template = get_template(svg_path)
+            self.assertIs(get_template(svg_path), template)
+
+            report = set_element(svg_path, QUICK_EDITS, 'save')
+            self.assertEqual(report['saved_to'], svg_path)
+            self.assertIsNot(get_template(svg_path), template)
+
+            report = set_element(svg_path, QUICK_EDITS, 'save')
+            self.assertEqual(len(report['unchanged']), len(QUICK_EDITS))
+            self.assertIsNone(report['saved_to'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,75 @@
 # Configuration variables
+import logging
+import os
+import threading
 
 # File paths
-SVG_OUTPUT_PATH = "assets/Test.svg"
 ASSETS_DIR = "assets"
 
+# Inkscape discovery
+INKSCAPE_DISCOVERY_FILE = None      # JSON file of the discovered Inkscape; None for the user's config directory
+INKSCAPE_VERSION_TIMEOUT = 30       # Seconds "inkscape --version" may take when Inkscape is probed
+
+# Inkscape render workers
+INKSCAPE_POOL_SIZE = 2              # Number of long-lived Inkscape processes
+INKSCAPE_JOB_TIMEOUT = 30           # Seconds a single render may take before its worker is restarted
+INKSCAPE_HEALTH_CHECK_INTERVAL = 60  # Idle seconds after which a worker is pinged before reuse
+
+# Bulk PNG export
+BULK_EXPORT_SHARD_SIZE = 250        # Files exported by a single Inkscape process
+BULK_EXPORT_PROCESSES = None        # Inkscape processes run at once; None for the number of CPUs
+
+# Render backend: 'inkscape', 'cairosvg', or 'auto' to render in-process with cairosvg when it is installed
+RENDER_BACKEND = "auto"
+
+# Opening files
+LOAD_CHUNK_SIZE = 256 * 1024        # Bytes parsed per chunk when a file is opened
+LOAD_SLICE_MS = 25                  # Time spent loading between two Tk event-loop iterations
+IMAGE_LINK_CACHE_SIZE = 1024        # Resolved image links kept
+IMAGE_LINK_CHECK_WORKERS = 8        # Linked image files checked for existence at once
+
+# Quick Edits window
+QUICK_EDIT_VISIBLE_ROWS = 15        # Rows shown at once; other rows are shown by scrolling
+
+# Templates
+TEMPLATE_CACHE_SIZE = 8             # Parsed templates kept by the API
+TEMPLATE_PLAN_CACHE_SIZE = 32       # Compiled edit plans kept per template
+
+# Undo
+UNDO_MAX_STEPS = 100                # Undo steps kept for the open document
+
+# Image preview
+PREVIEW_WINDOW_GEOMETRY = "600x600"  # Initial size of the preview window
+PREVIEW_SETTLE_MS = 300             # Delay after the last zoom or resize before a sharp render
+PREVIEW_DEBOUNCE_MS = 150           # Delay after the last edit before the preview is rendered
+PREVIEW_POLL_MS = 30                # Interval at which finished background renders are picked up
+PREVIEW_PYRAMID_MIN_SIZE = 64       # Smallest side of the last level of the zoom pyramid
+PREVIEW_MAX_SIZE = 8000             # Largest width a preview is rendered at
+
+# Logging and profiling
+LOG_LEVEL = os.environ.get("GATORSVG_LOG_LEVEL", "WARNING")  # Lowest level of the messages shown
+PROFILE_REPORT_FILE = os.environ.get("GATORSVG_PROFILE")    # Profile report written at exit; None disables profiling
+TK_STALL_POLL_MS = 50               # Interval at which the Tk event loop is checked for stalls
+TK_STALL_THRESHOLD_MS = 100         # Delay of the event loop recorded as a stall
+
+# Render cache
+RENDER_CACHE_MAX_ENTRIES = 64                   # Renders kept in memory
+RENDER_CACHE_MAX_BYTES = 64 * 1024 * 1024       # Total size of the renders kept in memory
+RENDER_CACHE_DIR = None                         # Directory of the on-disk tier, disabled if None
+RENDER_CACHE_MAX_DISK_BYTES = 512 * 1024 * 1024  # Total size of the on-disk tier
+
 
 class InkscapePath:
     """
     Singleton class representing the path to the Inkscape executable.
+
+    The path is discovered on first use rather than at startup, see utils.inkscape_discovery.
     """
     def __init__(self):
         self.path = None
+        self.info = None
+        self.discovered = False
+        self.lock = threading.Lock()
 
     @staticmethod
     def get_instance():
@@ -26,13 +85,49 @@ class InkscapePath:
 
     def get(self):
         """
-        Get the Inkscape executable path.
+        Get the Inkscape executable path, discovering it on first use.
 
         Returns:
-            str: The Inkscape executable path.
+            str: The Inkscape executable path, or None if Inkscape is not installed.
         """
+        if not self.discovered:
+            with self.lock:
+                if not self.discovered:
+                    self.discover()
         return self.path
 
+    def get_info(self):
+        """
+        Get the version and features of the Inkscape executable.
+
+        Returns:
+            dict: The discovery result (path, version and features), or None if Inkscape is not installed.
+        """
+        path = self.get()
+        if self.info is None and path:
+            from utils.inkscape_discovery import discover_inkscape
+            with self.lock:
+                if self.info is None:
+                    self.info = discover_inkscape(path)
+        return self.info
+
+    def discover(self):
+        """
+        Find Inkscape on the PATH, using the stored discovery result when it is still current.
+
+        Called by get() with the lock held. Other threads see the path before discovered is set.
+        """
+        # Imported here, since the discovery module reads its settings from this module
+        from utils.inkscape_discovery import discover_inkscape
+
+        self.info = discover_inkscape()
+        if self.info is not None:
+            self.path = self.info['path']
+        else:
+            logging.getLogger("gatorsvg").warning("Inkscape was not found. Some Features of the Program will not "
+                                                  "work. Please install Inkscape to make it work.")
+        self.discovered = True
+
     def set(self, new_path):
         """
         Set the Inkscape executable path.
@@ -40,7 +135,10 @@ class InkscapePath:
         Args:
             new_path (str): The new path to set.
         """
-        self.path = new_path
+        with self.lock:
+            self.path = new_path
+            self.info = None
+            self.discovered = True
 
 
 INKSCAPE_PATH = InkscapePath.get_instance()
@@ -0,0 +1,189 @@
+"""
+Undo/redo journal of attribute-level edits.
+
+Each applied edit is recorded as a small (element, kind, name, old value, new value) record
+instead of a snapshot of the document, so undoing and redoing a step only touches the
+elements it changed. Edits made inside group() are recorded as a single step. The number of
+steps kept is bounded, and the journal only records while it is enabled, so that scripted
+edits (the API and batch generation) do not keep references to their documents.
+"""
+from collections import deque
+from contextlib import contextmanager
+
+from app_vars import modification_tracker
+from utils.config import UNDO_MAX_STEPS
+from utils.element_index import element_id_changed
+from utils.style import set_style_property
+
+# Kinds of recorded edits
+EDIT_KIND_ATTRIBUTE = "attribute"
+EDIT_KIND_STYLE = "style"
+EDIT_KIND_TEXT = "text"
+
+
+def apply_edit_value(element, kind, name, value):
+    """
+    Set an attribute, style property or text of an element to a recorded value.
+
+    Args:
+        element (Element): The edited element.
+        kind (str): EDIT_KIND_ATTRIBUTE, EDIT_KIND_STYLE or EDIT_KIND_TEXT.
+        name (str): The qualified attribute or style property name, or None for text.
+        value (str): The value to set. An attribute is removed if the value is None.
+    """
+    if kind == EDIT_KIND_ATTRIBUTE:
+        old_value = element.get(name)
+        if value is None:
+            element.attrib.pop(name, None)
+        else:
+            element.set(name, value)
+        if name == "id":
+            element_id_changed(element, old_value)
+    elif kind == EDIT_KIND_STYLE:
+        set_style_property(element, name, value)
+    else:
+        element.text = value
+
+
+class EditJournal:
+    """
+    Singleton class holding the undo and redo steps of the open document.
+    """
+    def __init__(self, max_steps=UNDO_MAX_STEPS):
+        """
+        Initialize the EditJournal.
+
+        Args:
+            max_steps (int): The number of undo steps kept. The oldest steps are dropped first.
+        """
+        self.enabled = False
+        self.undo_steps = deque(maxlen=max_steps)
+        self.redo_steps = []
+        self.group_records = None
+        self.group_depth = 0
+
+    @staticmethod
+    def get_instance():
+        """
+        Get the singleton instance of EditJournal.
+
+        Returns:
+            EditJournal: The singleton instance of EditJournal.
+        """
+        if not hasattr(EditJournal, '_instance'):
+            EditJournal._instance = EditJournal()
+        return EditJournal._instance
+
+    def enable(self):
+        """
+        Start recording edits.
+        """
+        self.enabled = True
+
+    def clear(self):
+        """
+        Forget every undo and redo step, for example when another document is opened.
+        """
+        self.undo_steps.clear()
+        self.redo_steps.clear()
+
+    def record(self, element, kind, name, old_value, new_value):
+        """
+        Record an edit that has been applied.
+
+        Args:
+            element (Element): The edited element.
+            kind (str): EDIT_KIND_ATTRIBUTE, EDIT_KIND_STYLE or EDIT_KIND_TEXT.
+            name (str): The qualified attribute or style property name, or None for text.
+            old_value (str): The value before the edit.
+            new_value (str): The value after the edit.
+        """
+        if not self.enabled:
+            return
+        edit = (element, kind, name, old_value, new_value)
+        if self.group_records is not None:
+            self.group_records.append(edit)
+        else:
+            self._push((edit,))
+
+    def _push(self, step):
+        """
+        Add a step to the undo steps. A new edit makes the redo steps obsolete.
+
+        Args:
+            step (tuple): The edits of the step, in the order they were applied.
+        """
+        self.undo_steps.append(step)
+        self.redo_steps.clear()
+
+    @contextmanager
+    def group(self):
+        """
+        Record the edits made inside the block as a single undo step.
+
+        Groups can be nested; the edits of nested groups belong to the outermost one.
+        """
+        if self.group_depth == 0:
+            self.group_records = []
+        self.group_depth += 1
+        try:
+            yield
+        finally:
+            self.group_depth -= 1
+            if self.group_depth == 0:
+                records, self.group_records = self.group_records, None
+                if records:
+                    self._push(tuple(records))
+
+    def can_undo(self):
+        """
+        Check if there is a step to undo.
+
+        Returns:
+            bool: True if undo() would change the document, False otherwise.
+        """
+        return bool(self.undo_steps)
+
+    def can_redo(self):
+        """
+        Check if there is a step to redo.
+
+        Returns:
+            bool: True if redo() would change the document, False otherwise.
+        """
+        return bool(self.redo_steps)
+
+    def undo(self):
+        """
+        Revert the last step.
+
+        Returns:
+            tuple: The edits that were reverted, or None if there was nothing to undo.
+        """
+        if not self.undo_steps:
+            return None
+        step = self.undo_steps.pop()
+        for element, kind, name, old_value, _ in reversed(step):
+            apply_edit_value(element, kind, name, old_value)
+        self.redo_steps.append(step)
+        modification_tracker.mark_modified()
+        return step
+
+    def redo(self):
+        """
+        Re-apply the last undone step.
+
+        Returns:
+            tuple: The edits that were re-applied, or None if there was nothing to redo.
+        """
+        if not self.redo_steps:
+            return None
+        step = self.redo_steps.pop()
+        for element, kind, name, _, new_value in step:
+            apply_edit_value(element, kind, name, new_value)
+        self.undo_steps.append(step)
+        modification_tracker.mark_modified()
+        return step
+
+
+EDIT_JOURNAL = EditJournal.get_instance()
@@ -0,0 +1,122 @@
+"""
+Compiled edit plans.
+
+An EditPlan resolves a list of Quick Edit targets (ID, attribute and type) against a template
+once: the ID lookups, namespace prefixes and type names are turned into child-index paths,
+qualified attribute names and type IDs. The plan can then be executed against the template or
+any copy of it with a new value per target, at a cost that depends on the number of edits and
+the depth of the edited elements rather than on the size of the document.
+"""
+from utils.quick_edits import type_name_to_id
+from utils.svg_parser import (EDIT_APPLIED, EDIT_NOT_FOUND, EDIT_UNCHANGED, apply_svg_attribute, find_element_by_id,
+                              qualify_attribute_name)
+
+
+def element_paths(root, elements):
+    """
+    Get the child-index paths of elements of a document in a single walk of the tree.
+
+    Args:
+        root (Element): The root element of the document.
+        elements (iterable): The elements to locate.
+
+    Returns:
+        dict: The path of each element that was found, as a tuple of child indexes from the root.
+    """
+    wanted = set(elements)
+    paths = {}
+    stack = [(root, ())]
+    while stack and len(paths) < len(wanted):
+        element, path = stack.pop()
+        if element in wanted:
+            paths[element] = path
+        stack.extend((child, path + (index,)) for index, child in enumerate(element))
+    return paths
+
+
+class EditPlan:
+    """
+    A list of Quick Edit targets resolved against a template.
+    """
+    def __init__(self, root, targets):
+        """
+        Compile the targets against a template.
+
+        Args:
+            root (Element): The root element of the template.
+            targets (list): The ID, attribute name and type name ('Normal', 'Style' or 'Element')
+                of each edit.
+
+        Raises:
+            ValueError: If a type name is not a Quick Edit type.
+        """
+        self.root = root
+        self.targets = [tuple(target) for target in targets]
+
+        elements = [find_element_by_id(root, element_id) for element_id, _, _ in self.targets]
+        paths = element_paths(root, [element for element in elements if element is not None])
+
+        # One step per target: the element, its path, the qualified attribute name and the type ID
+        self.steps = []
+        for (element_id, attribute_name, type_name), element in zip(self.targets, elements):
+            path = paths.get(element) if element is not None else None
+            self.steps.append((element, path, qualify_attribute_name(attribute_name), type_name_to_id(type_name)))
+
+    def __len__(self):
+        """
+        Get the number of edits of the plan.
+
+        Returns:
+            int: The number of targets.
+        """
+        return len(self.steps)
+
+    def resolve(self, root, path):
+        """
+        Find the element at a child-index path of a copy of the template.
+
+        Args:
+            root (Element): The root element of the copy.
+            path (tuple): The child indexes leading from the root to the element.
+
+        Returns:
+            Element: The element, or None if the copy does not have it.
+        """
+        element = root
+        try:
+            for index in path:
+                element = element[index]
+        except IndexError:
+            return None
+        return element
+
+    def execute(self, root, values):
+        """
+        Apply the plan with one value per target.
+
+        Args:
+            root (Element): The root element of the template the plan was compiled against,
+                or of an unmodified copy of it.
+            values (list): The new value of each target, in target order.
+
+        Returns:
+            dict: A report with the 'applied', 'unchanged' and 'not_found' edits, as Quick Edit
+                dictionaries.
+
+        Raises:
+            ValueError: If the number of values does not match the number of targets.
+        """
+        if len(values) != len(self.steps):
+            raise ValueError(f"Expected {len(self.steps)} values, got {len(values)}")
+
+        report = {EDIT_APPLIED: [], EDIT_UNCHANGED: [], EDIT_NOT_FOUND: []}
+        for (element_id, attribute_name, type_name), (element, path, name, type_id), value in zip(
+                self.targets, self.steps, values):
+            if path is None:
+                status = EDIT_NOT_FOUND
+            else:
+                if root is not self.root:
+                    element = self.resolve(root, path)
+                status = apply_svg_attribute(element, name, type_id, value)
+            report[status].append({'ID': element_id, 'attribute': attribute_name, 'type': type_name, 'value': value})
+        return report
@@ -0,0 +1,153 @@
+import weakref
+
+
+class ElementIndex:
+    """
+    Document-level index mapping element IDs to their elements.
+
+    The index is built once when the document is parsed and is kept up to date by the
+    add, remove and rename helpers, so that ID lookups do not have to walk the whole tree.
+    """
+    def __init__(self, root):
+        """
+        Initialize the ElementIndex and index every element of the document.
+
+        Args:
+            root (Element): The root element of the document.
+        """
+        self.root = root
+        self.elements = {}
+        self.stale = False
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Rebuild the index from scratch by walking the whole document.
+        """
+        self.elements.clear()
+        self.stale = False
+        self.add(self.root)
+
+    def add(self, element):
+        """
+        Index an element and all of its descendants.
+
+        The first element in document order wins when IDs are duplicated, matching the
+        behaviour of ElementTree's find().
+
+        Args:
+            element (Element): The element (or subtree) that was added to the document.
+        """
+        for node in element.iter():
+            element_id = node.get("id")
+            if element_id is not None and element_id not in self.elements:
+                self.elements[element_id] = node
+
+    def add_one(self, element):
+        """
+        Index a single element, without its descendants.
+
+        Used while a document is parsed, where every element is added on its own start event.
+
+        Args:
+            element (Element): The element that was added to the document.
+        """
+        element_id = element.get("id")
+        if element_id is not None and element_id not in self.elements:
+            self.elements[element_id] = element
+
+    def remove(self, element):
+        """
+        Remove an element and all of its descendants from the index.
+
+        Args:
+            element (Element): The element (or subtree) that was removed from the document.
+        """
+        for node in element.iter():
+            element_id = node.get("id")
+            if element_id is not None and self.elements.get(element_id) is node:
+                del self.elements[element_id]
+
+    def rename(self, element, old_id):
+        """
+        Update the index after the ID of an element has changed.
+
+        Args:
+            element (Element): The element whose ID changed.
+            old_id (str): The previous ID of the element, or None if it had none.
+        """
+        if old_id is not None and self.elements.get(old_id) is element:
+            del self.elements[old_id]
+        new_id = element.get("id")
+        if new_id is not None:
+            self.elements.setdefault(new_id, element)
+
+    def get(self, element_id):
+        """
+        Get the element with the given ID.
+
+        If the indexed element no longer carries the requested ID, or the ID is missing
+        while the index is marked stale, the index is rebuilt once.
+
+        Args:
+            element_id (str): The ID of the element.
+
+        Returns:
+            Element: The element with the given ID, or None if it does not exist.
+        """
+        element = self.elements.get(element_id)
+        if (element is None and self.stale) or (element is not None and element.get("id") != element_id):
+            self.rebuild()
+            element = self.elements.get(element_id)
+        return element
+
+    def __len__(self):
+        return len(self.elements)
+
+
+_indexes = weakref.WeakKeyDictionary()
+
+
+def get_element_index(root):
+    """
+    Get the ElementIndex of a document, building it on first use.
+
+    Args:
+        root (Element): The root element of the document.
+
+    Returns:
+        ElementIndex: The index of the document.
+    """
+    index = _indexes.get(root)
+    if index is None:
+        index = ElementIndex(root)
+        _indexes[root] = index
+    return index
+
+
+def drop_element_index(root):
+    """
+    Forget the index of a document.
+
+    Args:
+        root (Element): The root element of the document.
+    """
+    _indexes.pop(root, None)
+
+
+def element_id_changed(element, old_id):
+    """
+    Update every live index after the ID of an element has changed.
+
+    Indexes that contain the element under its old ID are updated in place. The others are
+    marked stale, since the element may belong to them without having been indexed before.
+
+    Args:
+        element (Element): The element whose ID changed.
+        old_id (str): The previous ID of the element, or None if it had none.
+    """
+    for index in list(_indexes.values()):
+        if old_id is not None and index.elements.get(old_id) is element:
+            index.rename(element, old_id)
+        else:
+            index.stale = True
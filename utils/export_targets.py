@@ -0,0 +1,300 @@
+"""
+Export of one SVG document to several sizes and formats from a single render.
+
+The targets are a declarative list of dictionaries, for example:
+
+    [{'path': "card.png"},
+     {'path': "card@2x.png", 'scale': 2},
+     {'path': "card@3x.png", 'scale': 3},
+     {'path': "thumb.webp", 'width': 256, 'quality': 80}]
+
+The document is rendered once, at the largest requested size. Every other target is
+downscaled from that render with a Lanczos filter and encoded in a thread pool, so the cost of
+rasterizing is paid once per document however many targets there are. A target that has the
+size of the render and is a PNG is written as rendered, without decoding and re-encoding it.
+"""
+import os
+import re
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from utils.config import RENDER_BACKEND
+from utils.file_helper import atomic_open
+from utils.image_helper import render_options, render_png_data
+from utils.svg_parser import resource_path
+
+# Pixels per unit of the SVG length units, at the 96 DPI Inkscape exports at by default
+UNIT_PIXELS = {'': 1.0, 'px': 1.0, 'in': 96.0, 'cm': 96.0 / 2.54, 'mm': 96.0 / 25.4, 'pt': 96.0 / 72.0, 'pc': 16.0}
+
+# Pillow format names of the file extensions
+FORMAT_EXTENSIONS = {'.png': "PNG", '.webp': "WEBP", '.jpg': "JPEG", '.jpeg': "JPEG"}
+
+
+def parse_length(value):
+    """
+    Convert an SVG length, such as "210mm" or "800", to pixels.
+
+    Args:
+        value (str): The length.
+
+    Returns:
+        float: The length in pixels, or None if it is missing, relative (e.g. "100%") or invalid.
+    """
+    match = re.fullmatch(r"\s*([0-9.]+(?:[eE][-+]?[0-9]+)?)\s*([a-z]*)\s*", value or "")
+    if match is None or match.group(2) not in UNIT_PIXELS:
+        return None
+    try:
+        return float(match.group(1)) * UNIT_PIXELS[match.group(2)]
+    except ValueError:
+        return None
+
+
+def document_size(svg_bytes):
+    """
+    Get the size of a document in pixels at 96 DPI, reading only its root element.
+
+    Args:
+        svg_bytes (bytes): The serialized SVG document.
+
+    Returns:
+        tuple: The width and height in pixels, or None if the document does not define its size.
+    """
+    parser = ET.XMLPullParser(events=("start",))
+    root = None
+    try:
+        for offset in range(0, len(svg_bytes), 4096):
+            parser.feed(svg_bytes[offset:offset + 4096])
+            for _, root in parser.read_events():
+                break
+            if root is not None:
+                break
+    except ET.ParseError:
+        return None
+    if root is None:
+        return None
+
+    width, height = parse_length(root.get("width")), parse_length(root.get("height"))
+    view_box = (root.get("viewBox") or "").replace(",", " ").split()
+    if len(view_box) == 4:
+        try:
+            box_width, box_height = float(view_box[2]), float(view_box[3])
+        except ValueError:
+            box_width = box_height = 0
+        if box_width > 0 and box_height > 0:
+            # A missing or relative dimension follows the aspect ratio of the view box
+            if width is None and height is None:
+                width, height = box_width, box_height
+            elif width is None:
+                width = height * box_width / box_height
+            elif height is None:
+                height = width * box_height / box_width
+    if not width or not height:
+        return None
+    return width, height
+
+
+def target_format(target):
+    """
+    Get the image format of a target, from its 'format' or the extension of its path.
+
+    Args:
+        target (dict): The target.
+
+    Returns:
+        str: The Pillow format name, such as "PNG" or "WEBP".
+
+    Raises:
+        ValueError: If the format cannot be determined.
+    """
+    if target.get('format'):
+        return target['format'].upper()
+    extension = os.path.splitext(target['path'])[1].lower()
+    if extension not in FORMAT_EXTENSIONS:
+        raise ValueError(f"Unknown image format of {target['path']}")
+    return FORMAT_EXTENSIONS[extension]
+
+
+def target_size(target, base_size):
+    """
+    Get the pixel size of a target.
+
+    Args:
+        target (dict): The target, with a 'scale', a 'width', a 'height', or both a width and a height.
+            A target without any of them has the size of the document.
+        base_size (tuple): The width and height of the document in pixels, or None if unknown.
+
+    Returns:
+        tuple: The width and height of the target in pixels.
+
+    Raises:
+        ValueError: If the size depends on a document size that is unknown.
+    """
+    width, height = target.get('width'), target.get('height')
+    if width and height:
+        return int(width), int(height)
+    if base_size is None:
+        raise ValueError(f"The document does not define its size; give {target['path']} a width and height")
+
+    base_width, base_height = base_size
+    if width:
+        return int(width), max(1, round(int(width) * base_height / base_width))
+    if height:
+        return max(1, round(int(height) * base_width / base_height)), int(height)
+    scale = float(target.get('scale', 1))
+    return max(1, round(base_width * scale)), max(1, round(base_height * scale))
+
+
+def encode_target(image, png_data, target, size, image_format):
+    """
+    Resize the render to the size of a target and write it in the target's format.
+
+    Args:
+        image (Image): The decoded render.
+        png_data (bytes): The PNG data of the render.
+        target (dict): The target, with its 'path' and optional 'quality'.
+        size (tuple): The width and height of the target in pixels.
+        image_format (str): The Pillow format name of the target.
+    """
+    if size == image.size and image_format == "PNG":
+        data = png_data
+    else:
+        from PIL import Image
+
+        if size != image.size:
+            # reducing_gap first shrinks by an integer factor, which is much faster for large reductions
+            image = image.resize(size, Image.LANCZOS, reducing_gap=3.0)
+        if image_format == "JPEG" and image.mode != "RGB":
+            # JPEG has no transparency: flatten onto white
+            background = Image.new("RGB", image.size, "white")
+            background.paste(image, mask=image.convert("RGBA").getchannel("A"))
+            image = background
+
+        options = {'quality': target['quality']} if 'quality' in target else {}
+        output = BytesIO()
+        image.save(output, image_format, **options)
+        data = output.getvalue()
+
+    with atomic_open(target['path'], "wb") as file:
+        file.write(data)
+
+
+def export_targets_data(svg_bytes, targets, svg_path=None, background=None, backend=RENDER_BACKEND):
+    """
+    Export an SVG document to several images with a single render.
+
+    Args:
+        svg_bytes (bytes): The serialized SVG document.
+        targets (list): Dictionaries describing the images, each with a 'path' and optionally a
+            'scale', 'width', 'height', 'format' and 'quality'.
+        svg_path (str, optional): The file the document was read from, or None for an in-memory document.
+        background (str, optional): The background color, such as "#ffffff".
+        backend (str, optional): The render backend: 'inkscape', 'cairosvg' or 'auto'.
+
+    Returns:
+        list: One result dictionary per target, in target order, with the 'path' and 'size' of
+            the image and its 'error' (None if it was written).
+
+    Raises:
+        ValueError: If a target has no known size or format.
+        Exception: If the render fails.
+    """
+    if not targets:
+        return []
+    base_size = document_size(svg_bytes)
+    sizes = [target_size(target, base_size) for target in targets]
+    formats = [target_format(target) for target in targets]
+
+    # Render once, at the document's aspect ratio and large enough for every target
+    if base_size is not None:
+        scale = max(max(width / base_size[0], height / base_size[1]) for width, height in sizes)
+        render_size = (max(1, round(base_size[0] * scale)), max(1, round(base_size[1] * scale)))
+    else:
+        render_size = (max(width for width, _ in sizes), max(height for _, height in sizes))
+    png_data = render_png_data(svg_bytes, svg_path, render_options(width=render_size[0], height=render_size[1],
+                                                                   background=background), backend=backend)
+
+    from PIL import Image
+
+    image = Image.open(BytesIO(png_data))
+    image.load()
+
+    def export(index):
+        """
+        Write one target, recording its error instead of failing the other targets.
+
+        Args:
+            index (int): The position of the target.
+
+        Returns:
+            dict: The result of the target.
+        """
+        result = {'path': targets[index]['path'], 'size': sizes[index], 'error': None}
+        try:
+            encode_target(image, png_data, targets[index], sizes[index], formats[index])
+        except Exception as e:
+            result['error'] = str(e) or type(e).__name__
+        return result
+
+    with ThreadPoolExecutor(max_workers=min(len(targets), os.cpu_count() or 1)) as executor:
+        return list(executor.map(export, range(len(targets))))
+
+
+def export_targets(svg_path, targets, background=None, backend=RENDER_BACKEND):
+    """
+    Export an SVG file to several images with a single render.
+
+    Args:
+        svg_path (str): The path to the SVG file.
+        targets (list): Dictionaries describing the images, each with a 'path' and optionally a
+            'scale', 'width', 'height', 'format' and 'quality'.
+        background (str, optional): The background color, such as "#ffffff".
+        backend (str, optional): The render backend: 'inkscape', 'cairosvg' or 'auto'.
+
+    Returns:
+        list: One result dictionary per target, in target order, with the 'path' and 'size' of
+            the image and its 'error' (None if it was written).
+
+    Raises:
+        ValueError: If a target has no known size or format.
+        Exception: If the file cannot be read or the render fails.
+    """
+    svg_path = resource_path(svg_path)
+    with open(svg_path, "rb") as file:
+        svg_bytes = file.read()
+    return export_targets_data(svg_bytes, targets, svg_path, background, backend)
+
+
+def parse_target(spec):
+    """
+    Parse a target given on the command line as PATH or PATH=SIZE.
+
+    SIZE is a scale such as "2x", a width such as "256w", a height such as "256h", or a width
+    and height such as "800x600".
+
+    Args:
+        spec (str): The target specification, such as "card@2x.png=2x".
+
+    Returns:
+        dict: The target.
+
+    Raises:
+        ValueError: If the size cannot be parsed.
+    """
+    path, separator, size = spec.rpartition("=")
+    if not separator:
+        return {'path': spec}
+    target = {'path': path}
+    match = re.fullmatch(r"(?:([0-9.]+)x|([0-9]+)w|([0-9]+)h|([0-9]+)x([0-9]+))", size.strip())
+    if match is None:
+        raise ValueError(f"Invalid size '{size}', expected e.g. 2x, 256w, 256h or 800x600")
+    scale, width, height, both_width, both_height = match.groups()
+    if scale:
+        target['scale'] = float(scale)
+    elif width:
+        target['width'] = int(width)
+    elif height:
+        target['height'] = int(height)
+    else:
+        target['width'], target['height'] = int(both_width), int(both_height)
+    return target
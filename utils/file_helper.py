@@ -0,0 +1,78 @@
+"""
+Helpers for writing files safely.
+"""
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+
+
+def _read_umask():
+    """
+    Get the umask of the process.
+
+    The umask can only be read by setting it, so it is read once, at import, before any thread
+    writes files.
+
+    Returns:
+        int: The umask.
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# The default permissions of a new file
+DEFAULT_FILE_MODE = 0o666 & ~_read_umask()
+
+
+@contextmanager
+def atomic_open(path, mode="w", encoding=None):
+    """
+    Open a file for writing so that it is replaced in one step when writing succeeds.
+
+    The data is written to a temporary file in the same directory, which is moved over the
+    target with os.replace once the block exits without an error. If writing fails, the
+    temporary file is removed and the target is left untouched. The permissions of an
+    existing target are kept.
+
+    Args:
+        path (str): The path of the file to write.
+        mode (str): The mode to open the temporary file with, "w" or "wb".
+        encoding (str, optional): The encoding of a file opened in text mode.
+
+    Yields:
+        file: The open temporary file.
+    """
+    path = os.path.realpath(path)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix="." + os.path.basename(path) + ".",
+                                     suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(temp_path, _file_mode(path))
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _file_mode(path):
+    """
+    Get the permissions a rewritten file should have.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        int: The permissions of the existing file, or the default permissions of a new file.
+    """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return DEFAULT_FILE_MODE
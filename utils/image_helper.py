@@ -1,40 +1,163 @@
+import os
 import subprocess
 
 from io import BytesIO
-from PIL import Image
-from utils.config import INKSCAPE_PATH
+from utils.config import RENDER_BACKEND
+from utils.image_links import linked_file_signatures
+from utils.instrumentation import INSTRUMENTATION, LOGGER
+from utils.render_backends import get_render_backend
+from utils.render_cache import RENDER_CACHE, render_cache_key
 from utils.svg_parser import resource_path
 
 
-def convert_svg_to_png(load_file_path):
+def convert_svg_to_png(load_file_path, dpi=None, width=None, height=None, background=None, cancel_event=None,
+                       backend=RENDER_BACKEND):
     """
     Convert an SVG file to a PNG image.
 
+    Renders are cached by the content of the SVG file and the render parameters, so an
+    unchanged document is only rendered once.
+
     Args:
         load_file_path (str): The file path of the SVG file to be converted.
+        dpi (float, optional): The resolution of the PNG.
+        width (int, optional): The width of the PNG in pixels.
+        height (int, optional): The height of the PNG in pixels.
+        background (str, optional): The background color of the PNG, such as "#ffffff".
+        cancel_event (threading.Event, optional): Stops the conversion when set.
+        backend (str, optional): The render backend: 'inkscape' for full fidelity, 'cairosvg' for a fast
+            in-process render, or 'auto' to use cairosvg when it is installed.
+
+    Returns:
+        Image: A Pillow image object representing the converted PNG.
+            Returns None if the conversion process encounters an error or is cancelled.
+    """
+    try:
+        svg_path = resource_path(load_file_path)
+        with open(svg_path, "rb") as file:
+            svg_bytes = file.read()
+    except OSError as e:
+        LOGGER.error("Error: %s", e)
+        return None
+
+    return render_png(svg_bytes, svg_path, render_options(dpi, width, height, background), cancel_event, backend)
+
+
+def convert_svg_data_to_png(svg_bytes, dpi=None, width=None, height=None, background=None, cancel_event=None,
+                            backend=RENDER_BACKEND):
+    """
+    Convert an in-memory SVG document to a PNG image, without writing it to a file first.
+
+    Image links in the document should be absolute, since there is no file to resolve relative
+    links against.
+
+    Args:
+        svg_bytes (bytes): The serialized SVG document.
+        dpi (float, optional): The resolution of the PNG.
+        width (int, optional): The width of the PNG in pixels.
+        height (int, optional): The height of the PNG in pixels.
+        background (str, optional): The background color of the PNG, such as "#ffffff".
+        cancel_event (threading.Event, optional): Stops the conversion when set.
+        backend (str, optional): The render backend: 'inkscape' for full fidelity, 'cairosvg' for a fast
+            in-process render, or 'auto' to use cairosvg when it is installed.
 
     Returns:
         Image: A Pillow image object representing the converted PNG.
-            Returns None if the conversion process encounters an error.
+            Returns None if the conversion process encounters an error or is cancelled.
+    """
+    return render_png(svg_bytes, None, render_options(dpi, width, height, background), cancel_event, backend)
+
+
+def render_png(svg_bytes, svg_path, export_options, cancel_event=None, backend=RENDER_BACKEND):
+    """
+    Render an SVG document to a PNG image through the render cache.
+
+    Args:
+        svg_bytes (bytes): The serialized SVG document.
+        svg_path (str): The file the document was read from, or None for an in-memory document.
+        export_options (dict): The Inkscape export options, as returned by render_options.
+        cancel_event (threading.Event, optional): Stops the conversion when set.
+        backend (str, optional): The name of the render backend, or 'auto'.
+
+    Returns:
+        Image: A Pillow image object representing the converted PNG, or None on error or cancellation.
     """
     try:
-        # Run Inkscape command to convert SVG to PNG and capture the output
-        result = subprocess.run(
-            [INKSCAPE_PATH.get(), '--export-type=png', '--export-filename=-',
-             resource_path(load_file_path)], capture_output=True, check=True)
+        png_data = render_png_data(svg_bytes, svg_path, export_options, cancel_event, backend)
+
+        # Pillow is only needed once an image is decoded, so it is not imported by headless commands
+        from PIL import Image
 
         # Create a Pillow image from the PNG data
-        image = Image.open(BytesIO(result.stdout))
+        image = Image.open(BytesIO(png_data))
 
         return image
     except subprocess.CalledProcessError as e:
-        print(f"Error running Inkscape: {e}")
+        LOGGER.error("Error running Inkscape: %s", e)
         return None
     except Exception as e:
-        print(f"Error: {e}")
+        if cancel_event is None or not cancel_event.is_set():
+            LOGGER.error("Error: %s", e)
         return None
 
 
+def render_png_data(svg_bytes, svg_path, export_options, cancel_event=None, backend=RENDER_BACKEND):
+    """
+    Render an SVG document to PNG data through the render cache.
+
+    Args:
+        svg_bytes (bytes): The serialized SVG document.
+        svg_path (str): The file the document was read from, or None for an in-memory document.
+        export_options (dict): The Inkscape export options, as returned by render_options.
+        cancel_event (threading.Event, optional): Stops the conversion when set.
+        backend (str, optional): The name of the render backend, or 'auto'.
+
+    Returns:
+        bytes: The PNG data.
+
+    Raises:
+        subprocess.CalledProcessError: If Inkscape fails.
+        RenderCancelled: If the render is cancelled.
+        Exception: If the backend fails otherwise.
+    """
+    render_backend = get_render_backend(backend)
+
+    # Relative image links resolve against the directory of the file, so it is part of the key,
+    # and so is the version of every linked file, so that editing a linked image invalidates the render
+    directory = os.path.dirname(os.path.abspath(svg_path)) if svg_path else None
+    cache_key = render_cache_key(svg_bytes, backend=render_backend.name, directory=directory,
+                                 linked_files=linked_file_signatures(svg_bytes, directory or os.getcwd()),
+                                 **export_options)
+    png_data = RENDER_CACHE.get(cache_key)
+
+    if png_data is None:
+        INSTRUMENTATION.count("render_cache.miss")
+        with INSTRUMENTATION.span("render"):
+            png_data = render_backend.render(svg_bytes, svg_path, export_options, cancel_event)
+        RENDER_CACHE.put(cache_key, png_data)
+    else:
+        INSTRUMENTATION.count("render_cache.hit")
+
+    return png_data
+
+
+def render_options(dpi=None, width=None, height=None, background=None):
+    """
+    Get the Inkscape export options for the given render parameters.
+
+    Args:
+        dpi (float, optional): The resolution of the PNG.
+        width (int, optional): The width of the PNG in pixels.
+        height (int, optional): The height of the PNG in pixels.
+        background (str, optional): The background color of the PNG.
+
+    Returns:
+        dict: The export options that are set, keyed by Inkscape option name (e.g. "export-dpi").
+    """
+    options = {"export-dpi": dpi, "export-width": width, "export-height": height, "export-background": background}
+    return {option: value for option, value in options.items() if value is not None}
+
+
 def save_png_to_file(image, save_file_path):
     """
     Save a Pillow image to a PNG file.
@@ -51,8 +174,8 @@ def save_png_to_file(image, save_file_path):
             # Save the image to the specified output file path
             image.save(save_file_path)
 
-            print(f"Image saved to {save_file_path}")
+            LOGGER.info("Image saved to %s", save_file_path)
         else:
-            print("Image conversion failed. Cannot save.")
+            LOGGER.error("Image conversion failed. Cannot save.")
     except Exception as e:
-        print(f"Error: {e}")
+        LOGGER.error("Error: %s", e)
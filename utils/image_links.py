@@ -0,0 +1,207 @@
+"""
+Resolution of the image links of a document and validation of the linked files.
+
+Inkscape links images by the path of the image file, often relative to the SVG file. When a
+document is opened, ImageLinkResolver makes every relative link absolute on the element that
+holds it, once, and checks in a thread pool whether the linked files exist, so that opening a
+document with many images does not wait for the file system. The missing links are reported
+once all checks have finished.
+"""
+import functools
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote
+from xml.sax.saxutils import unescape
+
+from utils.config import IMAGE_LINK_CACHE_SIZE, IMAGE_LINK_CHECK_WORKERS
+
+# A URL scheme such as "file:", "data:" or "https:". Single letters are Windows drives, not schemes.
+URL_SCHEME = re.compile(r"[A-Za-z][A-Za-z0-9+.-]+:")
+WINDOWS_DRIVE = re.compile(r"[A-Za-z]:")
+
+# An href attribute in serialized SVG, with or without a namespace prefix
+HREF_ATTRIBUTE = re.compile(rb"""(?<![\w-])(?:[\w-]+:)?href\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+
+
+def is_image_link(attr, value):
+    """
+    Check if an attribute links to an image file rather than to an element of the document.
+
+    Args:
+        attr (str): The name of the attribute.
+        value (str): The value of the attribute.
+
+    Returns:
+        bool: True if the attribute is an href that does not point into the document.
+    """
+    return "href" in attr and "#" not in value and not value.startswith("data:")
+
+
+@functools.lru_cache(maxsize=IMAGE_LINK_CACHE_SIZE)
+def resolve_image_link(link, svg_dir):
+    """
+    Make an image link absolute.
+
+    Args:
+        link (str): The link, as found in the document.
+        svg_dir (str): The absolute directory of the SVG file, which relative links start from.
+
+    Returns:
+        str: A file URL for a relative path; URLs and absolute paths are returned unchanged.
+    """
+    link = link.strip()
+    if URL_SCHEME.match(link) or os.path.isabs(link):
+        return link
+    return "file:///" + os.path.abspath(os.path.join(svg_dir, link))
+
+
+def resolve_document_links(root, svg_path):
+    """
+    Make every relative image link of a document absolute, without checking the linked files.
+
+    Used before a document is written to another directory, where its relative links would break.
+
+    Args:
+        root (Element): The root element of the document.
+        svg_path (str): The path to the SVG file the links are relative to.
+    """
+    svg_dir = os.path.dirname(os.path.abspath(svg_path))
+    for element in root.iter():
+        for attr, value in element.items():
+            if is_image_link(attr, value):
+                link = resolve_image_link(value, svg_dir)
+                if link != value:
+                    element.set(attr, link)
+
+
+def link_file_path(link):
+    """
+    Get the local file an image link points to.
+
+    Args:
+        link (str): A resolved link, as returned by resolve_image_link.
+
+    Returns:
+        str: The path of the linked file, or None if the link is not a local file.
+    """
+    if link.startswith("file:"):
+        path = unquote(link[len("file:"):]).lstrip("/")
+        return path if WINDOWS_DRIVE.match(path) else "/" + path
+    if URL_SCHEME.match(link):
+        return None
+    return link
+
+
+def linked_file_signatures(svg_bytes, svg_dir):
+    """
+    Get the modification time and size of every local file linked by a serialized document.
+
+    The links are found by scanning the bytes, without parsing the document.
+
+    Args:
+        svg_bytes (bytes): The serialized SVG document.
+        svg_dir (str): The absolute directory relative links start from.
+
+    Returns:
+        tuple: The path, modification time in nanoseconds and size of each linked file, in
+            document order; the time and size are None for a missing file.
+    """
+    signatures = []
+    for match in HREF_ATTRIBUTE.finditer(svg_bytes):
+        value = unescape((match.group(1) or match.group(2) or b"").decode("utf-8", "replace"),
+                         {'&quot;': '"', '&apos;': "'"})
+        if not is_image_link("href", value):
+            continue
+        path = link_file_path(resolve_image_link(value, svg_dir))
+        if path is None:
+            continue
+        try:
+            stat = os.stat(path)
+            signatures.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signatures.append((path, None, None))
+    return tuple(signatures)
+
+
+class ImageLinkResolver:
+    """
+    Resolves the image links of one document and checks that the linked files exist.
+    """
+    def __init__(self, svg_path, max_workers=IMAGE_LINK_CHECK_WORKERS):
+        """
+        Initialize the ImageLinkResolver.
+
+        Args:
+            svg_path (str): The path to the SVG file the links are relative to.
+            max_workers (int): The number of files checked at once.
+        """
+        self.svg_dir = os.path.dirname(os.path.abspath(svg_path))
+        self.max_workers = max_workers
+        self.executor = None
+        self.links = []  # (element, attribute, link) of every image link
+        self.checks = {}  # Future of the existence check, by file path
+
+    def resolve(self, element):
+        """
+        Make the image links of an element absolute and start checking the linked files.
+
+        Args:
+            element (Element): The XML element.
+        """
+        for attr, value in element.items():
+            if not is_image_link(attr, value):
+                continue
+            link = resolve_image_link(value, self.svg_dir)
+            if link != value:
+                element.set(attr, link)
+            self.links.append((element, attr, link))
+
+            path = link_file_path(link)
+            if path is not None and path not in self.checks:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                       thread_name_prefix="image-links")
+                self.checks[path] = self.executor.submit(os.path.isfile, path)
+
+    def resolve_all(self, root):
+        """
+        Resolve the image links of every element of a document.
+
+        Args:
+            root (Element): The root element of the document.
+        """
+        for element in root.iter():
+            self.resolve(element)
+
+    def done(self):
+        """
+        Check if every linked file has been checked.
+
+        Returns:
+            bool: True if the missing links can be reported without waiting.
+        """
+        return all(future.done() for future in self.checks.values())
+
+    def missing_links(self):
+        """
+        Wait for the checks and list the links whose file does not exist.
+
+        Returns:
+            list: One dictionary per missing link, in document order, with the 'id' of the
+                element, the 'attribute', the 'link' and the 'path' of the missing file.
+        """
+        missing = []
+        for element, attr, link in self.links:
+            path = link_file_path(link)
+            if path is not None and not self.checks[path].result():
+                missing.append({'id': element.get("id"), 'attribute': attr, 'link': link, 'path': path})
+        return missing
+
+    def close(self):
+        """
+        Stop the checks that have not started.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
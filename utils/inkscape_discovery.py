@@ -0,0 +1,200 @@
+"""
+Lazy, cached discovery of the Inkscape executable.
+
+Finding the executable only looks it up on the PATH. Learning its version means starting
+Inkscape, which is slow, so the path, version and supported command-line features are stored
+in a small JSON file in the user's configuration directory. The stored result is reused for as
+long as the executable's modification time and size are unchanged.
+"""
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+
+from utils.config import INKSCAPE_DISCOVERY_FILE, INKSCAPE_VERSION_TIMEOUT
+from utils.file_helper import atomic_open
+from utils.instrumentation import LOGGER
+
+INKSCAPE_NAMES = ("inkscape", "inkscape.exe", "inkscape.com")
+
+_lock = threading.Lock()
+
+
+def user_config_dir():
+    """
+    Get the directory GatorSVG stores its per-user settings in.
+
+    Returns:
+        str: The platform's configuration directory for GatorSVG.
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "GatorSVG")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Application Support/GatorSVG")
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return os.path.join(base, "gatorsvg")
+
+
+def discovery_file():
+    """
+    Get the path of the file the discovery result is stored in.
+
+    Returns:
+        str: The path of the JSON file.
+    """
+    return INKSCAPE_DISCOVERY_FILE or os.path.join(user_config_dir(), "inkscape.json")
+
+
+def find_inkscape_executable():
+    """
+    Look up the Inkscape executable on the PATH, without starting it.
+
+    Returns:
+        str: The absolute path of the executable, or None if it is not on the PATH.
+    """
+    for name in INKSCAPE_NAMES:
+        path = shutil.which(name)
+        if path:
+            return os.path.abspath(path)
+    return None
+
+
+def parse_version(output):
+    """
+    Parse the output of "inkscape --version".
+
+    Args:
+        output (str): The output, such as "Inkscape 1.3.2 (091e20e, 2023-11-25)".
+
+    Returns:
+        str: The version number, or None if it cannot be found.
+    """
+    match = re.search(r"Inkscape\s+(\d+(?:\.\d+)*)", output)
+    return match.group(1) if match else None
+
+
+def version_features(version):
+    """
+    Get the command-line features of an Inkscape version.
+
+    Args:
+        version (str): The version number, or None if unknown.
+
+    Returns:
+        dict: Whether the version supports shell mode with actions.
+    """
+    major = int(version.split(".")[0]) if version else 0
+    return {'shell_actions': major >= 1}
+
+
+def probe_inkscape(path):
+    """
+    Start Inkscape to learn its version and features.
+
+    Args:
+        path (str): The path of the executable.
+
+    Returns:
+        dict: The path, modification time, size, version and features of the executable. The
+            version is None if Inkscape did not answer.
+    """
+    stat = os.stat(path)
+    try:
+        result = subprocess.run([path, "--version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                timeout=INKSCAPE_VERSION_TIMEOUT)
+        version = parse_version(result.stdout.decode("utf-8", "replace"))
+    except (OSError, subprocess.TimeoutExpired) as e:
+        LOGGER.error("Error running Inkscape: %s", e)
+        version = None
+    return {
+        'path': path,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'version': version,
+        'features': version_features(version),
+    }
+
+
+def read_cached_info():
+    """
+    Read the stored discovery result.
+
+    Returns:
+        dict: The stored result, or None if there is none or it cannot be read.
+    """
+    try:
+        with open(discovery_file(), "r", encoding="utf-8") as file:
+            info = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return info if isinstance(info, dict) else None
+
+
+def write_cached_info(info):
+    """
+    Store a discovery result. Failing to store it only costs a probe on the next launch.
+
+    Args:
+        info (dict): The discovery result.
+    """
+    path = discovery_file()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with atomic_open(path, "w", encoding="utf-8") as file:
+            json.dump(info, file, indent=2)
+    except OSError as e:
+        LOGGER.warning("Error saving Inkscape discovery: %s", e)
+
+
+def is_current(info, path):
+    """
+    Check if a stored discovery result still describes an executable.
+
+    Args:
+        info (dict): The stored result.
+        path (str): The path of the executable.
+
+    Returns:
+        bool: True if the result is for this path and the file has not changed since.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return (info.get('path') == path and info.get('mtime_ns') == stat.st_mtime_ns
+            and info.get('size') == stat.st_size)
+
+
+def discover_inkscape(path=None):
+    """
+    Get the path, version and features of Inkscape, probing it only if the stored result is stale.
+
+    Args:
+        path (str, optional): The executable to describe. Defaults to the one on the PATH.
+
+    Returns:
+        dict: The path, modification time, size, version and features of the executable,
+            or None if Inkscape is not installed.
+    """
+    path = os.path.abspath(path) if path else find_inkscape_executable()
+    if path is None:
+        return None
+
+    with _lock:
+        info = read_cached_info()
+        if info is not None and is_current(info, path):
+            return info
+
+        try:
+            info = probe_inkscape(path)
+        except OSError as e:
+            LOGGER.error("Error running Inkscape: %s", e)
+            return None
+        # A probe that failed, such as on a slow first start, is only used until the next launch
+        if info['version'] is not None:
+            write_cached_info(info)
+        return info
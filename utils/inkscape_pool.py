@@ -0,0 +1,554 @@
+"""
+Pool of long-lived Inkscape processes driven through Inkscape's interactive shell.
+
+Starting Inkscape (fonts, GTK, extensions) takes far longer than rendering a typical template,
+so the pool keeps a few `inkscape --shell` processes alive and sends each render to an idle one
+as a line of actions. Workers that crash, hang past the job timeout or fail a health check are
+killed and replaced by a fresh process on next use. A cancelled render does not stop its worker:
+the worker finishes the job in the background and goes back to the pool.
+"""
+import atexit
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+
+from utils.config import INKSCAPE_HEALTH_CHECK_INTERVAL, INKSCAPE_JOB_TIMEOUT, INKSCAPE_PATH, INKSCAPE_POOL_SIZE
+
+# Characters that cannot be passed inside an action argument
+_ACTION_SEPARATORS = (";", "\n", "\r")
+
+_SHARED_MEMORY_DIR = "/dev/shm"
+
+
+def ends_with_prompt(output):
+    """
+    Check if the output of the shell ends with its prompt, "> " on a line of its own.
+
+    Output of an action that happens to end with ">", such as an SVG fragment, is not a prompt.
+
+    Args:
+        output (bytes): The output collected since the last prompt.
+
+    Returns:
+        bool: True if the shell is waiting for the next line of actions.
+    """
+    output = output.rstrip(b" ")
+    return output == b">" or output.endswith(b"\n>")
+
+
+def is_action_argument(argument):
+    """
+    Check if a value can be passed as the argument of an Inkscape action.
+
+    Args:
+        argument: The value, such as a file path or an export option.
+
+    Returns:
+        bool: True if the value contains no action or line separator.
+    """
+    return not any(separator in str(argument) for separator in _ACTION_SEPARATORS)
+
+
+class InkscapeShellError(Exception):
+    """
+    Raised when an Inkscape shell worker fails a job.
+    """
+
+
+class InkscapeJobCancelled(InkscapeShellError):
+    """
+    Raised when a job is cancelled while a worker runs it. The worker is still healthy and can
+    be reused once it has finished the job.
+    """
+
+
+class InkscapeShellUnavailable(InkscapeShellError):
+    """
+    Raised when the Inkscape shell cannot be used at all, so the caller should fall back
+    to a one-off Inkscape process.
+    """
+
+
+class InkscapeWorker:
+    """
+    A single `inkscape --shell` process.
+    """
+    def __init__(self, inkscape_path, startup_timeout):
+        """
+        Start the Inkscape process and wait for its first prompt.
+
+        Args:
+            inkscape_path (str): The path to the Inkscape executable.
+            startup_timeout (float): The number of seconds to wait for the shell to start.
+
+        Raises:
+            InkscapeShellUnavailable: If the process cannot be started or never shows a prompt.
+        """
+        self.output = bytearray()
+        self.errors = deque(maxlen=20)
+        self.condition = threading.Condition()
+        # Prefer a memory-backed directory for the files exchanged with Inkscape
+        self.work_dir = tempfile.mkdtemp(prefix="gatorsvg-inkscape-",
+                                         dir=_SHARED_MEMORY_DIR if os.path.isdir(_SHARED_MEMORY_DIR) else None)
+        self.last_used = time.monotonic()
+        self.job_deadline = None  # When the job that is running must have finished
+
+        try:
+            self.process = subprocess.Popen([inkscape_path, "--shell"], stdin=subprocess.PIPE,
+                                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except OSError as e:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+            raise InkscapeShellUnavailable(f"Cannot start Inkscape: {e}")
+
+        threading.Thread(target=self._read_stdout, daemon=True).start()
+        threading.Thread(target=self._read_stderr, daemon=True).start()
+
+        if not self._wait_for_prompt(startup_timeout):
+            self.kill()
+            raise InkscapeShellUnavailable("Inkscape shell did not start: " + self.error_text())
+
+    def _read_stdout(self):
+        """
+        Collect the output of the shell until the process exits.
+        """
+        stream = self.process.stdout
+        while True:
+            chunk = stream.read1(4096)
+            with self.condition:
+                if not chunk:
+                    self.condition.notify_all()
+                    return
+                self.output.extend(chunk)
+                self.condition.notify_all()
+
+    def _read_stderr(self):
+        """
+        Keep the last error lines of the shell so that the pipe never fills up.
+        """
+        for line in self.process.stderr:
+            self.errors.append(line.decode("utf-8", "replace").rstrip())
+
+    def error_text(self):
+        """
+        Get the last lines Inkscape wrote to its error stream.
+
+        Returns:
+            str: The last error lines, joined by spaces.
+        """
+        return " ".join(self.errors)
+
+    def _wait_for_prompt(self, timeout, cancel_event=None):
+        """
+        Wait until the shell prints its prompt, then clear the collected output.
+
+        Args:
+            timeout (float): The number of seconds to wait.
+            cancel_event (threading.Event, optional): Stops waiting early when set.
+
+        Returns:
+            bool: True if the prompt was seen, False on timeout, cancellation or process exit.
+        """
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while not ends_with_prompt(self.output):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.is_alive() or (cancel_event is not None and cancel_event.is_set()):
+                    return False
+                self.condition.wait(min(remaining, 0.1))
+            self.output.clear()
+        return True
+
+    def is_alive(self):
+        """
+        Check if the Inkscape process is still running.
+
+        Returns:
+            bool: True if the process is running.
+        """
+        return self.process.poll() is None
+
+    def run(self, actions, timeout, cancel_event=None):
+        """
+        Run a line of actions and wait for the shell to be ready again.
+
+        Args:
+            actions (list): The actions to run, such as "export-do" or "file-open:drawing.svg".
+            timeout (float): The number of seconds the actions may take.
+            cancel_event (threading.Event, optional): Abandons the job when set.
+
+        Raises:
+            InkscapeJobCancelled: If the job was cancelled. The worker is still running it, see finish().
+            InkscapeShellError: If the worker died or timed out. The worker must not be reused afterwards.
+        """
+        try:
+            self.process.stdin.write(("; ".join(actions) + "\n").encode("utf-8"))
+            self.process.stdin.flush()
+        except OSError as e:
+            raise InkscapeShellError(f"Inkscape shell is not responding: {e}")
+
+        self.last_used = time.monotonic()
+        self.job_deadline = self.last_used + timeout
+        if not self._wait_for_prompt(timeout, cancel_event):
+            if cancel_event is not None and cancel_event.is_set():
+                raise InkscapeJobCancelled("Render cancelled")
+            if self.is_alive():
+                raise InkscapeShellError(f"Inkscape did not finish within {timeout} seconds")
+            raise InkscapeShellError("Inkscape exited: " + self.error_text())
+
+    def finish(self):
+        """
+        Wait until the shell has finished a cancelled job, at most until the job's timeout.
+
+        Returns:
+            bool: True if the worker is ready for the next job, False if it timed out or died.
+        """
+        return self._wait_for_prompt(max(0.0, self.job_deadline - time.monotonic()))
+
+    def ping(self, timeout=5):
+        """
+        Check that the shell still answers.
+
+        Args:
+            timeout (float): The number of seconds to wait for the answer.
+
+        Returns:
+            bool: True if the worker is healthy.
+        """
+        if not self.is_alive():
+            return False
+        try:
+            self.run(["system-data-directory"], timeout)
+            return True
+        except InkscapeShellError:
+            return False
+
+    def export_png(self, svg_path, export_options, timeout, cancel_event=None):
+        """
+        Export an SVG file to PNG and return the PNG data.
+
+        Args:
+            svg_path (str): The path to the SVG file.
+            export_options (dict): Additional export actions and their arguments, such as {"export-dpi": 96}.
+            timeout (float): The number of seconds the export may take.
+            cancel_event (threading.Event, optional): Abandons the job when set.
+
+        Returns:
+            bytes: The PNG data.
+
+        Raises:
+            InkscapeShellError: If the export fails.
+        """
+        output_path = os.path.join(self.work_dir, "export.png")
+        if os.path.exists(output_path):
+            os.remove(output_path)
+
+        actions = [f"file-open:{svg_path}", "export-type:png", f"export-filename:{output_path}"]
+        actions += [f"{action}:{value}" for action, value in export_options.items()]
+        actions += ["export-do", "file-close"]
+        self.run(actions, timeout, cancel_event)
+
+        try:
+            with open(output_path, "rb") as file:
+                return file.read()
+        except OSError:
+            raise InkscapeShellError(f"Inkscape did not export {svg_path}: " + self.error_text())
+
+    def export_png_data(self, svg_bytes, export_options, timeout, cancel_event=None):
+        """
+        Export an in-memory SVG document to PNG and return the PNG data.
+
+        The shell can only open documents from files, so the document is staged in the
+        worker's private working directory, which no other worker or process uses.
+
+        Args:
+            svg_bytes (bytes): The serialized SVG document.
+            export_options (dict): Additional export actions and their arguments, such as {"export-dpi": 96}.
+            timeout (float): The number of seconds the export may take.
+            cancel_event (threading.Event, optional): Abandons the job when set.
+
+        Returns:
+            bytes: The PNG data.
+
+        Raises:
+            InkscapeShellError: If the export fails.
+        """
+        input_path = os.path.join(self.work_dir, "input.svg")
+        with open(input_path, "wb") as file:
+            file.write(svg_bytes)
+        return self.export_png(input_path, export_options, timeout, cancel_event)
+
+    def kill(self):
+        """
+        Stop the Inkscape process and remove its working directory.
+        """
+        if self.is_alive():
+            try:
+                self.process.stdin.write(b"quit\n")
+                self.process.stdin.flush()
+                self.process.wait(1)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+
+class InkscapePool:
+    """
+    A bounded pool of Inkscape shell workers.
+    """
+    def __init__(self, inkscape_path, size=INKSCAPE_POOL_SIZE, job_timeout=INKSCAPE_JOB_TIMEOUT,
+                 health_check_interval=INKSCAPE_HEALTH_CHECK_INTERVAL):
+        """
+        Initialize the InkscapePool. Workers are started on first use.
+
+        Args:
+            inkscape_path (str): The path to the Inkscape executable.
+            size (int): The maximum number of Inkscape processes.
+            job_timeout (float): The number of seconds a single render may take.
+            health_check_interval (float): Idle workers older than this many seconds are pinged before reuse.
+        """
+        self.inkscape_path = inkscape_path
+        self.size = size
+        self.job_timeout = job_timeout
+        self.health_check_interval = health_check_interval
+        self.idle_workers = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(size)
+        self.lock = threading.Lock()
+        self.workers = set()
+        self.closed = False
+        self.unavailable = False
+
+    def _acquire(self):
+        """
+        Take an idle, healthy worker or start a new one.
+
+        Returns:
+            InkscapeWorker: The worker to use.
+        """
+        self.slots.acquire()
+        try:
+            while True:
+                try:
+                    worker = self.idle_workers.get_nowait()
+                except queue.Empty:
+                    break
+                if time.monotonic() - worker.last_used < self.health_check_interval and worker.is_alive():
+                    return worker
+                if worker.ping():
+                    return worker
+                self._discard(worker)
+
+            try:
+                worker = InkscapeWorker(self.inkscape_path, self.job_timeout)
+            except InkscapeShellUnavailable:
+                self.unavailable = True
+                raise
+            with self.lock:
+                self.workers.add(worker)
+            return worker
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def _release(self, worker):
+        """
+        Give a worker back to the pool.
+
+        Args:
+            worker (InkscapeWorker): The worker to give back.
+        """
+        if self.closed:
+            self._discard(worker)
+        else:
+            self.idle_workers.put(worker)
+        self.slots.release()
+
+    def _discard(self, worker):
+        """
+        Stop a worker and forget it.
+
+        Args:
+            worker (InkscapeWorker): The worker to stop.
+        """
+        with self.lock:
+            self.workers.discard(worker)
+        worker.kill()
+
+    def _finish_in_background(self, worker):
+        """
+        Give a worker back to the pool once it has finished a cancelled job.
+
+        The worker keeps its slot until then. It is only stopped if the job times out or the
+        process dies, so that cancelling stale renders does not restart Inkscape.
+
+        Args:
+            worker (InkscapeWorker): The worker whose job was cancelled.
+        """
+        def finish():
+            if worker.finish():
+                self._release(worker)
+            else:
+                self._discard(worker)
+                self.slots.release()
+
+        threading.Thread(target=finish, daemon=True).start()
+
+    def render(self, svg_path, export_options=None, cancel_event=None):
+        """
+        Render an SVG file to PNG on one of the workers.
+
+        A worker that crashes during the job is replaced and the job is retried once. A worker
+        that hangs past the job timeout is killed and the job fails.
+
+        Args:
+            svg_path (str): The path to the SVG file.
+            export_options (dict, optional): Additional export actions, such as {"export-dpi": 96}.
+            cancel_event (threading.Event, optional): Abandons the job when set.
+
+        Returns:
+            bytes: The PNG data.
+
+        Raises:
+            InkscapeShellUnavailable: If the shell cannot be used for this render.
+            InkscapeShellError: If the render fails.
+        """
+        return self._run_job(lambda worker, options: worker.export_png(svg_path, options, self.job_timeout,
+                                                                       cancel_event),
+                             [svg_path], export_options, cancel_event)
+
+    def render_data(self, svg_bytes, export_options=None, cancel_event=None):
+        """
+        Render an in-memory SVG document to PNG on one of the workers.
+
+        Args:
+            svg_bytes (bytes): The serialized SVG document.
+            export_options (dict, optional): Additional export actions, such as {"export-dpi": 96}.
+            cancel_event (threading.Event, optional): Abandons the job when set.
+
+        Returns:
+            bytes: The PNG data.
+
+        Raises:
+            InkscapeShellUnavailable: If the shell cannot be used for this render.
+            InkscapeShellError: If the render fails.
+        """
+        return self._run_job(lambda worker, options: worker.export_png_data(svg_bytes, options, self.job_timeout,
+                                                                            cancel_event),
+                             [], export_options, cancel_event)
+
+    def _run_job(self, job, arguments, export_options, cancel_event):
+        """
+        Run a job on an idle worker, replacing the worker if it fails.
+
+        Args:
+            job: Called with the worker and the export options, returns the PNG data.
+            arguments (list): The arguments of the job that are passed to the shell.
+            export_options (dict): Additional export actions, or None.
+            cancel_event (threading.Event): Abandons the job when set, or None.
+
+        Returns:
+            bytes: The PNG data.
+        """
+        if self.closed or self.unavailable:
+            raise InkscapeShellUnavailable("The Inkscape shell is not available")
+        export_options = export_options or {}
+        for argument in [*arguments, *export_options.values()]:
+            if not is_action_argument(argument):
+                raise InkscapeShellUnavailable(f"Cannot pass {argument} to the Inkscape shell")
+
+        for attempt in range(2):
+            worker = self._acquire()
+            try:
+                data = job(worker, export_options)
+            except InkscapeJobCancelled:
+                self._finish_in_background(worker)
+                raise
+            except InkscapeShellError:
+                crashed = not worker.is_alive()
+                self._discard(worker)
+                self.slots.release()
+                if crashed and attempt == 0 and not (cancel_event is not None and cancel_event.is_set()):
+                    continue
+                raise
+            except BaseException:
+                self._discard(worker)
+                self.slots.release()
+                raise
+            self._release(worker)
+            return data
+
+    def close(self):
+        """
+        Stop all workers of the pool.
+        """
+        self.closed = True
+        with self.lock:
+            workers = list(self.workers)
+            self.workers.clear()
+        for worker in workers:
+            worker.kill()
+
+
+class InkscapePoolInstance:
+    """
+    Singleton class holding the shared InkscapePool.
+    """
+    def __init__(self):
+        self.pool = None
+        self.size = INKSCAPE_POOL_SIZE
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_instance():
+        """
+        Get the singleton instance of InkscapePoolInstance.
+
+        Returns:
+            InkscapePoolInstance: The singleton instance of InkscapePoolInstance.
+        """
+        if not hasattr(InkscapePoolInstance, '_instance'):
+            InkscapePoolInstance._instance = InkscapePoolInstance()
+        return InkscapePoolInstance._instance
+
+    def get(self):
+        """
+        Get the shared pool, creating it for the current Inkscape path if needed.
+
+        Returns:
+            InkscapePool: The shared pool, or None if the Inkscape path is unknown.
+        """
+        inkscape_path = INKSCAPE_PATH.get()
+        with self.lock:
+            if self.pool is not None and self.pool.inkscape_path != inkscape_path:
+                self.pool.close()
+                self.pool = None
+            if self.pool is None and inkscape_path:
+                self.pool = InkscapePool(inkscape_path, size=self.size)
+            return self.pool
+
+    def set_size(self, size):
+        """
+        Set the number of Inkscape processes of the shared pool, restarting it if it is running.
+
+        Args:
+            size (int): The maximum number of Inkscape processes.
+        """
+        self.close()
+        self.size = size
+
+    def close(self):
+        """
+        Stop the shared pool.
+        """
+        with self.lock:
+            if self.pool is not None:
+                self.pool.close()
+                self.pool = None
+
+
+INKSCAPE_POOL = InkscapePoolInstance.get_instance()
+atexit.register(INKSCAPE_POOL.close)
@@ -0,0 +1,281 @@
+"""
+Logging, timing spans and counters.
+
+All messages go through the "gatorsvg" logger. They are formatted lazily, so a message below
+the configured level costs a level check and nothing else.
+
+INSTRUMENTATION collects named timing spans (parse, lookup, style_parse, serialize, render,
+tk_redraw) and counters while it is enabled. While it is disabled, span() returns a shared
+no-op context manager and count() returns at once, so instrumented code paths pay a single
+attribute check. When PROFILE_REPORT_FILE is set (or the GATORSVG_PROFILE environment
+variable), profiling is enabled at startup and a report of the session is written at exit.
+In the GUI, the report also lists the stalls of the Tk event loop measured by a StallMonitor.
+"""
+import atexit
+import json
+import logging
+import sys
+import threading
+import time
+from contextlib import nullcontext
+
+from utils.config import LOG_LEVEL, PROFILE_REPORT_FILE, TK_STALL_POLL_MS, TK_STALL_THRESHOLD_MS
+
+LOGGER = logging.getLogger("gatorsvg")
+
+# Longest list of individual durations kept per span, for the percentiles of the report
+SPAN_SAMPLES = 10000
+
+_NULL_SPAN = nullcontext()
+
+
+class Span:
+    """
+    Context manager that times a block of code and records it under a name.
+    """
+    __slots__ = ("instrumentation", "name", "start")
+
+    def __init__(self, instrumentation, name):
+        """
+        Initialize the Span.
+
+        Args:
+            instrumentation (Instrumentation): The instrumentation the duration is recorded in.
+            name (str): The name of the span.
+        """
+        self.instrumentation = instrumentation
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.instrumentation.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Instrumentation:
+    """
+    Singleton class collecting timing spans and counters of the session.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.spans = {}  # Name -> [count, total seconds, longest seconds, samples]
+        self.counters = {}
+        self.started = time.perf_counter()
+
+    @staticmethod
+    def get_instance():
+        """
+        Get the singleton instance of Instrumentation.
+
+        Returns:
+            Instrumentation: The singleton instance of Instrumentation.
+        """
+        if not hasattr(Instrumentation, '_instance'):
+            Instrumentation._instance = Instrumentation()
+        return Instrumentation._instance
+
+    def enable(self):
+        """
+        Start collecting spans and counters.
+        """
+        self.enabled = True
+
+    def disable(self):
+        """
+        Stop collecting spans and counters. The collected data is kept.
+        """
+        self.enabled = False
+
+    def reset(self):
+        """
+        Forget the collected spans and counters.
+        """
+        with self.lock:
+            self.spans.clear()
+            self.counters.clear()
+            self.started = time.perf_counter()
+
+    def span(self, name):
+        """
+        Time a block of code.
+
+        Args:
+            name (str): The name of the span, such as "parse" or "render".
+
+        Returns:
+            A context manager recording the duration of the block, or a no-op one while disabled.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name)
+
+    def record(self, name, seconds):
+        """
+        Record a duration under a span name.
+
+        Args:
+            name (str): The name of the span.
+            seconds (float): The duration.
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            span = self.spans.get(name)
+            if span is None:
+                span = self.spans[name] = [0, 0.0, 0.0, []]
+            span[0] += 1
+            span[1] += seconds
+            span[2] = max(span[2], seconds)
+            if len(span[3]) < SPAN_SAMPLES:
+                span[3].append(seconds)
+
+    def count(self, name, amount=1):
+        """
+        Increase a counter.
+
+        Args:
+            name (str): The name of the counter, such as "render_cache.hit".
+            amount (int): The amount to add.
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self):
+        """
+        Summarize the collected spans and counters.
+
+        Returns:
+            dict: The duration of the session in seconds, and per span the count, total, mean,
+                95th percentile and longest duration in milliseconds, and the counters.
+        """
+        with self.lock:
+            spans = {}
+            for name, (count, total, longest, samples) in sorted(self.spans.items()):
+                ordered = sorted(samples)
+                spans[name] = {
+                    'count': count,
+                    'total_ms': total * 1000,
+                    'mean_ms': total * 1000 / count,
+                    'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+                    'max_ms': longest * 1000,
+                }
+            return {
+                'session_s': time.perf_counter() - self.started,
+                'spans': spans,
+                'counters': dict(sorted(self.counters.items())),
+            }
+
+    def format_report(self):
+        """
+        Format the summary of the collected spans and counters as a table.
+
+        Returns:
+            str: The report.
+        """
+        report = self.report()
+        lines = [f"GatorSVG profile of a {report['session_s']:.1f} s session",
+                 f"{'span':<16} {'count':>8} {'total (ms)':>12} {'mean (ms)':>10} {'p95 (ms)':>10} {'max (ms)':>10}"]
+        for name, span in report['spans'].items():
+            lines.append(f"{name:<16} {span['count']:>8} {span['total_ms']:>12.1f} {span['mean_ms']:>10.3f} "
+                         f"{span['p95_ms']:>10.3f} {span['max_ms']:>10.3f}")
+        if report['counters']:
+            lines.append(f"{'counter':<16} {'value':>8}")
+            lines.extend(f"{name:<16} {value:>8}" for name, value in report['counters'].items())
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """
+        Write the report to a file, as JSON if the file name ends with .json and as a table otherwise.
+
+        Args:
+            path (str): The path of the report file, or "-" for standard error.
+        """
+        text = json.dumps(self.report(), indent=2) + "\n" if path.endswith(".json") else self.format_report()
+        if path == "-":
+            sys.stderr.write(text)
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(text)
+        except OSError as e:
+            LOGGER.error("Error writing profile report: %s", e)
+
+
+INSTRUMENTATION = Instrumentation.get_instance()
+
+
+class StallMonitor:
+    """
+    Measures how late the Tk event loop runs a periodic callback, and records the delays
+    longer than a threshold as "tk_stall" spans.
+    """
+    def __init__(self, widget, poll_ms=TK_STALL_POLL_MS, threshold_ms=TK_STALL_THRESHOLD_MS):
+        """
+        Initialize the StallMonitor and start polling if profiling is enabled.
+
+        Args:
+            widget: Any Tk widget, used to schedule the callback.
+            poll_ms (int): The interval of the callback in milliseconds.
+            threshold_ms (int): The delay past the interval from which the event loop counts as stalled.
+        """
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self.threshold = threshold_ms / 1000
+        self.expected = None
+        if INSTRUMENTATION.enabled:
+            self.schedule()
+
+    def schedule(self):
+        """
+        Schedule the next callback.
+        """
+        self.expected = time.perf_counter() + self.poll_ms / 1000
+        self.widget.after(self.poll_ms, self.poll)
+
+    def poll(self):
+        """
+        Record how late the callback runs, then schedule the next one.
+        """
+        stall = time.perf_counter() - self.expected
+        if stall > self.threshold:
+            INSTRUMENTATION.record("tk_stall", stall)
+        if INSTRUMENTATION.enabled:
+            self.schedule()
+
+
+def configure_logging(level=LOG_LEVEL):
+    """
+    Show the messages of the "gatorsvg" logger from a level on, on standard error.
+
+    Args:
+        level (str): The lowest level shown: "DEBUG", "INFO", "WARNING" or "ERROR".
+    """
+    LOGGER.setLevel(level.upper() if isinstance(level, str) else level)
+    if not LOGGER.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+        LOGGER.addHandler(handler)
+        LOGGER.propagate = False
+
+
+def init_instrumentation(report_file=PROFILE_REPORT_FILE):
+    """
+    Configure logging and, if a report file is given, profile the session and write the report at exit.
+
+    Called once by the entry points of the GUI and the command line.
+
+    Args:
+        report_file (str, optional): The path of the report, or "-" for standard error.
+    """
+    configure_logging()
+    if report_file and not INSTRUMENTATION.enabled:
+        INSTRUMENTATION.reset()
+        INSTRUMENTATION.enable()
+        atexit.register(INSTRUMENTATION.dump, report_file)
@@ -0,0 +1,85 @@
+"""
+Reading and writing of Quick Edit files.
+
+A Quick Edit file holds one edit per line in the form "ID,attribute,Type,value", where Type is
+one of Normal, Style or Element. Everything after the third comma is the value, so values may
+contain commas.
+"""
+
+QUICK_EDIT_TYPES = ("Normal", "Style", "Element")
+
+
+def type_name_to_id(type_name):
+    """
+    Convert a Quick Edit type name to its type ID.
+
+    Args:
+        type_name (str): The type name ('Normal', 'Style' or 'Element').
+
+    Returns:
+        int: The type of attribute (1 - Normal, 2 - Style, 3 - Element).
+    """
+    return QUICK_EDIT_TYPES.index(type_name) + 1
+
+
+def parse_quick_edit_line(line):
+    """
+    Parse one line of a Quick Edit file.
+
+    Args:
+        line (str): The line to parse.
+
+    Returns:
+        dict: A dictionary containing the ID, attribute name, type, and value,
+            or None if the line is not a valid Quick Edit.
+    """
+    values = line.rstrip("\r\n").split(",", 3)
+    if len(values) != 4:
+        return None
+
+    element_id, attribute_name, type_name, value = values
+    return {'ID': element_id.strip(), 'attribute': attribute_name.strip(), 'type': type_name.strip(), 'value': value}
+
+
+def read_quick_edit_file(file_path):
+    """
+    Read the Quick Edits of a file one line at a time.
+
+    Args:
+        file_path (str): The path to the Quick Edit file.
+
+    Yields:
+        dict: A dictionary containing the ID, attribute name, type, and value of each valid line.
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        for line in file:
+            quick_edit = parse_quick_edit_line(line)
+            if quick_edit is not None:
+                yield quick_edit
+
+
+def format_quick_edit_line(quick_edit):
+    """
+    Format a Quick Edit as a line of a Quick Edit file.
+
+    Args:
+        quick_edit (dict): A dictionary containing the ID, attribute name, type, and value.
+
+    Returns:
+        str: The formatted line, including the line break.
+    """
+    type_name = quick_edit['type'] if quick_edit['type'] in QUICK_EDIT_TYPES else ''
+    return f"{quick_edit['ID']},{quick_edit['attribute']},{type_name},{quick_edit['value']}\n"
+
+
+def write_quick_edit_file(file_path, quick_edits):
+    """
+    Write Quick Edits to a file one line at a time.
+
+    Args:
+        file_path (str): The path to the Quick Edit file.
+        quick_edits (iterable): Dictionaries containing the ID, attribute name, type, and value.
+    """
+    with open(file_path, "w", encoding="utf-8") as file:
+        for quick_edit in quick_edits:
+            file.write(format_quick_edit_line(quick_edit))
@@ -0,0 +1,227 @@
+"""
+Render backends turning SVG documents into PNG data.
+
+The Inkscape backend gives full fidelity (filters, text layout, fonts) through the pool of
+Inkscape shell workers. The CairoSVG backend renders in-process, without any process startup,
+at the cost of fidelity. It is only available when the cairosvg package is installed.
+"""
+import subprocess
+
+from utils.config import INKSCAPE_PATH
+from utils.inkscape_pool import INKSCAPE_POOL, InkscapeShellUnavailable
+
+# Seconds between checks of the cancel event while a one-off Inkscape process runs
+CANCEL_POLL_INTERVAL = 0.1
+
+
+class RenderCancelled(Exception):
+    """
+    Raised when a render is cancelled before it finishes.
+    """
+
+
+class RenderBackend:
+    """
+    Base class of the render backends.
+    """
+    name = None
+
+    def is_available(self):
+        """
+        Check if the backend can render on this system.
+
+        Returns:
+            bool: True if the backend can be used.
+        """
+        raise NotImplementedError
+
+    def render(self, svg_bytes, svg_path, export_options, cancel_event=None):
+        """
+        Render an SVG document to PNG data.
+
+        Args:
+            svg_bytes (bytes): The serialized SVG document.
+            svg_path (str): The file the document was read from, or None for an in-memory document.
+            export_options (dict): The Inkscape export options, such as {"export-width": 800}.
+            cancel_event (threading.Event, optional): Stops the render when set, if the backend supports it.
+
+        Returns:
+            bytes: The PNG data.
+        """
+        raise NotImplementedError
+
+
+class InkscapeBackend(RenderBackend):
+    """
+    Renders with Inkscape, on the shell worker pool or with a one-off process.
+    """
+    name = "inkscape"
+
+    def is_available(self):
+        """
+        Check if the Inkscape path is known.
+
+        Returns:
+            bool: True if Inkscape can be used.
+        """
+        return bool(INKSCAPE_PATH.get())
+
+    def render(self, svg_bytes, svg_path, export_options, cancel_event=None):
+        """
+        Render an SVG document to PNG data with Inkscape.
+
+        The render runs on one of the long-lived Inkscape shell workers. If the shell cannot be
+        used, a one-off Inkscape process is started instead.
+
+        Args:
+            svg_bytes (bytes): The serialized SVG document.
+            svg_path (str): The file the document was read from, or None for an in-memory document.
+            export_options (dict): The Inkscape export options, such as {"export-width": 800}.
+            cancel_event (threading.Event, optional): Stops the render when set.
+
+        Returns:
+            bytes: The PNG data.
+        """
+        info = INKSCAPE_PATH.get_info()
+        if info is not None and not info['features']['shell_actions']:
+            pool = None
+        else:
+            pool = INKSCAPE_POOL.get()
+        try:
+            if pool is None:
+                raise InkscapeShellUnavailable("Inkscape shell is not available")
+            if svg_path is None:
+                return pool.render_data(svg_bytes, export_options, cancel_event)
+            return pool.render(svg_path, export_options, cancel_event)
+        except InkscapeShellUnavailable:
+            if svg_path is None:
+                return run_inkscape_once(None, export_options, cancel_event, svg_bytes)
+            return run_inkscape_once(svg_path, export_options, cancel_event)
+
+
+class CairoSVGBackend(RenderBackend):
+    """
+    Renders in-process with CairoSVG.
+    """
+    name = "cairosvg"
+
+    def __init__(self):
+        self.available = None
+
+    def is_available(self):
+        """
+        Check if the cairosvg package can be imported. The result is remembered.
+
+        Returns:
+            bool: True if CairoSVG can be used.
+        """
+        if self.available is None:
+            try:
+                import cairosvg  # noqa: F401
+                self.available = True
+            except (ImportError, OSError):
+                # OSError: the package is installed but the Cairo library is missing
+                self.available = False
+        return self.available
+
+    def render(self, svg_bytes, svg_path, export_options, cancel_event=None):
+        """
+        Render an SVG document to PNG data with CairoSVG.
+
+        Args:
+            svg_bytes (bytes): The serialized SVG document.
+            svg_path (str): The file the document was read from, used to resolve relative links, or None.
+            export_options (dict): The Inkscape export options, such as {"export-width": 800}.
+            cancel_event (threading.Event, optional): Checked before the render starts.
+
+        Returns:
+            bytes: The PNG data.
+        """
+        import cairosvg
+
+        if cancel_event is not None and cancel_event.is_set():
+            raise RenderCancelled("Render cancelled")
+
+        options = {}
+        if "export-dpi" in export_options:
+            options["dpi"] = float(export_options["export-dpi"])
+        if "export-width" in export_options:
+            options["output_width"] = int(export_options["export-width"])
+        if "export-height" in export_options:
+            options["output_height"] = int(export_options["export-height"])
+        if "export-background" in export_options:
+            options["background_color"] = export_options["export-background"]
+
+        return cairosvg.svg2png(bytestring=svg_bytes, url=svg_path, **options)
+
+
+RENDER_BACKENDS = {backend.name: backend for backend in (InkscapeBackend(), CairoSVGBackend())}
+
+
+def get_render_backend(name="auto"):
+    """
+    Get a render backend by name.
+
+    Args:
+        name (str): 'inkscape', 'cairosvg', or 'auto' to use CairoSVG when it is installed
+            and Inkscape otherwise.
+
+    Returns:
+        RenderBackend: The render backend.
+
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    if name == "auto":
+        cairo_backend = RENDER_BACKENDS["cairosvg"]
+        return cairo_backend if cairo_backend.is_available() else RENDER_BACKENDS["inkscape"]
+    if name not in RENDER_BACKENDS:
+        raise ValueError(f"Unknown render backend '{name}'")
+    return RENDER_BACKENDS[name]
+
+
+def run_inkscape_once(svg_path, export_options=None, cancel_event=None, svg_bytes=None):
+    """
+    Convert an SVG file to PNG data with a one-off Inkscape process.
+
+    Args:
+        svg_path (str): The path of the SVG file to be converted, or None to pipe svg_bytes instead.
+        export_options (dict, optional): Additional export options, such as {"export-dpi": 96}.
+        cancel_event (threading.Event, optional): Kills the Inkscape process when set.
+        svg_bytes (bytes, optional): The SVG document to send over standard input when svg_path is None.
+
+    Returns:
+        bytes: The PNG data.
+
+    Raises:
+        subprocess.CalledProcessError: If Inkscape fails.
+        RenderCancelled: If the conversion was cancelled.
+        RuntimeError: If Inkscape is not installed.
+    """
+    inkscape_path = INKSCAPE_PATH.get()
+    if not inkscape_path:
+        raise RuntimeError("Inkscape was not found. Please install Inkscape or use the cairosvg backend.")
+
+    options = [f"--{option}={value}" for option, value in (export_options or {}).items()]
+    source = [svg_path] if svg_path is not None else ['--pipe']
+    command = [inkscape_path, '--export-type=png', '--export-filename=-', *options, *source]
+
+    # Run Inkscape command to convert SVG to PNG and capture the output
+    with subprocess.Popen(command, stdin=subprocess.PIPE if svg_path is None else None,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE) as process:
+        input_data = svg_bytes if svg_path is None else None
+        while True:
+            try:
+                stdout, stderr = process.communicate(input_data, timeout=CANCEL_POLL_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                # The input is only sent once, the following calls keep reading the output
+                input_data = None
+                if cancel_event is not None and cancel_event.is_set():
+                    process.kill()
+                    process.wait()
+                    raise RenderCancelled("Render cancelled")
+
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command, stdout, stderr)
+    return stdout
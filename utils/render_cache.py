@@ -0,0 +1,255 @@
+"""
+Content-addressed cache of rendered PNG data.
+
+Renders are keyed by a hash of the SVG bytes and the render parameters, so that rendering a
+document that is byte-for-byte identical to an earlier one (toggling a value back, undoing,
+re-opening a file) is served without running Inkscape. The parameters include the modification
+time and size of the linked image files, so editing a linked image invalidates its renders. The cache has a bounded in-memory LRU
+tier and an optional on-disk tier with size-based eviction.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from utils.config import RENDER_CACHE_DIR, RENDER_CACHE_MAX_BYTES, RENDER_CACHE_MAX_DISK_BYTES, RENDER_CACHE_MAX_ENTRIES
+from utils.instrumentation import LOGGER
+
+# Age after which a temporary file of the on-disk tier is left over from an interrupted write
+STALE_TEMP_SECONDS = 3600
+
+
+def render_cache_key(svg_bytes, **render_params):
+    """
+    Get the cache key of a render.
+
+    Args:
+        svg_bytes (bytes): The serialized SVG document.
+        **render_params: The parameters of the render, such as dpi, width, height and background.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest identifying the render.
+    """
+    digest = hashlib.sha256(svg_bytes)
+    for name in sorted(render_params):
+        digest.update(f"\0{name}={render_params[name]!r}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """
+    Two-tier LRU cache mapping render keys to PNG data.
+    """
+    def __init__(self, max_entries=RENDER_CACHE_MAX_ENTRIES, max_bytes=RENDER_CACHE_MAX_BYTES,
+                 disk_dir=None, max_disk_bytes=RENDER_CACHE_MAX_DISK_BYTES):
+        """
+        Initialize the RenderCache.
+
+        Args:
+            max_entries (int): The maximum number of renders kept in memory.
+            max_bytes (int): The maximum total size of the renders kept in memory.
+            disk_dir (str, optional): The directory of the on-disk tier. The tier is disabled if None.
+            max_disk_bytes (int): The maximum total size of the on-disk tier.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()  # Guards the in-memory tier and the counters
+        self.disk_lock = threading.Lock()  # Guards the size and eviction of the on-disk tier
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_dir = None
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_size = 0
+        if disk_dir:
+            self.enable_disk(disk_dir, max_disk_bytes)
+
+    def enable_disk(self, disk_dir, max_disk_bytes=RENDER_CACHE_MAX_DISK_BYTES):
+        """
+        Enable the on-disk tier, keeping the renders already stored in the directory.
+
+        Args:
+            disk_dir (str): The directory of the on-disk tier.
+            max_disk_bytes (int): The maximum total size of the on-disk tier.
+        """
+        os.makedirs(disk_dir, exist_ok=True)
+        with self.disk_lock:
+            self.disk_dir = disk_dir
+            self.max_disk_bytes = max_disk_bytes
+            self._remove_stale_temp_files()
+            self.disk_size = sum(entry.stat().st_size for entry in os.scandir(disk_dir)
+                                 if entry.name.endswith(".png"))
+            self._evict_disk()
+
+    def get(self, key):
+        """
+        Get a render from the cache.
+
+        The on-disk tier is read without holding the lock, so that other threads are not held up
+        by the disk.
+
+        Args:
+            key (str): The cache key of the render.
+
+        Returns:
+            bytes: The PNG data, or None if the render is not cached.
+        """
+        with self.lock:
+            data = self.entries.get(key)
+            if data is not None:
+                self.entries.move_to_end(key)
+                self.memory_hits += 1
+                return data
+
+        data = self._read_disk(key)
+        with self.lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._put_memory(key, data)
+            return data
+
+    def put(self, key, data):
+        """
+        Store a render in the cache.
+
+        Args:
+            key (str): The cache key of the render.
+            data (bytes): The PNG data.
+        """
+        with self.lock:
+            self._put_memory(key, data)
+        self._write_disk(key, data)
+
+    def _put_memory(self, key, data):
+        """
+        Store a render in the in-memory tier, evicting the least recently used ones.
+        """
+        if key in self.entries:
+            self.size -= len(self.entries.pop(key))
+        if len(data) > self.max_bytes:
+            return
+        self.entries[key] = data
+        self.size += len(data)
+        while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def _disk_path(self, key):
+        """
+        Get the path of a render in the on-disk tier.
+        """
+        return os.path.join(self.disk_dir, key + ".png")
+
+    def _read_disk(self, key):
+        """
+        Read a render from the on-disk tier, or return None if it is not there.
+        """
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            os.utime(path)  # Mark as recently used for eviction
+            return data
+        except OSError:
+            return None
+
+    def _write_disk(self, key, data):
+        """
+        Store a render in the on-disk tier.
+        """
+        if self.disk_dir is None or len(data) > self.max_disk_bytes:
+            return
+        path = self._disk_path(key)
+        if os.path.exists(path):
+            return
+        temp_path = None
+        try:
+            # Write under a temporary name so that readers never see a partial file
+            fd, temp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            LOGGER.warning("Error writing render cache: %s", e)
+            if temp_path is not None and os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+            return
+        with self.disk_lock:
+            self.disk_size += len(data)
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """
+        Remove the least recently used renders until the on-disk tier fits its size limit.
+
+        Called with the disk lock held.
+        """
+        if self.disk_size <= self.max_disk_bytes:
+            return
+        self._remove_stale_temp_files()
+        entries = sorted((entry for entry in os.scandir(self.disk_dir) if entry.name.endswith(".png")),
+                         key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            if self.disk_size <= self.max_disk_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                self.disk_size -= size
+            except OSError:
+                pass
+
+    def _remove_stale_temp_files(self):
+        """
+        Remove the temporary files of writes that were interrupted, such as by a crash.
+
+        Recent temporary files are kept, since another process may still be writing them.
+        """
+        cutoff = time.time() - STALE_TEMP_SECONDS
+        for entry in os.scandir(self.disk_dir):
+            try:
+                if entry.name.endswith(".tmp") and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """
+        Remove every render from the in-memory tier and reset the counters.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+            self.memory_hits = self.disk_hits = self.misses = 0
+
+    def stats(self):
+        """
+        Get the hit and miss counters of the cache.
+
+        Returns:
+            dict: The number of memory hits, disk hits and misses, and the size of each tier.
+        """
+        with self.lock:
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'hits': self.memory_hits + self.disk_hits,
+                'misses': self.misses,
+                'entries': len(self.entries),
+                'bytes': self.size,
+                'disk_bytes': self.disk_size if self.disk_dir else 0,
+            }
+
+
+RENDER_CACHE = RenderCache(disk_dir=RENDER_CACHE_DIR)
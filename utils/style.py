@@ -0,0 +1,270 @@
+"""
+Parsed and cached style attributes.
+
+The style attribute of an element is parsed once into a Style object that is cached per
+element and reused until the attribute changes. Edits are made on the Style object and are
+only written back to the attribute when the document is serialized (see flush_styles), so
+that repeated reads and writes of style properties do not re-parse or re-format the string.
+
+The parser splits declarations on semicolons and names from values on the first colon, but
+ignores both inside quoted strings and parentheses, so values such as "url(data:a;b)" or
+"'a:b'" are kept intact. Comments are ignored, and a trailing "!important" is kept as a flag
+of the property.
+"""
+import weakref
+
+from utils.instrumentation import INSTRUMENTATION
+
+IMPORTANT = "!important"
+
+# Style objects of the elements whose style attribute has been parsed
+_styles = weakref.WeakKeyDictionary()
+# Elements whose Style has edits that are not written to the style attribute yet
+_dirty = weakref.WeakSet()
+
+
+def split_declarations(style):
+    """
+    Split a style attribute into its declarations.
+
+    Semicolons inside quoted strings, parentheses and comments do not end a declaration.
+
+    Args:
+        style (str): The value of the style attribute.
+
+    Returns:
+        list: The declarations, unstripped, without their separating semicolons.
+    """
+    declarations = []
+    start = 0
+    depth = 0
+    quote = None
+    index = 0
+    length = len(style)
+    while index < length:
+        char = style[index]
+        if quote is not None:
+            if char == "\\":
+                index += 1
+            elif char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")" and depth > 0:
+            depth -= 1
+        elif char == "/" and style.startswith("/*", index):
+            end = style.find("*/", index + 2)
+            index = length if end == -1 else end + 1
+        elif char == ";" and depth == 0:
+            declarations.append(style[start:index])
+            start = index + 1
+        index += 1
+    declarations.append(style[start:])
+    return declarations
+
+
+def strip_comments(declaration):
+    """
+    Remove the comments of a style declaration.
+
+    Comments inside quoted strings and parentheses are part of the value and are kept.
+
+    Args:
+        declaration (str): The declaration, without its semicolon.
+
+    Returns:
+        str: The declaration, with each comment replaced by a space.
+    """
+    if "/*" not in declaration:
+        return declaration
+    parts = []
+    start = 0
+    depth = 0
+    quote = None
+    index = 0
+    length = len(declaration)
+    while index < length:
+        char = declaration[index]
+        if quote is not None:
+            if char == "\\":
+                index += 1
+            elif char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")" and depth > 0:
+            depth -= 1
+        elif char == "/" and depth == 0 and declaration.startswith("/*", index):
+            parts.append(declaration[start:index])
+            end = declaration.find("*/", index + 2)
+            index = length if end == -1 else end + 2
+            start = index
+            parts.append(" ")
+            continue
+        index += 1
+    parts.append(declaration[start:])
+    return "".join(parts)
+
+
+def parse_declaration(declaration):
+    """
+    Parse one style declaration such as "fill: red !important". Comments are ignored.
+
+    Args:
+        declaration (str): The declaration, without its semicolon.
+
+    Returns:
+        tuple: The property name, value and important flag, or None if the declaration is empty
+            or has no value.
+    """
+    name, separator, value = strip_comments(declaration).partition(":")
+    name = name.strip()
+    if not separator or not name:
+        return None
+
+    value = value.strip()
+    important = False
+    if value[-len(IMPORTANT):].lower() == IMPORTANT:
+        value = value[:-len(IMPORTANT)].rstrip()
+        important = True
+    return name, value, important
+
+
+class Style:
+    """
+    The parsed properties of a style attribute.
+    """
+    def __init__(self, raw):
+        """
+        Initialize the Style by parsing a style attribute.
+
+        Args:
+            raw (str): The value of the style attribute, or None.
+        """
+        self.raw = raw
+        self.properties = {}
+        self.important = set()
+        for declaration in split_declarations(raw or ""):
+            parsed = parse_declaration(declaration)
+            if parsed is None:
+                continue
+            name, value, important = parsed
+            self.properties[name] = value
+            if important:
+                self.important.add(name)
+            else:
+                self.important.discard(name)
+
+    def __contains__(self, name):
+        """
+        Check if the style has a property.
+
+        Args:
+            name (str): The name of the property.
+
+        Returns:
+            bool: True if the property is set, False otherwise.
+        """
+        return name in self.properties
+
+    def get(self, name, default=None):
+        """
+        Get the value of a property.
+
+        Args:
+            name (str): The name of the property.
+            default: The value returned if the property is not set.
+
+        Returns:
+            str: The value of the property, without "!important".
+        """
+        return self.properties.get(name, default)
+
+    def items(self):
+        """
+        Get the properties of the style.
+
+        Returns:
+            ItemsView: The names and values of the properties, in attribute order.
+        """
+        return self.properties.items()
+
+    def to_string(self):
+        """
+        Format the style as a style attribute.
+
+        Returns:
+            str: The style attribute string.
+        """
+        return ";".join(f"{name}:{value} {IMPORTANT}" if name in self.important else f"{name}:{value}"
+                        for name, value in self.properties.items())
+
+
+def get_style(element):
+    """
+    Get the parsed style of an element, parsing its style attribute only if it changed.
+
+    Args:
+        element (Element): The XML element.
+
+    Returns:
+        Style: The cached style of the element.
+    """
+    raw = element.get("style")
+    style = _styles.get(element)
+    # The attribute is only replaced when the style was set directly, bypassing the cache
+    if style is None or (style.raw is not raw and style.raw != raw):
+        with INSTRUMENTATION.span("style_parse"):
+            style = _styles[element] = Style(raw)
+        _dirty.discard(element)
+    return style
+
+
+def set_style_property(element, name, value):
+    """
+    Set a property of an element's style.
+
+    The style attribute itself is only updated by flush_style or flush_styles.
+
+    Args:
+        element (Element): The XML element.
+        name (str): The name of the property.
+        value (str): The new value of the property.
+
+    Returns:
+        bool: True if the value changed, False if the property already had this value.
+    """
+    style = get_style(element)
+    if style.properties.get(name) == value:
+        return False
+    style.properties[name] = value
+    _dirty.add(element)
+    return True
+
+
+def flush_style(element):
+    """
+    Write the pending style edits of an element to its style attribute.
+
+    Args:
+        element (Element): The XML element.
+    """
+    if element in _dirty:
+        style = _styles[element]
+        style.raw = style.to_string()
+        element.set("style", style.raw)
+        _dirty.discard(element)
+
+
+def flush_styles():
+    """
+    Write the pending style edits of every element to their style attributes.
+
+    Called before a document is serialized, copied or read as raw attributes.
+    """
+    for element in list(_dirty):
+        flush_style(element)
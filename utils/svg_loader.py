@@ -0,0 +1,127 @@
+"""
+Incremental loading of SVG documents.
+
+The SVGLoader parses a file a chunk at a time with an XMLPullParser, so that a caller can
+interleave loading with other work (such as the Tk event loop) instead of blocking until the
+whole document is parsed. Elements are handed out in document order, together with their
+nesting level, as soon as their start tag has been read, and are added to the document's ID
+index as they arrive. Parsing does not recurse, so very deep documents load as well.
+"""
+import os
+import xml.etree.ElementTree as ET
+
+from utils.config import LOAD_CHUNK_SIZE
+from utils.element_index import get_element_index
+from utils.instrumentation import INSTRUMENTATION
+
+
+class SVGLoader:
+    """
+    Parses an SVG file incrementally and yields its elements as they are read.
+    """
+    def __init__(self, svg_path, chunk_size=LOAD_CHUNK_SIZE):
+        """
+        Initialize the SVGLoader and open the file.
+
+        Args:
+            svg_path (str): The path to the SVG file.
+            chunk_size (int): The number of bytes read and parsed per chunk.
+        """
+        self.svg_path = svg_path
+        self.chunk_size = chunk_size
+        self.total_bytes = os.path.getsize(svg_path)
+        self.bytes_read = 0
+        self.root = None
+        self.index = None
+        self.element_count = 0
+        self.done = False
+        self.level = -1
+
+        self.parser = ET.XMLPullParser(events=("start", "end"))
+        self.file = open(svg_path, "rb")
+
+    @property
+    def progress(self):
+        """
+        Get the fraction of the file that has been parsed.
+
+        Returns:
+            float: The progress, from 0.0 to 1.0.
+        """
+        if self.done or self.total_bytes == 0:
+            return 1.0
+        return self.bytes_read / self.total_bytes
+
+    def read_chunk(self):
+        """
+        Parse the next chunk of the file.
+
+        Elements are complete in their attributes when they are returned, but their children
+        and text may still be loading.
+
+        Returns:
+            list: Pairs of element and nesting level of the elements that started in this chunk.
+
+        Raises:
+            ET.ParseError: If the file is not well-formed XML. The loader is closed.
+        """
+        if self.done:
+            return []
+
+        try:
+            with INSTRUMENTATION.span("parse"):
+                data = self.file.read(self.chunk_size)
+                if data:
+                    self.bytes_read += len(data)
+                    self.parser.feed(data)
+                    elements = self._read_events()
+                else:
+                    # close() flushes the parser and raises if the document is incomplete
+                    self.parser.close()
+                    elements = self._read_events()
+                    self.done = True
+                    self.file.close()
+        except Exception:
+            self.close()
+            raise
+        return elements
+
+    def _read_events(self):
+        """
+        Collect the elements started since the last call and index them.
+
+        Returns:
+            list: Pairs of element and nesting level, in document order.
+        """
+        elements = []
+        for event, element in self.parser.read_events():
+            if event == "start":
+                self.level += 1
+                if self.root is None:
+                    self.root = element
+                    self.index = get_element_index(element)
+                else:
+                    self.index.add_one(element)
+                elements.append((element, self.level))
+            else:
+                self.level -= 1
+        self.element_count += len(elements)
+        return elements
+
+    def load_all(self):
+        """
+        Parse the rest of the file.
+
+        Returns:
+            Element: The root element of the document.
+        """
+        while not self.done:
+            self.read_chunk()
+        return self.root
+
+    def close(self):
+        """
+        Stop loading and release the file.
+        """
+        self.done = True
+        self.file.close()
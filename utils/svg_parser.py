@@ -1,9 +1,19 @@
+import io
 import os
 import sys
 import xml.etree.ElementTree as ET
 
-from app_vars import root_element, namespace_mappings
-from utils.config import OPEN_SVG_FILE_PATH
+from app_vars import modification_tracker, root_element, namespace_mappings
+from utils.edit_journal import EDIT_JOURNAL, EDIT_KIND_ATTRIBUTE, EDIT_KIND_STYLE, EDIT_KIND_TEXT
+from utils.element_index import element_id_changed, get_element_index
+from utils.file_helper import atomic_open
+from utils.instrumentation import INSTRUMENTATION, LOGGER
+from utils.style import Style, flush_style, flush_styles, get_style, set_style_property
+
+# Outcomes of an attribute edit
+EDIT_APPLIED = "applied"
+EDIT_UNCHANGED = "unchanged"
+EDIT_NOT_FOUND = "not_found"
 
 
 def resource_path(relative_path):
@@ -25,89 +35,185 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
-def convert_image_path(image_path):
+def load_svg(svg_path):
     """
-    Converts the respective Image_Path to the actual image path.
+    Parse an SVG file and build the ID index of the document.
 
     Args:
-        image_path: The path to the image file.
+        svg_path: The path to the SVG file.
 
     Returns:
-        str: The absolute path to the image file.
+        ElementTree: The parsed SVG document.
     """
-    if "file" in image_path:
-        return image_path
-    if not os.path.isabs(image_path):
-        absolute_svg_path = os.path.abspath(OPEN_SVG_FILE_PATH.get())
-        image_path = os.path.abspath(os.path.join(os.path.dirname(absolute_svg_path), image_path))
-        image_path = "file:///" + image_path
-        print(image_path)
-    return image_path
+    with INSTRUMENTATION.span("parse"):
+        tree = ET.parse(svg_path)
+        get_element_index(tree.getroot())
+    return tree
 
 
-def save_svg_to_file(save_path):
+def find_element_by_id(root, element_id):
     """
-    Save the changes made to the SVG file.
+    Find an element of the document by its ID using the document's ID index.
 
     Args:
-        save_path: The path to save the SVG file.
+        root: The root SVG element.
+        element_id: The ID of the SVG element.
 
     Returns:
-        bool: True if the changes are saved successfully, False otherwise.
+        Element: The element with the given ID, or None if it does not exist.
     """
-    try:
-        svg_string = ET.tostring(root_element.get_element(), encoding="unicode", short_empty_elements=False)
-        svg_string = svg_string.replace("><", ">\n<")
+    with INSTRUMENTATION.span("lookup"):
+        return get_element_index(root).get(element_id)
 
-        if not os.path.exists(save_path):
-            with open(save_path, "w", encoding="utf-8") as f:
-                f.write(svg_string)
-        else:
-            with open(save_path, "w", encoding="utf-8") as file:
-                file.write(svg_string)
 
-        print("Changes saved successfully! \nSaved to", save_path)
-        return True
+def add_element(root, parent, element):
+    """
+    Append an element to a parent element and add it to the document's ID index.
 
-    except Exception as e:
-        print(f"Error saving SVG image: {e}")
+    Args:
+        root: The root SVG element.
+        parent: The element to append to.
+        element: The element (or subtree) to append.
+    """
+    parent.append(element)
+    get_element_index(root).add(element)
+    modification_tracker.mark_modified()
+
+
+def remove_element(root, parent, element):
+    """
+    Remove an element from its parent element and from the document's ID index.
+
+    Args:
+        root: The root SVG element.
+        parent: The parent of the element.
+        element: The element (or subtree) to remove.
+    """
+    parent.remove(element)
+    get_element_index(root).remove(element)
+    modification_tracker.mark_modified()
+
+
+class LineBreakWriter:
+    """
+    File wrapper that starts every tag on a new line while the document is being written.
+
+    A line break is inserted between every "><" pair, including pairs split across two writes.
+    """
+    def __init__(self, file):
+        """
+        Initialize the LineBreakWriter.
+
+        Args:
+            file: The text file to write to.
+        """
+        self.file = file
+        self.last_char = ""
+
+    def write(self, data):
+        """
+        Write a piece of the document.
+
+        Args:
+            data (str): The text to write.
+        """
+        if not data:
+            return
+        if self.last_char == ">" and data[0] == "<":
+            self.file.write("\n")
+        self.file.write(data.replace("><", ">\n<"))
+        self.last_char = data[-1]
+
+
+def write_svg(root, file, line_breaks=True):
+    """
+    Serialize an SVG document to a text file as it is generated.
+
+    Args:
+        root: The root SVG element.
+        file: The text file to write to.
+        line_breaks (bool): Whether to start every tag on a new line.
+    """
+    with INSTRUMENTATION.span("serialize"):
+        flush_styles()
+        if line_breaks:
+            file = LineBreakWriter(file)
+        ET.ElementTree(root).write(file, encoding="unicode", short_empty_elements=False)
+
+
+def write_svg_file(root, save_path, line_breaks=True):
+    """
+    Write an SVG document to a file, replacing the file only once it is completely written.
+
+    Nothing is written if the file already holds the document and the document has not been
+    modified since.
+
+    Args:
+        root: The root SVG element.
+        save_path: The path to save the SVG file.
+        line_breaks (bool): Whether to start every tag on a new line.
+
+    Returns:
+        bool: True if the file was written, False if it was already up to date.
+    """
+    if modification_tracker.is_written(save_path, root):
         return False
+    with atomic_open(save_path, "w", encoding="utf-8") as file:
+        write_svg(root, file, line_breaks)
+    modification_tracker.mark_written(save_path, root)
+    return True
 
 
-def is_image(element, attr, value):
+def serialize_svg(root):
     """
-    Check if the attribute value represents an image.
+    Serialize an SVG document the way it is saved, one tag per line.
 
     Args:
-        element: The XML element.
-        attr: The name of the attribute.
-        value: The value of the attribute.
+        root: The root SVG element.
 
     Returns:
-        None
+        str: The serialized SVG document.
     """
-    if "href" in attr and "#" not in value:
-        set_attribute_value(root_element.get_element(), element.get('id'), attr, 1, convert_image_path(value.strip()))
+    buffer = io.StringIO()
+    write_svg(root, buffer)
+    return buffer.getvalue()
+
+
+def save_svg_to_file(save_path):
+    """
+    Save the changes made to the SVG file.
+
+    Args:
+        save_path: The path to save the SVG file.
+
+    Returns:
+        bool: True if the changes are saved successfully, False otherwise.
+    """
+    try:
+        if write_svg_file(root_element.get_element(), save_path):
+            LOGGER.info("Changes saved successfully! Saved to %s", save_path)
+        else:
+            LOGGER.info("No changes to save to %s", save_path)
+        return True
+
+    except Exception as e:
+        LOGGER.error("Error saving SVG image: %s", e)
+        return False
 
 
 def parse_style(style):
     """
     Parse the style attribute and return a dictionary of style properties.
 
+    Use get_style to read the style of an element, which caches the parsed properties.
+
     Args:
         style: The value of the style attribute.
 
     Returns:
         dict: A dictionary of style properties.
     """
-    style_dict = {}
-    if style:
-        style_properties = style.split(";")
-        for prop in style_properties:
-            if ":" in prop:
-                key, value = prop.split(":")
-                style_dict[key.strip()] = value.strip()
-    return style_dict
+    return dict(Style(style).items())
 
 
 def style_dict_to_string(style_dict):
@@ -142,12 +248,10 @@ def parse_element(element, property_panel):
     """
     for attr, value in element.items():
         if attr == "style":
-            style_dict = parse_style(value)
-            for style_attr, style_value in style_dict.items():
+            for style_attr, style_value in get_style(element).items():
                 property_panel.display_attribute(style_attr, style_value, 2)
         else:
             property_panel.display_attribute(attr, value, 1)
-            is_image(element, attr, value)
 
 
 def get_key_by_value(target_value):
@@ -179,75 +283,131 @@ def find_attribute_value(root, element_id, attribute_name, type_id):
     Returns:
         str: The value of the specified attribute.
     """
-    element = root.find(f".//*[@id='{element_id}']")
+    element = find_element_by_id(root, element_id)
 
     if element is None:
-        print(f"Element with id '{element_id}' not found.")
+        LOGGER.info("Element with id '%s' not found.", element_id)
         return None
 
-    if attribute_name.startswith("{"):
-        namespace_name = attribute_name.split("}")[0][1:]
-        namespace_uri = get_key_by_value(namespace_name)
-        if namespace_uri is not None:
-            attribute_name = "{" + namespace_uri + "}" + attribute_name.split("}")[1]
+    attribute_name = qualify_attribute_name(attribute_name)
 
     if type_id == 2:
-        style_value = element.get("style")
-        style_dict = parse_style(style_value)
-        attribute_value = style_dict.get(attribute_name)
+        style = get_style(element)
+        attribute_value = style.get(attribute_name)
 
-        if style_value is not None:
-            if attribute_name in style_dict:
-                print(f"Attribute value for Style {element_id}.{attribute_name}: {attribute_value}")
+        if style.raw is not None:
+            if attribute_name in style:
+                LOGGER.debug("Attribute value for Style %s.%s: %s", element_id, attribute_name, attribute_value)
                 return attribute_value
             else:
-                print(f"Style Attribute {attribute_name} not found for element {element_id}")
+                LOGGER.info("Style Attribute %s not found for element %s", attribute_name, element_id)
 
     if type_id == 3:
         if element.text is not None:
-            print(f"Attribute value for element {element_id}: {element.text}")
+            LOGGER.debug("Attribute value for element %s: %s", element_id, element.text)
             return element.text
         else:
-            print(f"Text content not found for element {element_id}")
+            LOGGER.info("Text content not found for element %s", element_id)
 
     if type_id == 1:
+        flush_style(element)
         if attribute_name in element.attrib:
-            print(f"Attribute value for {element_id}.{attribute_name}: {element.attrib[attribute_name]}")
+            LOGGER.debug("Attribute value for %s.%s: %s", element_id, attribute_name, element.attrib[attribute_name])
             return element.attrib[attribute_name]
         else:
-            print(f"Attribute {attribute_name} not found for element {element_id}")
+            LOGGER.info("Attribute %s not found for element %s", attribute_name, element_id)
 
     return None
 
 
-def set_attribute_value(root, element_id, attribute_name, type_id, new_value):
+def get_attribute_value(root, element_id, attribute_name, type_id):
     """
-    Set the value of an attribute in the SVG element.
+    Get the value of an attribute of an SVG element without logging it.
 
     Args:
         root: The root SVG element.
-        element_id: The ID of the SVG element to modify.
+        element_id: The ID of the SVG element.
         attribute_name: The name of the attribute.
         type_id: The type of attribute (1 - Normal, 2 - Style, 3 - Element).
-        new_value: The new value to set for the attribute.
 
     Returns:
-        int: 1 if the value is changed, 0 otherwise.
+        str: The value of the attribute, or None if the element or attribute does not exist.
+    """
+    element = find_element_by_id(root, element_id)
+    if element is None:
+        return None
+
+    attribute_name = qualify_attribute_name(attribute_name)
+    if type_id == 1:
+        flush_style(element)
+        return element.get(attribute_name)
+    if type_id == 2:
+        return get_style(element).get(attribute_name)
+    if type_id == 3:
+        return element.text
+    return None
+
+
+def qualify_attribute_name(attribute_name):
+    """
+    Expand a namespace prefix such as "{xlink}href" to the full namespace URI.
+
+    Args:
+        attribute_name: The name of the attribute, optionally prefixed with a known namespace.
+
+    Returns:
+        str: The attribute name with its namespace URI, or the name unchanged if the prefix is unknown.
     """
     if attribute_name.startswith("{"):
         namespace_name = attribute_name.split("}")[0][1:]
         namespace_uri = get_key_by_value(namespace_name)
         if namespace_uri is not None:
             attribute_name = "{" + namespace_uri + "}" + attribute_name.split("}")[1]
+    return attribute_name
+
+
+def set_attribute_value(root, element_id, attribute_name, type_id, new_value):
+    """
+    Set the value of an attribute in the SVG element.
+
+    Args:
+        root: The root SVG element.
+        element_id: The ID of the SVG element to modify.
+        attribute_name: The name of the attribute.
+        type_id: The type of attribute (1 - Normal, 2 - Style, 3 - Element).
+        new_value: The new value to set for the attribute.
 
-    select = root.find(f".//*[@id='{element_id}']")
+    Returns:
+        int: 1 if the value is changed, 0 otherwise.
+    """
+    attribute_name = qualify_attribute_name(attribute_name)
+
+    select = find_element_by_id(root, element_id)
     is_value_changed = update_svg_attribute(select, attribute_name, type_id, new_value)
     return is_value_changed
 
 
-def update_svg_attribute(select, attribute_name, type_id, new_value):
+def edit_attribute_value(root, element_id, attribute_name, type_id, new_value):
     """
-    Set the value of an attribute in the SVG element.
+    Set the value of an attribute in the SVG element without logging it, reporting the outcome.
+
+    Args:
+        root: The root SVG element.
+        element_id: The ID of the SVG element to modify.
+        attribute_name: The name of the attribute.
+        type_id: The type of attribute (1 - Normal, 2 - Style, 3 - Element).
+        new_value: The new value to set for the attribute.
+
+    Returns:
+        str: EDIT_APPLIED, EDIT_UNCHANGED or EDIT_NOT_FOUND.
+    """
+    select = find_element_by_id(root, element_id)
+    return apply_svg_attribute(select, qualify_attribute_name(attribute_name), type_id, new_value)
+
+
+def apply_svg_attribute(select, attribute_name, type_id, new_value):
+    """
+    Set the value of an attribute in the SVG element, reporting the outcome.
 
     Args:
         select: The SVG element to modify.
@@ -256,37 +416,68 @@ def update_svg_attribute(select, attribute_name, type_id, new_value):
         new_value: The new value to set for the attribute.
 
     Returns:
-        int: 1 if the value is changed, 0 otherwise.
+        str: EDIT_APPLIED if the value was changed, EDIT_UNCHANGED if it already had the new value,
+            EDIT_NOT_FOUND if the element or attribute does not exist.
     """
     if select is None:
-        print(f"Error Changing Property")
-        return 0
+        return EDIT_NOT_FOUND
 
     style_attr = None
-    style_dict = None
-    style_value = select.get("style")
-    if style_value is not None:
-        style_dict = parse_style(style_value)
-        style_attr = style_dict.get(attribute_name)
+    if "style" in select.attrib:
+        style_attr = get_style(select).get(attribute_name)
 
     # For Normal attr
-    if new_value != select.get(
-            attribute_name) and attribute_name in select.attrib and style_attr is None and type_id == 1:
+    if type_id == 1 and attribute_name in select.attrib and style_attr is None:
+        flush_style(select)
+        old_value = select.get(attribute_name)
+        if new_value == old_value:
+            return EDIT_UNCHANGED
         select.set(attribute_name, new_value)
-        print(f"Attribute {attribute_name} changed to: {new_value}")
-        return 1
+        if attribute_name == "id":
+            element_id_changed(select, old_value)
+        EDIT_JOURNAL.record(select, EDIT_KIND_ATTRIBUTE, attribute_name, old_value, new_value)
+        modification_tracker.mark_modified()
+        return EDIT_APPLIED
     # For elements
-    elif new_value != select.text and attribute_name not in select.attrib and style_attr is None and type_id == 3:
+    elif type_id == 3 and attribute_name not in select.attrib and style_attr is None:
+        if new_value == select.text:
+            return EDIT_UNCHANGED
+        EDIT_JOURNAL.record(select, EDIT_KIND_TEXT, None, select.text, new_value)
         select.text = new_value
-        print(f"Element {select.tag} changed to: {new_value}")
-        return 1
+        modification_tracker.mark_modified()
+        return EDIT_APPLIED
     # For style
-    elif style_attr is not None and type_id == 2:
-        if new_value != style_attr:
-            style_dict[attribute_name] = new_value
-            select.set("style", style_dict_to_string(style_dict))
-            print(f"Style {attribute_name} changed to: {new_value}")
-            return 1
-
-    print(f"Error Changing Property")
-    return 0
+    elif type_id == 2 and style_attr is not None:
+        if not set_style_property(select, attribute_name, new_value):
+            return EDIT_UNCHANGED
+        EDIT_JOURNAL.record(select, EDIT_KIND_STYLE, attribute_name, style_attr, new_value)
+        modification_tracker.mark_modified()
+        return EDIT_APPLIED
+
+    return EDIT_NOT_FOUND
+
+
+def update_svg_attribute(select, attribute_name, type_id, new_value):
+    """
+    Set the value of an attribute in the SVG element.
+
+    Args:
+        select: The SVG element to modify.
+        attribute_name: The name of the attribute.
+        type_id: The type of attribute (1 - Normal, 2 - Style, 3 - Element).
+        new_value: The new value to set for the attribute.
+
+    Returns:
+        int: 1 if the value is changed, 0 otherwise.
+    """
+    if apply_svg_attribute(select, attribute_name, type_id, new_value) != EDIT_APPLIED:
+        LOGGER.info("Error Changing Property %s", attribute_name)
+        return 0
+
+    if type_id == 1:
+        LOGGER.debug("Attribute %s changed to: %s", attribute_name, new_value)
+    elif type_id == 3:
+        LOGGER.debug("Element %s changed to: %s", select.tag, new_value)
+    else:
+        LOGGER.debug("Style %s changed to: %s", attribute_name, new_value)
+    return 1
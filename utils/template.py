@@ -0,0 +1,155 @@
+"""
+Parsed SVG templates that produce working copies without re-parsing.
+
+An SVGTemplate parses its file once. clone() returns an independent deep copy of the tree.
+clone(plan) makes a copy-on-write copy for an EditPlan instead: only the elements on the paths
+of the plan's targets (and their ancestors) are copied, and every other subtree is shared with
+the template. Such a copy must only be modified through the plan.
+
+get_template() keeps the most recently used templates, re-parsing a file when it changes on disk.
+"""
+import copy
+import os
+import threading
+from collections import OrderedDict
+
+from utils.config import TEMPLATE_CACHE_SIZE, TEMPLATE_PLAN_CACHE_SIZE
+from utils.edit_plan import EditPlan
+from utils.style import flush_styles
+from utils.svg_parser import load_svg
+
+
+def file_signature(svg_path):
+    """
+    Get the modification time and size of a file, which change when the file is rewritten.
+
+    Args:
+        svg_path (str): The path to the file.
+
+    Returns:
+        tuple: The modification time in nanoseconds and the size in bytes.
+    """
+    stat = os.stat(svg_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def copy_node(element):
+    """
+    Copy an element with its own attributes but the same children as the original.
+
+    Args:
+        element (Element): The element to copy.
+
+    Returns:
+        Element: The copy.
+    """
+    node = element.makeelement(element.tag, element.attrib)
+    node.text = element.text
+    node.tail = element.tail
+    node.extend(element)
+    return node
+
+
+class SVGTemplate:
+    """
+    An SVG file parsed once and copied for every variant generated from it.
+    """
+    def __init__(self, svg_path):
+        """
+        Initialize the SVGTemplate by parsing the file.
+
+        Args:
+            svg_path (str): The path to the SVG file.
+        """
+        self.svg_path = svg_path
+        self.signature = file_signature(svg_path)
+        self.root = load_svg(svg_path).getroot()
+        self.plans = {}
+
+    def is_current(self):
+        """
+        Check if the file has not changed since it was parsed.
+
+        Returns:
+            bool: True if the template matches the file, False otherwise.
+        """
+        try:
+            return file_signature(self.svg_path) == self.signature
+        except OSError:
+            return False
+
+    def get_plan(self, targets):
+        """
+        Get the compiled plan of a list of targets, compiling it on first use.
+
+        Args:
+            targets (list): The ID, attribute name and type name of each edit.
+
+        Returns:
+            EditPlan: The plan of the targets against the template.
+        """
+        targets = tuple(tuple(target) for target in targets)
+        plan = self.plans.get(targets)
+        if plan is None:
+            if len(self.plans) >= TEMPLATE_PLAN_CACHE_SIZE:
+                del self.plans[next(iter(self.plans))]
+            plan = self.plans[targets] = EditPlan(self.root, targets)
+        return plan
+
+    def clone(self, plan=None):
+        """
+        Make a working copy of the template.
+
+        Args:
+            plan (EditPlan, optional): The plan the copy will be edited with. If given, only the
+                elements the plan edits and their ancestors are copied.
+
+        Returns:
+            Element: The root element of the copy.
+        """
+        # Copies must not pick up style edits that are still pending on the template
+        flush_styles()
+        if plan is None:
+            return copy.deepcopy(self.root)
+
+        clone = copy_node(self.root)
+        for _, path, _, _ in plan.steps:
+            if path is None:
+                continue
+            parent, original = clone, self.root
+            for index in path:
+                original = original[index]
+                # A child that is still the template's own element has not been copied yet
+                if parent[index] is original:
+                    parent[index] = copy_node(original)
+                parent = parent[index]
+        return clone
+
+
+# Most recently used templates, by absolute path
+_templates = OrderedDict()
+_templates_lock = threading.Lock()
+
+
+def get_template(svg_path):
+    """
+    Get the parsed template of a file, parsing it only if it is not cached or has changed.
+
+    Args:
+        svg_path (str): The path to the SVG file.
+
+    Returns:
+        SVGTemplate: The template of the file.
+    """
+    key = os.path.abspath(svg_path)
+    with _templates_lock:
+        template = _templates.get(key)
+        if template is not None and template.is_current():
+            _templates.move_to_end(key)
+            return template
+
+        template = _templates[key] = SVGTemplate(svg_path)
+        _templates.move_to_end(key)
+        while len(_templates) > TEMPLATE_CACHE_SIZE:
+            _templates.popitem(last=False)
+        return template